@@ -1,63 +1,292 @@
-from fastapi import APIRouter, HTTPException, Query
+from datetime import date
+from typing import Literal
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from backend.app.core.config import settings
-from backend.app.services.word_extractor import WordExtractor
-from backend.app.services.utils import safe_float_convert, safe_str_convert
-from backend.app.schemas.text_schemas import TextRequest, TextResponse
-from backend.app.schemas.db_schemas import TestResultCreate, UserCreate
+from backend.app.services.utils import (
+    decode_cursor,
+    etag_matches,
+    make_etag,
+    safe_float_convert,
+    safe_str_convert,
+)
+from backend.app.schemas.text_schemas import (
+    TextRequest,
+    TextResponse,
+    TextBatchResponse,
+    TextPoolStatistics,
+)
+from backend.app.schemas.db_schemas import (
+    TestResultCreate,
+    UserCreate,
+    TestResultBatchItem,
+    TestResultBatchResponse,
+    ResultWriterStatistics,
+    StatisticsCacheStatistics,
+    UserTestStatisticsResponse,
+    TestResultHistoryPage,
+    UserTestSeriesResponse,
+    PercentileResponse,
+    LeaderboardResponse,
+    GlobalStatisticsResponse,
+)
+from backend.app.schemas.logging_schemas import LoggingStatistics
+from backend.app.schemas.progress_schemas import ProgressMetrics
 from backend.app.db.dependencies import SessionDependency
-from backend.app.db.repositories import UserRepository, TestResultRepository
-from backend.app.services.progress_calculator import UserProgressCalculator
-from backend.app.core.logger import error_logger, request_logger
+from backend.app.db.repositories import (
+    UserRepository,
+    TestResultRepository,
+    UserStatsRepository,
+)
+from backend.app.services.progress_calculator import (
+    PROGRESS_COLUMNS,
+    UserProgressCalculator,
+)
+from backend.app.services.export import EXPORT_MEDIA_TYPES, stream_export
+from backend.app.services.global_statistics import get_global_statistics
+from backend.app.services.leaderboard import leaderboards
+from backend.app.services.percentiles import get_percentiles
+from backend.app.services.series import get_user_series
+from backend.app.services.statistics_cache import statistics_cache
+from backend.app.services.text_pool import text_pool
+from backend.app.services.result_writer import result_writer, ResultWriterOverloaded
+from backend.app.services.text_generator import (
+    get_seeded_text,
+    make_word_extractor,
+    new_seed,
+    stream_text,
+    text_etag,
+)
+from backend.app.core.logger import error_logger, log_queue, request_logger
 
 
 router = APIRouter()
 
+ANONYMOUS_USER_IDS = (None, "anonymous", "")
+
+
+def _parse_test_result(
+    test_data: dict[str, str | int | float | None], user_id: str
+) -> TestResultCreate:
+    return TestResultCreate(
+        user_id=user_id,
+        chars_per_minute=safe_float_convert(test_data.get(settings.chars_per_minute)),
+        accuracy=safe_float_convert(test_data.get(settings.accuracy)),
+        time_seconds=safe_float_convert(test_data.get(settings.time_seconds)),
+        language=safe_str_convert(test_data.get(settings.language)),
+        difficulty=safe_str_convert(test_data.get(settings.difficulty)),
+    )
+
 
 @router.get(
     "/text",
     response_model=TextResponse,
 )
 async def get_random_text(
+    http_request: Request,
+    response: Response,
     lang: str = Query(default="ru", description="Язык текста"),
     difficulty: str = Query(default="easy", description="Уровень сложности"),
+    seed: int | None = Query(
+        default=None,
+        ge=0,
+        le=settings.max_text_seed,
+        description="Seed для воспроизводимой генерации",
+    ),
 ):
     try:
-        request_logger.info(f"Text request: lang = {lang}, difficulty = {difficulty}")
+        request_logger.info(
+            "Text request: lang = %s, difficulty = %s, seed = %s",
+            lang,
+            difficulty,
+            seed,
+        )
         request = TextRequest(lang=lang, difficulty=difficulty)
 
-        config = settings.text_generation_config[request.lang][request.difficulty]
+        if seed is None:
+            text_response = await text_pool.pop(request.lang, request.difficulty)
+            response.headers["ETag"] = text_etag(
+                request.lang, request.difficulty, text_response.seed
+            )
+            response.headers["Cache-Control"] = "no-store"
+        else:
+            etag = text_etag(request.lang, request.difficulty, seed)
+            cache_headers = {
+                "ETag": etag,
+                "Cache-Control": f"public, max-age={settings.text_cache_max_age_seconds}",
+            }
+            if etag_matches(http_request.headers.get("if-none-match"), etag):
+                return Response(status_code=304, headers=cache_headers)
+
+            text_response = get_seeded_text(request.lang, request.difficulty, seed)
+            response.headers.update(cache_headers)
 
-        word_extractor = WordExtractor(
-            filepath=settings.language_filepath[request.lang],
-            count_words=int(config["count_words"]),
-            level=str(config["level"]),
+        return text_response
+
+    except Exception as e:
+        error_logger.error("Error in get_random_text: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/text/stream")
+async def stream_random_text(
+    lang: str = Query(default="ru", description="Язык текста"),
+    difficulty: str = Query(default="easy", description="Уровень сложности"),
+    format: Literal["ndjson", "sse"] = Query(
+        default="ndjson", description="Формат потока"
+    ),
+    chunk_words: int = Query(
+        default=settings.text_stream_chunk_words,
+        ge=1,
+        le=settings.max_text_stream_chunk_words,
+        description="Слов во фрагменте",
+    ),
+    seed: int | None = Query(
+        default=None,
+        ge=0,
+        le=settings.max_text_seed,
+        description="Seed для воспроизводимой генерации",
+    ),
+):
+    try:
+        request_logger.info(
+            "Text stream request: lang = %s, difficulty = %s, format = %s",
+            lang,
+            difficulty,
+            format,
+        )
+        request = TextRequest(lang=lang, difficulty=difficulty)
+        stream_seed = new_seed() if seed is None else seed
+        word_extractor = make_word_extractor(
+            request.lang, request.difficulty, stream_seed
         )
 
-        generated_text = word_extractor.generate_random_text()
+        return StreamingResponse(
+            stream_text(word_extractor, chunk_words, format),
+            media_type="text/event-stream"
+            if format == "sse"
+            else "application/x-ndjson",
+            headers={"Cache-Control": "no-store", "X-Text-Seed": str(stream_seed)},
+        )
 
-        return TextResponse(
-            text=generated_text,
+    except Exception as e:
+        error_logger.error("Error in stream_random_text: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/texts",
+    response_model=TextBatchResponse,
+)
+async def get_random_texts(
+    lang: str = Query(default="ru", description="Язык текста"),
+    difficulty: str = Query(default="easy", description="Уровень сложности"),
+    count: int = Query(
+        default=settings.default_batch_texts,
+        ge=1,
+        le=settings.max_batch_texts,
+        description="Количество текстов",
+    ),
+    seed: int | None = Query(
+        default=None,
+        ge=0,
+        le=settings.max_text_seed,
+        description="Seed для воспроизводимой генерации пакета",
+    ),
+):
+    try:
+        request_logger.info(
+            "Text batch request: lang = %s, difficulty = %s, count = %s",
+            lang,
+            difficulty,
+            count,
+        )
+        request = TextRequest(lang=lang, difficulty=difficulty)
+        batch_seed = new_seed() if seed is None else seed
+
+        word_extractor = make_word_extractor(
+            request.lang, request.difficulty, batch_seed
+        )
+        generated_texts = word_extractor.generate_random_texts(count)
+
+        return TextBatchResponse(
+            texts=generated_texts,
             language=request.lang,
             difficulty=request.difficulty,
+            seed=batch_seed,
         )
 
     except Exception as e:
-        error_logger.error(f"Error in get_random_text: {str(e)}", exc_info=True)
+        error_logger.error("Error in get_random_texts: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get(
+    "/metrics/text-pool",
+    response_model=TextPoolStatistics,
+)
+async def get_text_pool_statistics():
+    return text_pool.statistics()
+
+
+@router.get(
+    "/metrics/result-writer",
+    response_model=ResultWriterStatistics,
+)
+async def get_result_writer_statistics():
+    return result_writer.statistics()
+
+
+@router.get(
+    "/metrics/statistics-cache",
+    response_model=StatisticsCacheStatistics,
+)
+async def get_statistics_cache_statistics():
+    return statistics_cache.statistics()
+
+
+@router.get(
+    "/metrics/logging",
+    response_model=LoggingStatistics,
+)
+async def get_logging_statistics():
+    return log_queue.statistics()
+
+
 @router.post("/test-result")
 async def save_test_result(
     test_data: dict[str, str | int | float | None],
     session: SessionDependency,
 ):
     try:
-        request_logger.info(f"Test result request: {test_data}")
+        request_logger.info(
+            "Test result request: user = %s, language = %s, difficulty = %s",
+            test_data.get("user_id"),
+            test_data.get("language"),
+            test_data.get("difficulty"),
+        )
         user_repo = UserRepository(session)
         test_result_repo = TestResultRepository(session)
         user_id = test_data.get("user_id")
 
-        if user_id in (None, "anonymous", ""):
+        if result_writer.running:
+            new_user = user_id in ANONYMOUS_USER_IDS
+            if not new_user and not result_writer.is_pending_user(str(user_id)):
+                new_user = not await user_repo.get_existing_ids({str(user_id)})
+            if new_user:
+                (user_id,) = UserRepository.new_ids(1)
+
+            test_result_data = _parse_test_result(test_data, str(user_id))
+            await result_writer.submit(test_result_data, new_user=new_user)
+
+            return {
+                "user_id": user_id,
+                "test_result_id": None,
+                "public_id": test_result_data.public_id,
+                "status": "queued",
+            }
+
+        if user_id in ANONYMOUS_USER_IDS:
             user = await user_repo.create(UserCreate())
             user_id = user.id
         else:
@@ -66,62 +295,468 @@ async def save_test_result(
                 user = await user_repo.create(UserCreate())
                 user_id = user.id
 
-        test_result_data = TestResultCreate(
-            user_id=str(user_id),
-            chars_per_minute=safe_float_convert(
-                test_data.get(settings.chars_per_minute)
-            ),
-            accuracy=safe_float_convert(test_data.get(settings.accuracy)),
-            time_seconds=safe_float_convert(test_data.get(settings.time_seconds)),
-            language=safe_str_convert(test_data.get(settings.language)),
-            difficulty=safe_str_convert(test_data.get(settings.difficulty)),
-        )
+        test_result_data = _parse_test_result(test_data, str(user_id))
         test_result = await test_result_repo.create(test_result_data)
+        statistics_cache.invalidate([test_result.user_id])
+        leaderboards.offer([test_result])
+
+        return {
+            "user_id": user_id,
+            "test_result_id": test_result.id,
+            "public_id": test_result.public_id,
+            "status": "created",
+        }
 
-        return {"user_id": user_id, "test_result_id": test_result.id}
+    except ResultWriterOverloaded as e:
+        error_logger.warning("Write-behind queue is full: %s", e)
+        raise HTTPException(status_code=503, detail="Server is busy, retry later")
 
     except ValueError as e:
-        error_logger.warning(f"Validation error: {str(e)}")
+        error_logger.warning("Validation error: %s", e)
         raise HTTPException(status_code=400, detail=f"Incorrect data: {str(e)}")
 
     except Exception as e:
-        error_logger.error(f"Error in save_test_result: {str(e)}", exc_info=True)
+        error_logger.error("Error in save_test_result: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Save error: {str(e)}")
+
+
+@router.post(
+    "/test-results/batch",
+    response_model=TestResultBatchResponse,
+)
+async def save_test_results_batch(
+    test_data_list: list[dict[str, str | int | float | None]],
+    session: SessionDependency,
+):
+    """Пакетное сохранение результатов в одной транзакции.
+
+    Все анонимные результаты пакета привязываются к одному новому
+    пользователю, а каждый неизвестный user_id — к своему новому.
+    """
+    if len(test_data_list) > settings.max_batch_results:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many results: maximum is {settings.max_batch_results}",
+        )
+
+    try:
+        request_logger.info("Test result batch request: %s items", len(test_data_list))
+        user_repo = UserRepository(session)
+        test_result_repo = TestResultRepository(session)
+
+        items: list[TestResultBatchItem] = []
+        valid: list[tuple[TestResultBatchItem, TestResultCreate, str | None]] = []
+        for index, test_data in enumerate(test_data_list):
+            raw_user_id = test_data.get("user_id")
+            requested_id = (
+                None if raw_user_id in ANONYMOUS_USER_IDS else str(raw_user_id)
+            )
+            item = TestResultBatchItem(index=index, status="created")
+            items.append(item)
+            try:
+                valid.append(
+                    (item, _parse_test_result(test_data, requested_id or ""), requested_id)
+                )
+            except ValueError as e:
+                item.status = "invalid"
+                item.error = str(e)
+
+        requested_ids = {requested_id for *_, requested_id in valid if requested_id}
+        existing_ids = await user_repo.get_existing_ids(requested_ids)
+        missing_ids = sorted(requested_ids - existing_ids)
+        needs_anonymous = any(requested_id is None for *_, requested_id in valid)
+
+        new_ids = await user_repo.create_many(
+            UserRepository.new_ids(len(missing_ids) + needs_anonymous), commit=False
+        )
+        user_ids: dict[str | None, str] = {user_id: user_id for user_id in existing_ids}
+        user_ids.update(zip([*missing_ids, None], new_ids))
+
+        test_results_data = [
+            data.model_copy(update={"user_id": user_ids[requested_id]})
+            for _, data, requested_id in valid
+        ]
+        test_result_ids = await test_result_repo.create_many(test_results_data)
+        statistics_cache.invalidate({data.user_id for data in test_results_data})
+        leaderboards.offer(test_results_data)
+
+        for (item, *_), data, test_result_id in zip(
+            valid, test_results_data, test_result_ids, strict=True
+        ):
+            item.user_id = data.user_id
+            item.test_result_id = test_result_id
+            item.public_id = data.public_id
+
+        return TestResultBatchResponse(
+            created=len(valid), failed=len(items) - len(valid), items=items
+        )
+
+    except Exception as e:
+        error_logger.error("Error in save_test_results_batch: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Save error: {str(e)}")
 
 
 @router.get(
     "/statistics/{user_id}",
+    response_model=UserTestStatisticsResponse,
 )
-async def get_user_test_statistics(user_id: str, session: SessionDependency):
+async def get_user_test_statistics(
+    user_id: str, http_request: Request, session: SessionDependency
+):
+    """Статистика пользователя с поддержкой условного GET.
+
+    ETag строится по ключу последнего результата, поэтому совпавший
+    If-None-Match отвечает 304 без расчёта и сериализации статистики.
+    """
     test_result_repo = TestResultRepository(session)
+    user_stats_repo = UserStatsRepository(session)
     try:
-        request_logger.info(f"Request user: {user_id} test statistics")
-        all_test_results = await test_result_repo.get_by_user_id(user_id)
-        if not all_test_results:
+        request_logger.info("Request user: %s test statistics", user_id)
+        latest = await test_result_repo.get_latest_key(user_id)
+        if latest is None:
             error_logger.warning("No statistics found for this user")
             raise HTTPException(
                 status_code=404, detail="No statistics found for this user"
             )
 
-        last_result = await test_result_repo.get_last_result_by_user_id(user_id)
-        best_performance = await test_result_repo.get_user_best_performance(user_id)
-        avg_statistics = await test_result_repo.get_user_test_result_statistics(user_id)
-        progress_metrics = await UserProgressCalculator.calculate_progress(
-            all_test_results
+        etag = make_etag("statistics", user_id, *latest)
+        cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(http_request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=cache_headers)
+
+        cache_key = await statistics_cache.key(session, user_id, latest)
+        payload = statistics_cache.get(cache_key)
+        if payload is not None:
+            return Response(
+                content=payload, media_type="application/json", headers=cache_headers
+            )
+
+        stats = await user_stats_repo.get(user_id)
+        if stats is None:
+            error_logger.warning("No statistics found for this user")
+            raise HTTPException(
+                status_code=404, detail="No statistics found for this user"
+            )
+
+        snapshot = await test_result_repo.get_user_statistics_snapshot(
+            user_id, stats, settings.history_page_size
         )
+        progress_metrics = UserProgressCalculator.calculate_progress_from_stats(stats)
 
-        return {
-            "last_result": last_result,
-            "best_performance": best_performance,
-            "avg_statistics": avg_statistics,
-            "progress_metrics": progress_metrics,
-            "all_test_results": all_test_results,
-        }
+        payload = UserTestStatisticsResponse(
+            **dict(snapshot), progress_metrics=progress_metrics
+        ).model_dump_json().encode()
+        statistics_cache.set(cache_key, payload)
+        return Response(
+            content=payload, media_type="application/json", headers=cache_headers
+        )
+
+    except HTTPException:
+        raise
 
     except Exception as e:
-        error_logger.error(
-            f"Error in get_user_test_statistics: {str(e)}", exc_info=True
-        )
+        error_logger.error("Error in get_user_test_statistics: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500, detail="Internal server error when receiving statistics"
         )
+
+
+@router.get(
+    "/users/{user_id}/history",
+    response_model=TestResultHistoryPage,
+)
+async def get_user_test_history(
+    user_id: str,
+    http_request: Request,
+    response: Response,
+    session: SessionDependency,
+    limit: int = Query(
+        default=settings.history_page_size,
+        ge=1,
+        le=settings.max_history_page_size,
+        description="Результатов на странице",
+    ),
+    cursor: str | None = Query(
+        default=None, description="Курсор из next_cursor предыдущей страницы"
+    ),
+    language: str | None = Query(
+        default=None, pattern=settings.language_pattern, description="Язык теста"
+    ),
+    difficulty: str | None = Query(
+        default=None,
+        pattern=settings.difficulty_pattern,
+        description="Сложность теста",
+    ),
+):
+    test_result_repo = TestResultRepository(session)
+    try:
+        request_logger.info(
+            "Request user: %s test history, cursor = %s", user_id, cursor
+        )
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        latest = await test_result_repo.get_latest_key(user_id)
+        etag = make_etag(
+            "history", user_id, latest, limit, cursor, language, difficulty
+        )
+        cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(http_request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=cache_headers)
+
+        response.headers.update(cache_headers)
+        return await test_result_repo.get_history_page(
+            user_id, limit, after, language, difficulty
+        )
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        error_logger.error("Error in get_user_test_history: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=500, detail="Internal server error when receiving history"
+        )
+
+
+@router.get(
+    "/users/{user_id}/series",
+    response_model=UserTestSeriesResponse,
+)
+async def get_user_test_series(
+    user_id: str,
+    session: SessionDependency,
+    points: int = Query(
+        default=settings.series_points,
+        ge=3,
+        le=settings.max_series_points,
+        description="Максимум точек в каждом ряду",
+    ),
+    language: str | None = Query(
+        default=None, pattern=settings.language_pattern, description="Язык теста"
+    ),
+    difficulty: str | None = Query(
+        default=None,
+        pattern=settings.difficulty_pattern,
+        description="Сложность теста",
+    ),
+):
+    try:
+        request_logger.info(
+            "Request user: %s test series, points = %s", user_id, points
+        )
+        return await get_user_series(session, user_id, points, language, difficulty)
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        error_logger.error("Error in get_user_test_series: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=500, detail="Internal server error when receiving series"
+        )
+
+
+@router.get("/users/{user_id}/export")
+async def export_user_test_results(
+    user_id: str,
+    session: SessionDependency,
+    format: Literal["csv", "ndjson"] = Query(
+        default="csv", description="Формат выгрузки"
+    ),
+):
+    try:
+        request_logger.info("Export request: user = %s, format = %s", user_id, format)
+        if not await UserRepository(session).get_existing_ids({user_id}):
+            raise HTTPException(status_code=404, detail="User not found")
+
+        return StreamingResponse(
+            stream_export(user_id, format),
+            media_type=EXPORT_MEDIA_TYPES[format],
+            headers={
+                "Content-Disposition": f'attachment; filename="typefast-{user_id}.{format}"',
+                "Cache-Control": "no-store",
+            },
+        )
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        error_logger.error("Error in export_user_test_results: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Export error: {str(e)}")
+
+
+@router.get(
+    "/percentiles",
+    response_model=PercentileResponse,
+)
+async def get_result_percentiles(
+    session: SessionDependency,
+    language: str = Query(pattern=settings.language_pattern, description="Язык теста"),
+    difficulty: str = Query(
+        pattern=settings.difficulty_pattern, description="Сложность теста"
+    ),
+    chars_per_minute: float | None = Query(default=None, ge=0),
+    accuracy: float | None = Query(default=None, ge=0, le=100),
+    time_seconds: float | None = Query(default=None, ge=0),
+):
+    values = {
+        metric: value
+        for metric, value in (
+            ("chars_per_minute", chars_per_minute),
+            ("accuracy", accuracy),
+            ("time_seconds", time_seconds),
+        )
+        if value is not None
+    }
+    if not values:
+        raise HTTPException(
+            status_code=422, detail="At least one metric value is required"
+        )
+
+    try:
+        request_logger.info(
+            "Percentile request: language = %s, difficulty = %s", language, difficulty
+        )
+        return await get_percentiles(session, language, difficulty, values)
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        error_logger.error("Error in get_result_percentiles: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=500, detail="Internal server error when receiving percentiles"
+        )
+
+
+@router.get(
+    "/leaderboard",
+    response_model=LeaderboardResponse,
+)
+async def get_leaderboard(
+    language: str = Query(pattern=settings.language_pattern, description="Язык теста"),
+    difficulty: str = Query(
+        pattern=settings.difficulty_pattern, description="Сложность теста"
+    ),
+    period: Literal["all", "day"] = Query(
+        default="all", description="За всё время или за день"
+    ),
+    day: date | None = Query(
+        default=None, description="День (UTC) для period=day; по умолчанию — сегодня"
+    ),
+    limit: int = Query(
+        default=settings.leaderboard_size,
+        ge=1,
+        le=settings.leaderboard_size,
+        description="Количество мест",
+    ),
+):
+    try:
+        request_logger.info(
+            "Leaderboard request: language = %s, difficulty = %s, period = %s",
+            language,
+            difficulty,
+            period,
+        )
+        board_period = period
+        if period == "day":
+            board_period = day.isoformat() if day else leaderboards.today()
+
+        return LeaderboardResponse(
+            language=language,
+            difficulty=difficulty,
+            period=board_period,
+            min_accuracy=leaderboards.min_accuracy,
+            items=await leaderboards.get(language, difficulty, board_period, limit),
+        )
+
+    except Exception as e:
+        error_logger.error("Error in get_leaderboard: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=500, detail="Internal server error when receiving leaderboard"
+        )
+
+
+@router.get(
+    "/stats/global",
+    response_model=GlobalStatisticsResponse,
+)
+async def get_global_test_statistics(
+    session: SessionDependency,
+    language: str | None = Query(
+        default=None, pattern=settings.language_pattern, description="Язык теста"
+    ),
+    difficulty: str | None = Query(
+        default=None,
+        pattern=settings.difficulty_pattern,
+        description="Сложность теста",
+    ),
+    days: int | None = Query(
+        default=None,
+        ge=1,
+        le=settings.max_global_stats_days,
+        description="Разбивка по дням за последние days дней",
+    ),
+):
+    try:
+        request_logger.info(
+            "Global statistics request: language = %s, difficulty = %s, days = %s",
+            language,
+            difficulty,
+            days,
+        )
+        return await get_global_statistics(session, language, difficulty, days)
+
+    except Exception as e:
+        error_logger.error("Error in get_global_test_statistics: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Internal server error when receiving global statistics",
+        )
+
+
+@router.get(
+    "/users/{user_id}/progress",
+    response_model=ProgressMetrics,
+)
+async def get_user_progress(
+    user_id: str,
+    session: SessionDependency,
+    window: int = Query(
+        default=settings.progress_window,
+        ge=1,
+        le=settings.max_progress_window,
+        description="Размер окна скользящего среднего и тренда",
+    ),
+    alpha: float = Query(
+        default=settings.progress_ewma_alpha,
+        gt=0,
+        le=1,
+        description="Коэффициент сглаживания EWMA",
+    ),
+):
+    test_result_repo = TestResultRepository(session)
+    try:
+        request_logger.info("Request user: %s progress, window = %s", user_id, window)
+        rows = await test_result_repo.get_series_columns(user_id, PROGRESS_COLUMNS)
+        if not rows:
+            raise HTTPException(
+                status_code=404, detail="No statistics found for this user"
+            )
+
+        return UserProgressCalculator.calculate_progress(
+            UserProgressCalculator.columns_from_rows(rows), window, alpha
+        )
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        error_logger.error("Error in get_user_progress: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=500, detail="Internal server error when receiving progress"
+        )
@@ -1,4 +1,5 @@
 import logging
+import os
 from pathlib import Path
 from typing import Literal, TypedDict
 from pydantic import BaseModel, Field
@@ -17,12 +18,26 @@ class TextGenerationConfig(TypedDict):
     level: Literal["easy", "medium", "hard"]
 
 
+class HistogramBinsConfig(TypedDict):
+    low: float
+    width: float
+    count: int
+
+
 class DatabaseConfig(TypedDict):
     url: str
     echo: bool
     future: bool
 
 
+class PoolConfig(TypedDict):
+    pool_size: int
+    max_overflow: int
+    pool_timeout: float
+    pool_recycle: int
+    pool_pre_ping: bool
+
+
 class LoggingConfig(TypedDict):
     logs_dir: Path
     error_log_filename: str
@@ -30,6 +45,8 @@ class LoggingConfig(TypedDict):
     max_log_size_bytes: int
     backup_count: int
     log_level: int
+    queue_size: int
+    sample_rates: dict[str, float]
 
 
 class Settings(BaseModel):
@@ -62,11 +79,75 @@ class Settings(BaseModel):
     html_index_path: Path = Field(default=Path("frontend/html/index.html"))
     html_statistics_path: Path = Field(default=Path("frontend/html/statistics.html"))
 
+    static_asset_cache: bool = Field(default=True)
+    static_max_age_seconds: int = Field(default=365 * 24 * 60 * 60)
+    static_min_compress_bytes: int = Field(default=256)
+
     database_name: str = Field(default="typing_test.db")
-    database_url: str = Field(default="sqlite+aiosqlite:///typing_test.db")
+    database_url: str = Field(
+        default_factory=lambda: os.getenv(
+            "DATABASE_URL", "sqlite+aiosqlite:///typing_test.db"
+        )
+    )
     database_echo: bool = Field(default=True)
     database_future: bool = Field(default=True)
 
+    database_pool_size: int = Field(default=10)
+    database_max_overflow: int = Field(default=10)
+    database_pool_timeout_seconds: float = Field(default=30.0)
+    database_pool_recycle_seconds: int = Field(default=1800)
+    database_pool_pre_ping: bool = Field(default=True)
+    database_copy_min_rows: int = Field(default=1000)
+
+    database_schema_init: Literal["create", "migrate", "none"] = Field(
+        default_factory=lambda: os.getenv("DATABASE_SCHEMA_INIT", "migrate"),
+        validate_default=True,
+    )
+    database_warmup_connections: int = Field(default=4)
+
+    database_split_read_write: bool = Field(default=True)
+    database_read_pool_size: int = Field(default=4)
+    sqlite_journal_mode: Literal["WAL", "DELETE", "TRUNCATE", "MEMORY"] = Field(
+        default="WAL"
+    )
+    sqlite_synchronous: Literal["OFF", "NORMAL", "FULL"] = Field(default="NORMAL")
+    sqlite_busy_timeout_ms: int = Field(default=5000)
+    sqlite_cache_size_kib: int = Field(default=64 * 1024)
+    sqlite_mmap_size_bytes: int = Field(default=256 * 1024 * 1024)
+
+    max_batch_results: int = Field(default=1000)
+    history_page_size: int = Field(default=50)
+    max_history_page_size: int = Field(default=500)
+    series_points: int = Field(default=300)
+    max_series_points: int = Field(default=2000)
+    export_chunk_rows: int = Field(default=5000)
+
+    progress_window: int = Field(default=20)
+    max_progress_window: int = Field(default=1000)
+    progress_ewma_alpha: float = Field(default=0.2)
+
+    global_stats_cache_size: int = Field(default=256)
+    global_stats_cache_ttl_seconds: float = Field(default=30.0)
+    max_global_stats_days: int = Field(default=365)
+
+    statistics_cache_size: int = Field(default=10_000)
+    statistics_cache_ttl_seconds: float = Field(default=300.0)
+    statistics_cache_max_bytes: int = Field(default=32 * 1024 * 1024)
+    statistics_cache_shared_versions: bool = Field(default=False)
+
+    leaderboard_size: int = Field(default=100)
+    leaderboard_min_accuracy: float = Field(default=90.0)
+    leaderboard_refresh_seconds: float = Field(default=5.0)
+    leaderboard_daily_retention_days: int = Field(default=30)
+
+    result_write_behind: bool = Field(default=False)
+    result_write_behind_batch_size: int = Field(default=500)
+    result_write_behind_flush_ms: int = Field(default=50)
+    result_write_behind_queue_size: int = Field(default=10_000)
+    result_write_behind_put_timeout_seconds: float = Field(default=1.0)
+    result_write_behind_retries: int = Field(default=3)
+    result_write_behind_retry_backoff_ms: int = Field(default=100)
+
     allowed_levels: list[Literal["easy", "medium", "hard", "test"]] = Field(
         default=["easy", "medium", "hard", "test"]
     )
@@ -77,6 +158,20 @@ class Settings(BaseModel):
     api_prefix: str = Field(default="/api")
 
     default_count_words: int = Field(default=50)
+    default_batch_texts: int = Field(default=5)
+    max_batch_texts: int = Field(default=20)
+
+    text_pool_size: int = Field(default=50)
+    text_pool_low_water: int = Field(default=10)
+    text_pool_refill_interval_seconds: float = Field(default=1.0)
+    text_pool_rate_window_seconds: float = Field(default=60.0)
+
+    max_text_seed: int = Field(default=2**53 - 1)
+    text_cache_size: int = Field(default=10_000)
+    text_cache_max_age_seconds: int = Field(default=86_400)
+
+    text_stream_chunk_words: int = Field(default=10)
+    max_text_stream_chunk_words: int = Field(default=100)
     default_level: Literal["easy", "medium", "hard"] = Field(default="easy")
 
     language_pattern: str = Field(default="^(ru|en)$")
@@ -116,6 +211,14 @@ class Settings(BaseModel):
         "test": 50,
     }
 
+    _percentile_bins: dict[
+        Literal["chars_per_minute", "accuracy", "time_seconds"], HistogramBinsConfig
+    ] = {
+        "chars_per_minute": {"low": 0.0, "width": 5.0, "count": 400},
+        "accuracy": {"low": 0.0, "width": 0.5, "count": 201},
+        "time_seconds": {"low": 0.0, "width": 1.0, "count": 600},
+    }
+
     logging_config: LoggingConfig = Field(
         default_factory=lambda: {
             "logs_dir": Path("logs"),
@@ -124,6 +227,8 @@ class Settings(BaseModel):
             "max_log_size_bytes": 10 * 1024 * 1024,
             "backup_count": 2,
             "log_level": logging.INFO,
+            "queue_size": 10_000,
+            "sample_rates": {"request_logger": 1.0},
         }
     )
 
@@ -165,6 +270,26 @@ class Settings(BaseModel):
             "future": self.database_future,
         }
 
+    @property
+    def database_pool_config(self) -> PoolConfig:
+        return {
+            "pool_size": self.database_pool_size,
+            "max_overflow": self.database_max_overflow,
+            "pool_timeout": self.database_pool_timeout_seconds,
+            "pool_recycle": self.database_pool_recycle_seconds,
+            "pool_pre_ping": self.database_pool_pre_ping,
+        }
+
+    @property
+    def sqlite_pragmas(self) -> dict[str, str | int]:
+        return {
+            "journal_mode": self.sqlite_journal_mode,
+            "synchronous": self.sqlite_synchronous,
+            "busy_timeout": self.sqlite_busy_timeout_ms,
+            "cache_size": -self.sqlite_cache_size_kib,
+            "mmap_size": self.sqlite_mmap_size_bytes,
+        }
+
     @property
     def probability(self) -> dict[Literal["easy", "medium", "hard", "test"], float]:
         return self._probability
@@ -183,6 +308,14 @@ class Settings(BaseModel):
     def number_of_words(self) -> dict[Literal["easy", "medium", "hard", "test"], int]:
         return self._number_of_words
 
+    @property
+    def percentile_bins(
+        self,
+    ) -> dict[
+        Literal["chars_per_minute", "accuracy", "time_seconds"], HistogramBinsConfig
+    ]:
+        return self._percentile_bins
+
     @property
     def language_filepath(self) -> dict[Literal["ru", "en"], Path]:
         return {
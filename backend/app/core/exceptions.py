@@ -25,6 +25,7 @@ class DatabaseException(HTTPException):
         super().__init__(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=error_msg
         )
+        self.original_error: Exception | None = original_error
 
 
 class NotFoundException(HTTPException):
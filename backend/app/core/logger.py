@@ -1,42 +1,195 @@
+import atexit
+import copy
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import random
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 from backend.app.core.config import settings
+from backend.app.schemas.logging_schemas import LoggerStatistics, LoggingStatistics
 
+_RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", None, None).__dict__
+) | {"message", "asctime", "taskName"}
 
-def setup_logger(name: str, log_file: str, level=None):
-    log_config = settings.logging_config
 
-    level = level or log_config["log_level"]
+class JsonFormatter(logging.Formatter):
+    """Запись лога одной строкой JSON; поля из extra= попадают в объект."""
 
-    log_file = log_file.format(date=datetime.now().strftime("%Y-%m-%d"))
-    full_log_path = os.path.join(log_config["logs_dir"], log_file)
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(
+            (key, value)
+            for key, value in record.__dict__.items()
+            if key not in _RECORD_ATTRIBUTES
+        )
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = record.stack_info
+        return json.dumps(entry, ensure_ascii=False, default=str)
 
-    os.makedirs(os.path.dirname(full_log_path), exist_ok=True)
 
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+class SamplingFilter(logging.Filter):
+    """Пропуск доли записей ниже WARNING; предупреждения и ошибки не теряются."""
 
-    file_handler = RotatingFileHandler(
-        full_log_path,
-        maxBytes=log_config["max_log_size_bytes"],
-        backupCount=log_config["backup_count"],
-    )
-    file_handler.setFormatter(formatter)
+    def __init__(self, rate: float) -> None:
+        super().__init__()
+        self.rate: float = rate
+        self.sampled_out: int = 0
 
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
-    logger.addHandler(file_handler)
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or self.rate >= 1.0:
+            return True
+        if random.random() < self.rate:
+            return True
+        self.sampled_out += 1
+        return False
 
-    return logger
 
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler, который не блокирует вызывающий поток.
 
-error_logger = setup_logger(
+    Сообщение подставляется в вызывающем потоке (аргументы могут
+    измениться позже), трассировка форматируется там же, пока жив
+    контекст исключения. Если очередь заполнена, запись отбрасывается
+    и учитывается в dropped.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped: int = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.message = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(QueueListener):
+    """QueueListener, останавливающийся и при заполненной очереди.
+
+    Стандартный stop() кладёт маркер остановки через put_nowait и при
+    переполнении падает с queue.Full, не дождавшись потока. Здесь маркер
+    ждёт места, пока поток жив и разбирает очередь.
+    """
+
+    def enqueue_sentinel(self) -> None:
+        while self._thread is not None and self._thread.is_alive():
+            try:
+                self.queue.put(self._sentinel, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+class LogQueue:
+    """Общая ограниченная очередь логов и фоновый поток записи в файлы.
+
+    Логгеры приложения пишут только в очередь; RotatingFileHandler
+    (и ротация) работают в потоке QueueListener. Каждый файловый
+    обработчик принимает записи только своего логгера.
+    """
+
+    def __init__(self) -> None:
+        log_config = settings.logging_config
+        self._queue: queue.Queue = queue.Queue(maxsize=log_config["queue_size"])
+        self._queue_handler = DroppingQueueHandler(self._queue)
+        self._file_handlers: list[logging.Handler] = []
+        self._filters: dict[str, SamplingFilter] = {}
+        self._listener: QueueListener | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._listener is not None
+
+    def setup_logger(self, name: str, log_file: str, level=None) -> logging.Logger:
+        log_config = settings.logging_config
+
+        level = level or log_config["log_level"]
+
+        log_file = log_file.format(date=datetime.now().strftime("%Y-%m-%d"))
+        full_log_path = os.path.join(log_config["logs_dir"], log_file)
+
+        os.makedirs(os.path.dirname(full_log_path), exist_ok=True)
+
+        file_handler = RotatingFileHandler(
+            full_log_path,
+            maxBytes=log_config["max_log_size_bytes"],
+            backupCount=log_config["backup_count"],
+            encoding="utf-8",
+        )
+        file_handler.setFormatter(JsonFormatter())
+        file_handler.addFilter(logging.Filter(name))
+        self._file_handlers.append(file_handler)
+
+        sampling = SamplingFilter(log_config["sample_rates"].get(name, 1.0))
+        self._filters[name] = sampling
+
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+        logger.addFilter(sampling)
+        logger.addHandler(self._queue_handler)
+        if self._listener is not None:
+            self._listener.handlers = tuple(self._file_handlers)
+
+        return logger
+
+    def start(self) -> None:
+        if self._listener is None:
+            self._listener = DrainingQueueListener(self._queue, *self._file_handlers)
+            self._listener.start()
+
+    def stop(self) -> None:
+        """Запись оставшихся в очереди записей и остановка потока."""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+            for handler in self._file_handlers:
+                handler.flush()
+
+    def statistics(self) -> LoggingStatistics:
+        return LoggingStatistics(
+            running=self.running,
+            queued=self._queue.qsize(),
+            capacity=self._queue.maxsize,
+            dropped=self._queue_handler.dropped,
+            loggers={
+                name: LoggerStatistics(
+                    sample_rate=sampling.rate, sampled_out=sampling.sampled_out
+                )
+                for name, sampling in self._filters.items()
+            },
+        )
+
+
+log_queue = LogQueue()
+
+error_logger = log_queue.setup_logger(
     "error_logger", settings.logging_config["error_log_filename"]
 )
-request_logger = setup_logger(
+request_logger = log_queue.setup_logger(
     "request_logger", settings.logging_config["request_log_filename"]
 )
+
+log_queue.start()
+atexit.register(log_queue.stop)
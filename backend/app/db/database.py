@@ -1,9 +1,53 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
-from backend.app.core.config import settings
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session, SessionTransaction
+from backend.app.db.storage_profile import create_engines
 
-engine = create_async_engine(settings.database_url)
-new_session = async_sessionmaker(engine, expire_on_commit=False)
+engine, read_engine = create_engines()
+
+_WRITER_KEY = "use_writer"
+
+
+class RoutingSession(Session):
+    """Сессия, направляющая чтение на движок читателей, а запись — на писателя.
+
+    После первой записи в транзакции все запросы до её завершения идут
+    через писателя, чтобы чтение видело собственные незафиксированные
+    изменения.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or (clause is not None and clause.is_dml):
+            self.info[_WRITER_KEY] = True
+        if self.info.get(_WRITER_KEY):
+            return self.info["writer"]
+        return self.info["reader"]
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _reset_route(session: Session, transaction: SessionTransaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(_WRITER_KEY, None)
+
+
+def make_session_factory(
+    writer: AsyncEngine, reader: AsyncEngine
+) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        expire_on_commit=False,
+        info={"writer": writer.sync_engine, "reader": reader.sync_engine},
+    )
+
+
+new_session = make_session_factory(engine, read_engine)
+
+
+async def dispose_engines() -> None:
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
 
 
 class Base(DeclarativeBase):
@@ -1,6 +1,7 @@
 from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.core.config import settings
 from backend.app.db.database import new_session
 from backend.app.db.database import Base, engine
 
@@ -16,4 +17,40 @@ async def init_models():
         await conn.run_sync(Base.metadata.create_all)
 
 
+def alembic_config():
+    """Конфигурация Alembic без alembic.ini, чтобы не перенастраивать логирование."""
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option(
+        "script_location", str(settings.base_dir / "backend" / "migrations")
+    )
+    return config
+
+
+def _current_revisions(connection) -> set[str]:
+    from alembic.runtime.migration import MigrationContext
+
+    return set(MigrationContext.configure(connection).get_current_heads())
+
+
+async def require_current_schema() -> None:
+    """Остановка команды обслуживания, если схема БД не обновлена до head.
+
+    Команды пересчёта агрегатов пишут в таблицы, которые создают и
+    заполняют миграции; create_all не добавил бы недостающие столбцы.
+    """
+    from alembic.script import ScriptDirectory
+
+    heads = set(ScriptDirectory.from_config(alembic_config()).get_heads())
+    async with engine.connect() as connection:
+        current = await connection.run_sync(_current_revisions)
+    if current != heads:
+        raise SystemExit(
+            "Схема БД не обновлена до последней миграции "
+            f"(текущая: {', '.join(sorted(current)) or 'нет'}); "
+            "выполните alembic upgrade head"
+        )
+
+
 SessionDependency = Annotated[AsyncSession, Depends(get_session)]
@@ -23,6 +23,12 @@ class User(Base):
     test_results: Mapped[list["TestResult"]] = relationship(
         "TestResult", back_populates="user", cascade="all, delete-orphan"
     )
+    stats: Mapped[list["UserStats"]] = relationship(
+        "UserStats", cascade="all, delete-orphan"
+    )
+    leaderboard_entries: Mapped[list["LeaderboardEntry"]] = relationship(
+        "LeaderboardEntry", cascade="all, delete-orphan"
+    )
 
     @override
     def __repr__(self) -> str:
@@ -35,6 +41,12 @@ class TestResult(Base):
     __tablename__: str = "test_results"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    public_id: Mapped[str] = mapped_column(
+        String(36),
+        unique=True,
+        nullable=False,
+        default=lambda: str(uuid.uuid4()),
+    )
     user_id: Mapped[str] = mapped_column(
         String(36), ForeignKey("users.id"), nullable=False, index=True
     )
@@ -60,3 +72,131 @@ class TestResult(Base):
     @override
     def __repr__(self) -> str:
         return f"<TestResult(id={self.id}, user_id={self.user_id}, cpm={self.chars_per_minute}, accuracy={self.accuracy}%)>"
+
+
+class UserStats(Base):
+    """Инкрементально поддерживаемые агрегаты результатов пользователя.
+
+    Строка с language = difficulty = "*" хранит агрегаты по всем тестам.
+    Для каждой метрики хранятся бегущие моменты (среднее и M2 по Уэлфорду),
+    минимум, максимум и значение последнего результата.
+    """
+
+    __tablename__: str = "user_stats"
+
+    ALL: str = "*"
+
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id"), primary_key=True
+    )
+    language: Mapped[str] = mapped_column(String(10), primary_key=True)
+    difficulty: Mapped[str] = mapped_column(String(10), primary_key=True)
+    total_tests: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    chars_per_minute_mean: Mapped[float] = mapped_column(Float, nullable=False)
+    chars_per_minute_m2: Mapped[float] = mapped_column(Float, nullable=False)
+    chars_per_minute_min: Mapped[float] = mapped_column(Float, nullable=False)
+    chars_per_minute_max: Mapped[float] = mapped_column(Float, nullable=False)
+    chars_per_minute_last: Mapped[float] = mapped_column(Float, nullable=False)
+
+    accuracy_mean: Mapped[float] = mapped_column(Float, nullable=False)
+    accuracy_m2: Mapped[float] = mapped_column(Float, nullable=False)
+    accuracy_min: Mapped[float] = mapped_column(Float, nullable=False)
+    accuracy_max: Mapped[float] = mapped_column(Float, nullable=False)
+    accuracy_last: Mapped[float] = mapped_column(Float, nullable=False)
+
+    time_seconds_mean: Mapped[float] = mapped_column(Float, nullable=False)
+    time_seconds_m2: Mapped[float] = mapped_column(Float, nullable=False)
+    time_seconds_min: Mapped[float] = mapped_column(Float, nullable=False)
+    time_seconds_max: Mapped[float] = mapped_column(Float, nullable=False)
+    time_seconds_last: Mapped[float] = mapped_column(Float, nullable=False)
+
+    last_result_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_language: Mapped[str] = mapped_column(String(10), nullable=False)
+    last_difficulty: Mapped[str] = mapped_column(String(10), nullable=False)
+    last_created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+    @override
+    def __repr__(self) -> str:
+        return f"<UserStats(user_id={self.user_id}, language={self.language}, difficulty={self.difficulty}, total_tests={self.total_tests})>"
+
+
+class ResultHistogram(Base):
+    """Гистограмма значений метрики по результатам пары (язык, сложность).
+
+    Границы корзин задаются settings.percentile_bins; значения за пределами
+    диапазона попадают в крайние корзины.
+    """
+
+    __tablename__: str = "result_histograms"
+
+    language: Mapped[str] = mapped_column(String(10), primary_key=True)
+    difficulty: Mapped[str] = mapped_column(String(10), primary_key=True)
+    metric: Mapped[str] = mapped_column(String(32), primary_key=True)
+    bin: Mapped[int] = mapped_column(Integer, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    @override
+    def __repr__(self) -> str:
+        return f"<ResultHistogram(language={self.language}, difficulty={self.difficulty}, metric={self.metric}, bin={self.bin}, count={self.count})>"
+
+
+class LeaderboardEntry(Base):
+    """Лучший результат пользователя в таблице лидеров.
+
+    Таблица лидеров — пара (язык, сложность) и период: "all" для таблицы
+    за всё время или дата в формате ISO (UTC) для дневной таблицы.
+    """
+
+    __tablename__: str = "leaderboard_entries"
+
+    ALL_TIME: str = "all"
+
+    language: Mapped[str] = mapped_column(String(10), primary_key=True)
+    difficulty: Mapped[str] = mapped_column(String(10), primary_key=True)
+    period: Mapped[str] = mapped_column(String(10), primary_key=True)
+    user_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("users.id"), primary_key=True
+    )
+    test_result_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    chars_per_minute: Mapped[float] = mapped_column(Float, nullable=False)
+    accuracy: Mapped[float] = mapped_column(Float, nullable=False)
+    time_seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+    __table_args__: tuple[Index] = (
+        Index(
+            "ix_leaderboard_entries_board_speed",
+            "language",
+            "difficulty",
+            "period",
+            "chars_per_minute",
+        ),
+    )
+
+    @override
+    def __repr__(self) -> str:
+        return f"<LeaderboardEntry(language={self.language}, difficulty={self.difficulty}, period={self.period}, user_id={self.user_id}, cpm={self.chars_per_minute})>"
+
+
+class StatisticsVersion(Base):
+    """Версия статистики пользователя для сброса кэша между процессами.
+
+    Счётчик увеличивается в той же транзакции, что и изменение результатов
+    пользователя; воркер, у которого в кэше ответ со старой версией,
+    считает его устаревшим. Внешнего ключа нет: строка переживает
+    удаление пользователя, чтобы сброс дошёл до всех процессов.
+    """
+
+    __tablename__: str = "statistics_versions"
+
+    user_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    @override
+    def __repr__(self) -> str:
+        return f"<StatisticsVersion(user_id={self.user_id}, version={self.version})>"
@@ -1,17 +1,108 @@
 import uuid
-from datetime import datetime, timezone
-from sqlalchemy import select, delete, desc, func
+from collections import Counter
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Mapping
+from functools import partial
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from sqlalchemy import select, delete, desc, func, insert, and_, or_, case, cast, Date
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError, DBAPIError
-from backend.app.db.models import User, TestResult
+from backend.app.core.config import settings
+from backend.app.db.models import (
+    User,
+    TestResult,
+    UserStats,
+    ResultHistogram,
+    LeaderboardEntry,
+    StatisticsVersion,
+)
 from backend.app.core.exceptions import DatabaseException, NotFoundException
+from backend.app.services.histograms import histogram_bin
+from backend.app.services.running_moments import RunningMoments
 from backend.app.schemas.db_schemas import (
     UserCreate,
     TestResultCreate,
     UserBestTestStatistics,
     UserAvgTestStatistics,
     UserLastTestStatistics,
+    UserTestStatisticsSnapshot,
+    TestResultHistoryPage,
+    GlobalStatisticsGroup,
+    DailyStatisticsBucket,
+)
+from backend.app.services.utils import as_utc, encode_cursor
+
+RESULT_COLUMNS: tuple[str, ...] = (
+    "id",
+    "user_id",
+    "language",
+    "difficulty",
+    "created_at",
+    "chars_per_minute",
+    "accuracy",
+    "time_seconds",
 )
+HISTORY_CHUNK_SIZE: int = 10_000
+
+RecordResults = Callable[[Iterable[Mapping[str, Any]]], Awaitable[None]]
+
+
+def _day_bucket(session: AsyncSession, column):
+    """Выражение даты (UTC) для группировки по дням в диалекте подключения."""
+    if session.get_bind().dialect.name == "postgresql":
+        return cast(func.timezone("UTC", column), Date)
+    return func.date(column)
+
+
+def _dialect_insert(session: AsyncSession, model):
+    """INSERT с поддержкой ON CONFLICT для диалекта текущего подключения."""
+    dialect = session.get_bind().dialect.name
+    return (postgresql.insert if dialect == "postgresql" else sqlite.insert)(model)
+
+
+async def _scan_results(
+    session: AsyncSession,
+    *criteria,
+    columns: tuple[str, ...] = RESULT_COLUMNS,
+    chunk_size: int = HISTORY_CHUNK_SIZE,
+) -> AsyncIterator[list]:
+    """Результаты пачками через серверный курсор в порядке (created_at, id).
+
+    В памяти одновременно находится не больше chunk_size строк,
+    независимо от объёма истории.
+    """
+    query = (
+        select(*(getattr(TestResult, column) for column in columns))
+        .where(*criteria)
+        .order_by(TestResult.created_at, TestResult.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    result = await session.stream(query)
+    async for rows in result.partitions():
+        yield rows
+
+
+async def _replay_results(
+    session: AsyncSession, record: RecordResults, *criteria
+) -> int:
+    """Учёт результатов истории в агрегате пачками; возвращает их число."""
+    total = 0
+    async for rows in _scan_results(session, *criteria):
+        await record([row._mapping for row in rows])
+        total += len(rows)
+    return total
+
+
+async def _rebuild_aggregate(
+    session: AsyncSession, clear, record: RecordResults, *criteria, commit: bool
+) -> int:
+    """Очистка таблицы агрегата и повторный учёт истории результатов."""
+    await session.execute(clear)
+    total = await _replay_results(session, record, *criteria)
+    if commit:
+        await session.commit()
+    return total
 
 
 class UserRepository:
@@ -22,10 +113,13 @@ class UserRepository:
 
     async def create(self, user_data: UserCreate) -> User:
         try:
-            user = User(id=str(uuid.uuid4()), created_at=datetime.now(timezone.utc))
-            self.session.add(user)
+            query = (
+                insert(User)
+                .values(id=str(uuid.uuid4()), created_at=datetime.now(timezone.utc))
+                .returning(User)
+            )
+            user = await self.session.scalar(query)
             await self.session.commit()
-            await self.session.refresh(user)
             return user
         except IntegrityError as e:
             await self.session.rollback()
@@ -36,6 +130,48 @@ class UserRepository:
             await self.session.rollback()
             raise DatabaseException("Failed to create user", e)
 
+    @staticmethod
+    def new_ids(count: int) -> list[str]:
+        """Новые идентификаторы пользователей, выдаваемые до записи в БД."""
+        return [str(uuid.uuid4()) for _ in range(count)]
+
+    async def create_many(self, user_ids: list[str], commit: bool = True) -> list[str]:
+        """Создание пользователей одним INSERT; при commit=False — без фиксации."""
+        if not user_ids:
+            return []
+
+        now = datetime.now(timezone.utc)
+        try:
+            await self.session.execute(
+                insert(User),
+                [{"id": user_id, "created_at": now} for user_id in user_ids],
+            )
+            if commit:
+                await self.session.commit()
+            return user_ids
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise DatabaseException(
+                "Failed to create users - integrity constraint violated", e
+            )
+        except (SQLAlchemyError, DBAPIError) as e:
+            await self.session.rollback()
+            raise DatabaseException("Failed to create users", e)
+
+    async def get_existing_ids(self, user_ids: set[str]) -> set[str]:
+        """Идентификаторы из набора, для которых пользователь существует."""
+        if not user_ids:
+            return set()
+
+        try:
+            query = select(User.id).where(User.id.in_(user_ids))
+            result = await self.session.execute(query)
+            return set(result.scalars().all())
+
+        except (SQLAlchemyError, DBAPIError) as e:
+            await self.session.rollback()
+            raise DatabaseException("Failed to check existing users", e)
+
     async def get_by_id(self, user_id: str) -> User | None:
         try:
             query = select(User).where(User.id == user_id)
@@ -55,6 +191,8 @@ class UserRepository:
         try:
             user = await self.get_by_id(user_id)
             if user:
+                await ResultHistogramRepository(self.session).forget_user(user_id)
+                await StatisticsVersionRepository(self.session).bump([user_id])
                 await self.session.delete(user)
                 await self.session.commit()
                 return True
@@ -76,10 +214,20 @@ class TestResultRepository:
 
     async def create(self, test_result_data: TestResultCreate) -> TestResult:
         try:
-            test_result = TestResult(**test_result_data.model_dump())
-            self.session.add(test_result)
+            values = test_result_data.model_dump()
+            values["created_at"] = values["created_at"] or datetime.now(timezone.utc)
+            test_result = await self.session.scalar(
+                insert(TestResult).values(**values).returning(TestResult)
+            )
+            row = {
+                column: getattr(test_result, column)
+                for column in RESULT_COLUMNS
+            }
+            await UserStatsRepository(self.session).record([row])
+            await ResultHistogramRepository(self.session).record([row])
+            await LeaderboardRepository(self.session).record([row])
+            await StatisticsVersionRepository(self.session).bump([test_result.user_id])
             await self.session.commit()
-            await self.session.refresh(test_result)
             return test_result
 
         except IntegrityError as e:
@@ -91,6 +239,87 @@ class TestResultRepository:
             await self.session.rollback()
             raise DatabaseException("Failed to create test result", e)
 
+    async def create_many(
+        self, test_results_data: list[TestResultCreate], commit: bool = True
+    ) -> list[int]:
+        """Вставка результатов пачкой с идентификаторами в порядке входных данных.
+
+        На PostgreSQL (asyncpg) пачки от settings.database_copy_min_rows строк
+        пишутся через COPY, остальные — одним INSERT ... RETURNING
+        (executemany с insertmanyvalues).
+        """
+        if not test_results_data:
+            return []
+
+        now = datetime.now(timezone.utc)
+        rows = [
+            {**data.model_dump(), "created_at": data.created_at or now}
+            for data in test_results_data
+        ]
+        try:
+            if (
+                len(rows) >= settings.database_copy_min_rows
+                and self.session.get_bind().dialect.driver == "asyncpg"
+            ):
+                test_result_ids = await self._copy_rows(rows)
+            else:
+                query = insert(TestResult).returning(
+                    TestResult.id, sort_by_parameter_order=True
+                )
+                result = await self.session.execute(query, rows)
+                test_result_ids = list(result.scalars().all())
+            inserted = [
+                {**row, "id": test_result_id}
+                for row, test_result_id in zip(rows, test_result_ids)
+            ]
+            await UserStatsRepository(self.session).record(inserted)
+            await ResultHistogramRepository(self.session).record(inserted)
+            await LeaderboardRepository(self.session).record(inserted)
+            await StatisticsVersionRepository(self.session).bump(
+                row["user_id"] for row in rows
+            )
+            if commit:
+                await self.session.commit()
+            return test_result_ids
+
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise DatabaseException(
+                "Failed to create test results - integrity constraint violated", e
+            )
+        except (SQLAlchemyError, DBAPIError) as e:
+            await self.session.rollback()
+            raise DatabaseException("Failed to create test results", e)
+
+    async def _copy_rows(self, rows: list[dict[str, Any]]) -> list[int]:
+        """COPY строк в test_results (asyncpg) с заранее выделенными id.
+
+        COPY не возвращает ключи, поэтому id берутся из последовательности
+        одним запросом и передаются вместе со строками.
+        """
+        connection = await self.session.connection(
+            bind_arguments={"clause": insert(TestResult)}
+        )
+        sequence = func.pg_get_serial_sequence(TestResult.__tablename__, "id")
+        result = await connection.execute(
+            select(func.nextval(sequence)).select_from(
+                func.generate_series(1, len(rows))
+            )
+        )
+        test_result_ids = list(result.scalars().all())
+
+        columns = ["id", *rows[0]]
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            TestResult.__tablename__,
+            records=[
+                (test_result_id, *row.values())
+                for test_result_id, row in zip(test_result_ids, rows)
+            ],
+            columns=columns,
+        )
+        return test_result_ids
+
     async def get_by_id(self, test_result_id: int) -> TestResult | None:
         try:
             query = select(TestResult).where(TestResult.id == test_result_id)
@@ -136,11 +365,122 @@ class TestResultRepository:
         except (SQLAlchemyError, DBAPIError) as e:
             raise DatabaseException("Failed to get filtered test results", e)
 
+    @staticmethod
+    def _aggregate_columns() -> list:
+        columns = [func.count(TestResult.id).label("total_tests")]
+        for metric in ("chars_per_minute", "accuracy", "time_seconds"):
+            column = getattr(TestResult, metric)
+            columns += [
+                func.avg(column).label(f"{metric}_mean"),
+                func.min(column).label(f"{metric}_min"),
+                func.max(column).label(f"{metric}_max"),
+            ]
+        return columns
+
+    @staticmethod
+    def _aggregate_group(row, model: type[GlobalStatisticsGroup], **extra):
+        values = row._mapping
+        return model(
+            language=values["language"],
+            difficulty=values["difficulty"],
+            total_tests=values["total_tests"],
+            **{
+                metric: {
+                    "mean": values[f"{metric}_mean"],
+                    "min": values[f"{metric}_min"],
+                    "max": values[f"{metric}_max"],
+                }
+                for metric in ("chars_per_minute", "accuracy", "time_seconds")
+            },
+            **extra,
+        )
+
+    async def get_global_aggregates(
+        self, language: str | None = None, difficulty: str | None = None
+    ) -> list[GlobalStatisticsGroup]:
+        """Количество, среднее, минимум и максимум по парам (язык, сложность) в SQL."""
+        query = select(
+            TestResult.language, TestResult.difficulty, *self._aggregate_columns()
+        )
+
+        if language:
+            query = query.where(TestResult.language == language)
+
+        if difficulty:
+            query = query.where(TestResult.difficulty == difficulty)
+
+        query = query.group_by(TestResult.language, TestResult.difficulty).order_by(
+            TestResult.language, TestResult.difficulty
+        )
+
+        try:
+            result = await self.session.execute(query)
+            return [
+                self._aggregate_group(row, GlobalStatisticsGroup) for row in result
+            ]
+
+        except (SQLAlchemyError, DBAPIError) as e:
+            raise DatabaseException("Failed to get global statistics", e)
+
+    async def get_daily_aggregates(
+        self,
+        since: datetime,
+        language: str | None = None,
+        difficulty: str | None = None,
+    ) -> list[DailyStatisticsBucket]:
+        """Те же агрегаты с разбивкой по дням (UTC) начиная с since."""
+        day = _day_bucket(self.session, TestResult.created_at).label("day")
+        query = select(
+            TestResult.language,
+            TestResult.difficulty,
+            day,
+            *self._aggregate_columns(),
+        ).where(TestResult.created_at >= since)
+
+        if language:
+            query = query.where(TestResult.language == language)
+
+        if difficulty:
+            query = query.where(TestResult.difficulty == difficulty)
+
+        query = query.group_by(
+            TestResult.language, TestResult.difficulty, day
+        ).order_by(day, TestResult.language, TestResult.difficulty)
+
+        try:
+            result = await self.session.execute(query)
+            return [
+                self._aggregate_group(row, DailyStatisticsBucket, day=row.day)
+                for row in result
+            ]
+
+        except (SQLAlchemyError, DBAPIError) as e:
+            raise DatabaseException("Failed to get daily statistics", e)
+
     async def delete_by_id(self, test_result_id: int) -> bool:
         try:
             test_result = await self.get_by_id(test_result_id)
             if test_result:
+                await ResultHistogramRepository(self.session).record(
+                    [
+                        {
+                            column: getattr(test_result, column)
+                            for column in RESULT_COLUMNS
+                        }
+                    ],
+                    sign=-1,
+                )
                 await self.session.delete(test_result)
+                await self.session.flush()
+                await UserStatsRepository(self.session).rebuild(
+                    test_result.user_id, commit=False
+                )
+                await LeaderboardRepository(self.session).rebuild(
+                    test_result.user_id, commit=False
+                )
+                await StatisticsVersionRepository(self.session).bump(
+                    [test_result.user_id]
+                )
                 await self.session.commit()
                 return True
             return False
@@ -155,8 +495,16 @@ class TestResultRepository:
 
     async def delete_by_user_id(self, user_id: str) -> bool:
         try:
+            await ResultHistogramRepository(self.session).forget_user(user_id)
             query = delete(TestResult).where(TestResult.user_id == user_id)
             result = await self.session.execute(query)
+            await self.session.execute(
+                delete(UserStats).where(UserStats.user_id == user_id)
+            )
+            await self.session.execute(
+                delete(LeaderboardEntry).where(LeaderboardEntry.user_id == user_id)
+            )
+            await StatisticsVersionRepository(self.session).bump([user_id])
             await self.session.commit()
             return True if result else False
 
@@ -253,3 +601,635 @@ class TestResultRepository:
             raise
         except (SQLAlchemyError, DBAPIError) as e:
             raise DatabaseException(f"Failed to get statistics for user {user_id}", e)
+
+    async def get_latest_key(
+        self, user_id: str
+    ) -> tuple[int, datetime, int | None] | None:
+        """Ключ последнего результата пользователя для ETag: (id, created_at, всего).
+
+        Последний результат берётся одним шагом по индексу
+        ix_test_results_user_created, а число тестов — из строки user_stats
+        по первичному ключу, чтобы ключ менялся и при удалении старых
+        результатов. None — результатов нет.
+        """
+        total_tests = (
+            select(UserStats.total_tests)
+            .where(
+                UserStats.user_id == user_id,
+                UserStats.language == UserStats.ALL,
+                UserStats.difficulty == UserStats.ALL,
+            )
+            .scalar_subquery()
+        )
+        query = (
+            select(TestResult.id, TestResult.created_at, total_tests)
+            .where(TestResult.user_id == user_id)
+            .order_by(desc(TestResult.created_at), desc(TestResult.id))
+            .limit(1)
+        )
+
+        try:
+            result = await self.session.execute(query)
+            row = result.first()
+            return None if row is None else tuple(row)
+
+        except (SQLAlchemyError, DBAPIError) as e:
+            raise DatabaseException(
+                f"Failed to get latest result key for user {user_id}", e
+            )
+
+    async def get_history_page(
+        self,
+        user_id: str,
+        limit: int,
+        after: tuple[datetime, int] | None = None,
+        language: str | None = None,
+        difficulty: str | None = None,
+    ) -> TestResultHistoryPage:
+        """Страница истории пользователя, новые результаты первыми.
+
+        Keyset-пагинация по (created_at, id): следующая страница начинается
+        строго после ключа последней строки, поэтому запрос идёт по индексу
+        ix_test_results_user_created без OFFSET. Строки читаются как кортежи
+        колонок, без гидратации ORM-объектов.
+        """
+        columns = TestResult.__table__.c
+        query = select(*columns).where(TestResult.user_id == user_id)
+
+        if language:
+            query = query.where(TestResult.language == language)
+
+        if difficulty:
+            query = query.where(TestResult.difficulty == difficulty)
+
+        if after is not None:
+            created_at, test_result_id = after
+            query = query.where(
+                or_(
+                    TestResult.created_at < created_at,
+                    and_(
+                        TestResult.created_at == created_at,
+                        TestResult.id < test_result_id,
+                    ),
+                )
+            )
+
+        query = query.order_by(desc(TestResult.created_at), desc(TestResult.id)).limit(
+            limit + 1
+        )
+
+        try:
+            result = await self.session.execute(query)
+            keys = [column.key for column in columns]
+            items = [dict(zip(keys, row)) for row in result]
+
+            next_cursor = None
+            if len(items) > limit:
+                items = items[:limit]
+                next_cursor = encode_cursor(items[-1]["created_at"], items[-1]["id"])
+
+            return TestResultHistoryPage(items=items, next_cursor=next_cursor)
+
+        except (SQLAlchemyError, DBAPIError) as e:
+            raise DatabaseException(f"Failed to get history for user {user_id}", e)
+
+    async def get_series_columns(
+        self,
+        user_id: str,
+        columns: tuple[str, ...],
+        language: str | None = None,
+        difficulty: str | None = None,
+    ) -> list[tuple]:
+        """Колонки результатов пользователя в хронологическом порядке, кортежами."""
+        query = select(*(getattr(TestResult, column) for column in columns)).where(
+            TestResult.user_id == user_id
+        )
+
+        if language:
+            query = query.where(TestResult.language == language)
+
+        if difficulty:
+            query = query.where(TestResult.difficulty == difficulty)
+
+        query = query.order_by(TestResult.created_at, TestResult.id)
+
+        try:
+            result = await self.session.execute(query)
+            return list(result.tuples())
+
+        except (SQLAlchemyError, DBAPIError) as e:
+            raise DatabaseException(f"Failed to get series for user {user_id}", e)
+
+    async def stream_by_user_id(
+        self, user_id: str, columns: tuple[str, ...], chunk_size: int
+    ) -> AsyncIterator[list[tuple]]:
+        """Результаты пользователя пачками через серверный курсор.
+
+        В памяти одновременно находится не больше chunk_size строк,
+        независимо от длины истории.
+        """
+        try:
+            async for rows in _scan_results(
+                self.session,
+                TestResult.user_id == user_id,
+                columns=columns,
+                chunk_size=chunk_size,
+            ):
+                yield rows
+
+        except (SQLAlchemyError, DBAPIError) as e:
+            raise DatabaseException(f"Failed to export results for user {user_id}", e)
+
+    async def get_user_statistics_snapshot(
+        self, user_id: str, stats: UserStats, page_size: int
+    ) -> UserTestStatisticsSnapshot:
+        """Сводка из строки user_stats и первая страница истории пользователя."""
+        return UserTestStatisticsSnapshot(
+            last_result=UserLastTestStatistics(
+                time=stats.time_seconds_last,
+                accuracy=stats.accuracy_last,
+                chars_per_minute=stats.chars_per_minute_last,
+                language=stats.last_language,
+                difficulty=stats.last_difficulty,
+            ),
+            best_performance=UserBestTestStatistics(
+                time=stats.time_seconds_min,
+                accuracy=stats.accuracy_max,
+                chars_per_minute=stats.chars_per_minute_max,
+            ),
+            avg_statistics=UserAvgTestStatistics(
+                time=stats.time_seconds_mean,
+                accuracy=stats.accuracy_mean,
+                chars_per_minute=stats.chars_per_minute_mean,
+                total_tests=stats.total_tests,
+            ),
+            history=await self.get_history_page(user_id, page_size),
+        )
+
+
+class UserStatsRepository:
+    """Агрегаты результатов пользователя, обновляемые вместе со вставкой.
+
+    Пачка результатов сворачивается в бегущие моменты по каждой паре
+    (язык, сложность) и по всем тестам пользователя, после чего
+    объединяется с сохранёнными значениями одним UPSERT по формуле Чана.
+    """
+
+    session: AsyncSession
+
+    METRICS: tuple[str, ...] = ("chars_per_minute", "accuracy", "time_seconds")
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @classmethod
+    def _aggregate(
+        cls, test_results: Iterable[Mapping[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Свёртка результатов в строки user_stats для UPSERT."""
+        moments: dict[tuple[str, str, str], list[RunningMoments]] = {}
+        last_rows: dict[tuple[str, str, str], Mapping[str, Any]] = {}
+        ordered = sorted(test_results, key=lambda row: (row["created_at"], row["id"]))
+
+        for row in ordered:
+            user_id = row["user_id"]
+            for key in (
+                (user_id, row["language"], row["difficulty"]),
+                (user_id, UserStats.ALL, UserStats.ALL),
+            ):
+                series = moments.get(key)
+                if series is None:
+                    series = moments[key] = [RunningMoments() for _ in cls.METRICS]
+                for metric_moments, metric in zip(series, cls.METRICS):
+                    metric_moments.add(float(row[metric]))
+                last_rows[key] = row
+
+        values = []
+        for (user_id, language, difficulty), series in moments.items():
+            last = last_rows[(user_id, language, difficulty)]
+            value = {
+                "user_id": user_id,
+                "language": language,
+                "difficulty": difficulty,
+                "total_tests": series[0].count,
+                "last_result_id": last["id"],
+                "last_language": last["language"],
+                "last_difficulty": last["difficulty"],
+                "last_created_at": last["created_at"],
+            }
+            for metric_moments, metric in zip(series, cls.METRICS):
+                value[f"{metric}_mean"] = metric_moments.mean
+                value[f"{metric}_m2"] = metric_moments.m2
+                value[f"{metric}_min"] = metric_moments.minimum
+                value[f"{metric}_max"] = metric_moments.maximum
+                value[f"{metric}_last"] = float(last[metric])
+            values.append(value)
+        return values
+
+    def _upsert(self):
+        """INSERT ... ON CONFLICT DO UPDATE со слиянием моментов в SQL."""
+        query = _dialect_insert(self.session, UserStats)
+        current = UserStats.__table__.c
+        excluded = query.excluded
+
+        total = current.total_tests + excluded.total_tests
+        is_newer = or_(
+            excluded.last_created_at > current.last_created_at,
+            and_(
+                excluded.last_created_at == current.last_created_at,
+                excluded.last_result_id > current.last_result_id,
+            ),
+        )
+
+        updates = {
+            "total_tests": total,
+            **{
+                column: case((is_newer, excluded[column]), else_=current[column])
+                for column in (
+                    "last_result_id",
+                    "last_language",
+                    "last_difficulty",
+                    "last_created_at",
+                )
+            },
+        }
+        for metric in self.METRICS:
+            mean, m2 = current[f"{metric}_mean"], current[f"{metric}_m2"]
+            delta = excluded[f"{metric}_mean"] - mean
+            minimum, maximum = f"{metric}_min", f"{metric}_max"
+            last = f"{metric}_last"
+
+            updates[f"{metric}_mean"] = mean + delta * excluded.total_tests / total
+            updates[f"{metric}_m2"] = (
+                m2
+                + excluded[f"{metric}_m2"]
+                + delta * delta * current.total_tests * excluded.total_tests / total
+            )
+            updates[minimum] = case(
+                (excluded[minimum] < current[minimum], excluded[minimum]),
+                else_=current[minimum],
+            )
+            updates[maximum] = case(
+                (excluded[maximum] > current[maximum], excluded[maximum]),
+                else_=current[maximum],
+            )
+            updates[last] = case((is_newer, excluded[last]), else_=current[last])
+
+        return query.on_conflict_do_update(
+            index_elements=[current.user_id, current.language, current.difficulty],
+            set_=updates,
+        )
+
+    async def record(self, test_results: Iterable[Mapping[str, Any]]) -> None:
+        """Учёт новых результатов в агрегатах в текущей транзакции, без фиксации."""
+        values = self._aggregate(test_results)
+        if values:
+            await self.session.execute(self._upsert(), values)
+
+    async def get(
+        self,
+        user_id: str,
+        language: str = UserStats.ALL,
+        difficulty: str = UserStats.ALL,
+    ) -> UserStats | None:
+        try:
+            return await self.session.get(UserStats, (user_id, language, difficulty))
+
+        except (SQLAlchemyError, DBAPIError) as e:
+            raise DatabaseException(f"Failed to get statistics for user {user_id}", e)
+
+    async def rebuild(self, user_id: str | None = None, commit: bool = True) -> int:
+        """Пересчёт агрегатов пользователя (или всех) по истории результатов.
+
+        Результаты читаются потоком пачками, каждая пачка сливается
+        с уже накопленными значениями. Возвращает число учтённых результатов.
+        """
+        criteria = []
+        clear = delete(UserStats)
+        if user_id is not None:
+            criteria.append(TestResult.user_id == user_id)
+            clear = clear.where(UserStats.user_id == user_id)
+
+        try:
+            return await _rebuild_aggregate(
+                self.session, clear, self.record, *criteria, commit=commit
+            )
+
+        except (SQLAlchemyError, DBAPIError) as e:
+            await self.session.rollback()
+            raise DatabaseException("Failed to rebuild user statistics", e)
+
+
+class ResultHistogramRepository:
+    """Гистограммы метрик по парам (язык, сложность) для ранга результата.
+
+    Счётчики корзин обновляются вместе со вставкой результатов одним UPSERT
+    с приращением, поэтому ранг читается из таблицы гистограмм за O(числа
+    корзин), не обращаясь к test_results.
+    """
+
+    session: AsyncSession
+
+    METRICS: tuple[str, ...] = ("chars_per_minute", "accuracy", "time_seconds")
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @classmethod
+    def _aggregate(
+        cls, test_results: Iterable[Mapping[str, Any]], sign: int
+    ) -> list[dict[str, Any]]:
+        """Свёртка результатов в приращения счётчиков корзин."""
+        increments: Counter[tuple[str, str, str, int]] = Counter()
+        for row in test_results:
+            for metric in cls.METRICS:
+                bin_index = histogram_bin(metric, float(row[metric]))
+                key = (row["language"], row["difficulty"], metric, bin_index)
+                increments[key] += sign
+
+        return [
+            {
+                "language": language,
+                "difficulty": difficulty,
+                "metric": metric,
+                "bin": bin_index,
+                "count": count,
+            }
+            for (language, difficulty, metric, bin_index), count in increments.items()
+            if count
+        ]
+
+    async def record(
+        self, test_results: Iterable[Mapping[str, Any]], sign: int = 1
+    ) -> None:
+        """Учёт результатов в гистограммах (sign=-1 — при удалении), без фиксации."""
+        values = self._aggregate(test_results, sign)
+        if not values:
+            return
+
+        query = _dialect_insert(self.session, ResultHistogram)
+        current = ResultHistogram.__table__.c
+        query = query.on_conflict_do_update(
+            index_elements=[
+                current.language,
+                current.difficulty,
+                current.metric,
+                current.bin,
+            ],
+            set_={"count": current.count + query.excluded.count},
+        )
+        await self.session.execute(query, values)
+
+    async def forget_user(self, user_id: str) -> int:
+        """Вычитание результатов пользователя из гистограмм перед их удалением."""
+        return await _replay_results(
+            self.session,
+            partial(self.record, sign=-1),
+            TestResult.user_id == user_id,
+        )
+
+    async def get_counts(
+        self, language: str, difficulty: str, metric: str
+    ) -> list[tuple[int, int]]:
+        """Непустые корзины гистограммы метрики: пары (корзина, количество)."""
+        query = select(ResultHistogram.bin, ResultHistogram.count).where(
+            ResultHistogram.language == language,
+            ResultHistogram.difficulty == difficulty,
+            ResultHistogram.metric == metric,
+            ResultHistogram.count > 0,
+        )
+
+        try:
+            result = await self.session.execute(query)
+            return list(result.tuples())
+
+        except (SQLAlchemyError, DBAPIError) as e:
+            raise DatabaseException("Failed to get result histogram", e)
+
+    async def rebuild(self, commit: bool = True) -> int:
+        """Пересчёт всех гистограмм по таблице результатов."""
+        try:
+            return await _rebuild_aggregate(
+                self.session, delete(ResultHistogram), self.record, commit=commit
+            )
+
+        except (SQLAlchemyError, DBAPIError) as e:
+            await self.session.rollback()
+            raise DatabaseException("Failed to rebuild result histograms", e)
+
+
+class LeaderboardRepository:
+    """Лучшие результаты пользователей в таблицах лидеров.
+
+    Для каждой таблицы (язык, сложность, период) хранится один лучший
+    по скорости результат пользователя с точностью не ниже порога;
+    UPSERT заменяет запись только более быстрым результатом.
+    """
+
+    session: AsyncSession
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @staticmethod
+    def period_of(created_at: datetime) -> str:
+        """Период дневной таблицы лидеров: дата результата в UTC."""
+        return as_utc(created_at).date().isoformat()
+
+    @classmethod
+    def _candidates(
+        cls, test_results: Iterable[Mapping[str, Any]]
+    ) -> list[dict[str, Any]]:
+        """Лучший результат пачки для каждой пары (таблица, пользователь)."""
+        best: dict[tuple[str, str, str, str], dict[str, Any]] = {}
+        for row in test_results:
+            if row["accuracy"] < settings.leaderboard_min_accuracy:
+                continue
+
+            periods = (LeaderboardEntry.ALL_TIME, cls.period_of(row["created_at"]))
+            for period in periods:
+                key = (row["language"], row["difficulty"], period, row["user_id"])
+                current = best.get(key)
+                if current is not None and (
+                    current["chars_per_minute"] >= row["chars_per_minute"]
+                ):
+                    continue
+
+                best[key] = {
+                    "language": row["language"],
+                    "difficulty": row["difficulty"],
+                    "period": period,
+                    "user_id": row["user_id"],
+                    "test_result_id": row["id"],
+                    "chars_per_minute": row["chars_per_minute"],
+                    "accuracy": row["accuracy"],
+                    "time_seconds": row["time_seconds"],
+                    "created_at": row["created_at"],
+                }
+        return list(best.values())
+
+    async def record(self, test_results: Iterable[Mapping[str, Any]]) -> None:
+        """Учёт результатов в таблицах лидеров в текущей транзакции, без фиксации."""
+        values = self._candidates(test_results)
+        if not values:
+            return
+
+        query = _dialect_insert(self.session, LeaderboardEntry)
+        current = LeaderboardEntry.__table__.c
+        excluded = query.excluded
+        query = query.on_conflict_do_update(
+            index_elements=[
+                current.language,
+                current.difficulty,
+                current.period,
+                current.user_id,
+            ],
+            set_={
+                column: excluded[column]
+                for column in (
+                    "test_result_id",
+                    "chars_per_minute",
+                    "accuracy",
+                    "time_seconds",
+                    "created_at",
+                )
+            },
+            where=excluded.chars_per_minute > current.chars_per_minute,
+        )
+        await self.session.execute(query, values)
+
+    async def get_top(
+        self, language: str, difficulty: str, period: str, limit: int
+    ) -> list[LeaderboardEntry]:
+        query = (
+            select(LeaderboardEntry)
+            .where(
+                LeaderboardEntry.language == language,
+                LeaderboardEntry.difficulty == difficulty,
+                LeaderboardEntry.period == period,
+            )
+            .order_by(
+                desc(LeaderboardEntry.chars_per_minute), LeaderboardEntry.created_at
+            )
+            .limit(limit)
+        )
+
+        try:
+            result = await self.session.execute(query)
+            return list(result.scalars().all())
+
+        except (SQLAlchemyError, DBAPIError) as e:
+            raise DatabaseException(
+                f"Failed to get leaderboard {language}/{difficulty}/{period}", e
+            )
+
+    async def prune(self, keep: int, retention_days: int) -> None:
+        """Удаление устаревших дневных таблиц и записей за пределами top-keep."""
+        oldest_period = (
+            datetime.now(timezone.utc).date() - timedelta(days=retention_days)
+        ).isoformat()
+        try:
+            await self.session.execute(
+                delete(LeaderboardEntry).where(
+                    LeaderboardEntry.period != LeaderboardEntry.ALL_TIME,
+                    LeaderboardEntry.period < oldest_period,
+                )
+            )
+
+            boards = await self.session.execute(
+                select(
+                    LeaderboardEntry.language,
+                    LeaderboardEntry.difficulty,
+                    LeaderboardEntry.period,
+                )
+                .group_by(
+                    LeaderboardEntry.language,
+                    LeaderboardEntry.difficulty,
+                    LeaderboardEntry.period,
+                )
+                .having(func.count() > keep)
+            )
+            for language, difficulty, period in boards.all():
+                board = (
+                    LeaderboardEntry.language == language,
+                    LeaderboardEntry.difficulty == difficulty,
+                    LeaderboardEntry.period == period,
+                )
+                threshold = await self.session.scalar(
+                    select(LeaderboardEntry.chars_per_minute)
+                    .where(*board)
+                    .order_by(desc(LeaderboardEntry.chars_per_minute))
+                    .offset(keep - 1)
+                    .limit(1)
+                )
+                await self.session.execute(
+                    delete(LeaderboardEntry).where(
+                        *board, LeaderboardEntry.chars_per_minute < threshold
+                    )
+                )
+            await self.session.commit()
+
+        except (SQLAlchemyError, DBAPIError) as e:
+            await self.session.rollback()
+            raise DatabaseException("Failed to prune leaderboards", e)
+
+    async def rebuild(self, user_id: str | None = None, commit: bool = True) -> int:
+        """Пересчёт таблиц лидеров (всех или для одного пользователя) по истории."""
+        criteria = [TestResult.accuracy >= settings.leaderboard_min_accuracy]
+        clear = delete(LeaderboardEntry)
+        if user_id is not None:
+            criteria.append(TestResult.user_id == user_id)
+            clear = clear.where(LeaderboardEntry.user_id == user_id)
+
+        try:
+            return await _rebuild_aggregate(
+                self.session, clear, self.record, *criteria, commit=commit
+            )
+
+        except (SQLAlchemyError, DBAPIError) as e:
+            await self.session.rollback()
+            raise DatabaseException("Failed to rebuild leaderboards", e)
+
+
+class StatisticsVersionRepository:
+    """Счётчики версий статистики пользователей для кэша между процессами.
+
+    Пока settings.statistics_cache_shared_versions выключен, bump ничего
+    не пишет и изменения результатов не платят за лишний UPSERT.
+    """
+
+    session: AsyncSession
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def bump(self, user_ids: Iterable[str]) -> None:
+        """Увеличение версий пользователей в текущей транзакции, без фиксации."""
+        if not settings.statistics_cache_shared_versions:
+            return
+        values = [{"user_id": user_id, "version": 1} for user_id in set(user_ids)]
+        if not values:
+            return
+
+        query = _dialect_insert(self.session, StatisticsVersion)
+        current = StatisticsVersion.__table__.c
+        query = query.on_conflict_do_update(
+            index_elements=[current.user_id],
+            set_={"version": current.version + 1},
+        )
+        await self.session.execute(query, values)
+
+    async def get(self, user_id: str) -> int:
+        """Текущая версия статистики пользователя (0, если изменений не было)."""
+        query = select(StatisticsVersion.version).where(
+            StatisticsVersion.user_id == user_id
+        )
+
+        try:
+            result = await self.session.execute(query)
+            return result.scalar_one_or_none() or 0
+
+        except (SQLAlchemyError, DBAPIError) as e:
+            raise DatabaseException(
+                f"Failed to get statistics version for user {user_id}", e
+            )
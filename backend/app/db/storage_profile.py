@@ -0,0 +1,73 @@
+from collections.abc import Mapping
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from backend.app.core.config import settings
+
+
+def is_file_sqlite(url: str) -> bool:
+    """URL указывает на файловую базу SQLite (не :memory:)."""
+    database_url = make_url(url)
+    if database_url.get_backend_name() != "sqlite":
+        return False
+    return database_url.database not in (None, "", ":memory:")
+
+
+def is_postgresql(url: str) -> bool:
+    return make_url(url).get_backend_name() == "postgresql"
+
+
+def apply_sqlite_pragmas(
+    engine: AsyncEngine, pragmas: Mapping[str, str | int], read_only: bool = False
+) -> None:
+    """Установка PRAGMA на каждом новом соединении пула.
+
+    read_only включает query_only: попытка записи через соединение
+    читателя завершится ошибкой, а не станет ждать блокировку писателя.
+    """
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+            if read_only:
+                cursor.execute("PRAGMA query_only = ON")
+        finally:
+            cursor.close()
+
+
+def create_engines(url: str | None = None) -> tuple[AsyncEngine, AsyncEngine]:
+    """Движки писателя и читателей для профиля хранилища из settings.
+
+    Для файловой SQLite писатель — единственное соединение (записи
+    выстраиваются в очередь пула, а не соревнуются за блокировку базы),
+    а читатели — пул из database_read_pool_size соединений только для
+    чтения; в режиме WAL они не блокируют запись. PostgreSQL получает
+    один движок с пулом из settings.database_pool_config (размер, тайм-аут,
+    пересоздание соединений и pre-ping). Для остальных баз и при
+    выключенном database_split_read_write оба движка совпадают.
+    """
+    url = url or settings.database_url
+    if is_postgresql(url):
+        engine = create_async_engine(url, **settings.database_pool_config)
+        return engine, engine
+
+    if not is_file_sqlite(url):
+        engine = create_async_engine(url)
+        return engine, engine
+
+    pragmas = settings.sqlite_pragmas
+    if not settings.database_split_read_write:
+        engine = create_async_engine(url)
+        apply_sqlite_pragmas(engine, pragmas)
+        return engine, engine
+
+    writer = create_async_engine(url, pool_size=1, max_overflow=0)
+    apply_sqlite_pragmas(writer, pragmas)
+    reader = create_async_engine(
+        url, pool_size=settings.database_read_pool_size, max_overflow=0
+    )
+    apply_sqlite_pragmas(reader, pragmas, read_only=True)
+    return writer, reader
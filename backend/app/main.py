@@ -1,14 +1,39 @@
 import uvicorn
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, Response
+from fastapi.responses import HTMLResponse, JSONResponse
 
-from backend.app.db.dependencies import init_models
+from backend.app.db.database import dispose_engines
 from backend.app.api.routes import router
 from backend.app.core.config import settings
+from backend.app.core.logger import log_queue
+from backend.app.schemas.health_schemas import ReadinessResponse
+from backend.app.services.static_assets import (
+    FAVICON_URL,
+    STATIC_PREFIX,
+    static_assets,
+)
+from backend.app.services.text_pool import text_pool
+from backend.app.services.result_writer import result_writer
+from backend.app.services.warmup import warmup
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_queue.start()
+    await warmup.run()
+    if settings.result_write_behind:
+        await result_writer.start()
+    yield
+    warmup.stop()
+    await result_writer.stop()
+    await text_pool.stop()
+    await dispose_engines()
+    log_queue.stop()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,41 +43,42 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.mount(
-    settings.mount_css,
-    StaticFiles(directory=settings.static_dir),
-    name=settings.static_dir,
-)
-app.mount(
-    settings.mount_js,
-    StaticFiles(directory=settings.static_js_dir),
-    name=settings.static_js_dir,
-)
-
 
 @app.get("/", response_class=HTMLResponse)
-async def read_index():
-    with open(settings.html_index_path, "r") as f:
-        html_content = f.read()
-    await init_models()
-    return html_content
+async def read_index(request: Request):
+    return static_assets.page("index").response(request)
+
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+
+@app.get("/readyz", response_model=ReadinessResponse)
+async def readyz():
+    readiness = warmup.statistics()
+    return JSONResponse(
+        content=readiness.model_dump(mode="json"),
+        status_code=200 if readiness.ready else 503,
+    )
+
+
+@app.get(FAVICON_URL)
+async def favicon(request: Request):
+    return static_assets.asset(FAVICON_URL).response(request)
 
 
-@app.get("/favicon.svg")
-async def favicon():
-    svg_content = """
-    <svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">
-      <text y=".9em" font-size="90">⚡</text>
-    </svg>
-    """
-    return Response(content=svg_content, media_type="image/svg+xml")
+@app.get(STATIC_PREFIX + "/{asset_path:path}")
+async def read_static(asset_path: str, request: Request):
+    asset = static_assets.asset(f"{STATIC_PREFIX}/{asset_path}")
+    if asset is None:
+        raise HTTPException(status_code=404, detail="Файл не найден")
+    return asset.response(request)
 
 
 @app.get("/statistics/{user_id}", response_class=HTMLResponse)
-async def read_statistics_page(user_id: str):
-    with open(settings.html_statistics_path, "r") as f:
-        html_content = f.read()
-    return html_content
+async def read_statistics_page(user_id: str, request: Request):
+    return static_assets.page("statistics").response(request)
 
 
 app.include_router(router, prefix=settings.api_prefix)
@@ -1,7 +1,9 @@
+import uuid
 from pydantic import BaseModel, Field, ConfigDict
-from datetime import datetime
-from typing import ClassVar
+from datetime import date, datetime
+from typing import ClassVar, Literal
 from backend.app.core.config import settings
+from backend.app.schemas.progress_schemas import ProgressMetrics
 
 
 class UserBase(BaseModel):
@@ -30,11 +32,15 @@ class TestResultBase(BaseModel):
 
 
 class TestResultCreate(TestResultBase):
-    pass
+    public_id: str = Field(
+        default_factory=lambda: str(uuid.uuid4()),
+        description="Идентификатор, выдаваемый клиенту до записи в БД",
+    )
 
 
 class TestResultResponse(TestResultBase):
     id: int
+    public_id: str | None = None
 
     model_config: ClassVar[ConfigDict] = ConfigDict(from_attributes=True)
 
@@ -56,3 +62,129 @@ class UserLastTestStatistics(UserBestTestStatistics):
 
 class UserAvgTestStatistics(UserBestTestStatistics):
     total_tests: int = 0
+
+
+class TestResultHistoryPage(BaseModel):
+    items: list[TestResultResponse] = Field(description="Результаты, новые первыми")
+    next_cursor: str | None = Field(
+        default=None, description="Курсор следующей страницы; None — страниц больше нет"
+    )
+
+
+class TestResultSeries(BaseModel):
+    created_at: list[datetime] = Field(default_factory=list)
+    values: list[float] = Field(default_factory=list)
+
+
+class UserTestSeriesResponse(BaseModel):
+    total: int = Field(description="Результатов до прореживания")
+    chars_per_minute: TestResultSeries
+    accuracy: TestResultSeries
+    time_seconds: TestResultSeries
+
+
+class UserTestStatisticsSnapshot(BaseModel):
+    last_result: UserLastTestStatistics
+    best_performance: UserBestTestStatistics
+    avg_statistics: UserAvgTestStatistics
+    history: TestResultHistoryPage
+
+
+class UserTestStatisticsResponse(UserTestStatisticsSnapshot):
+    progress_metrics: ProgressMetrics
+
+
+class TestResultBatchItem(BaseModel):
+    index: int = Field(description="Позиция результата во входном списке")
+    status: Literal["created", "invalid"]
+    user_id: str | None = None
+    test_result_id: int | None = None
+    public_id: str | None = None
+    error: str | None = None
+
+
+class TestResultBatchResponse(BaseModel):
+    created: int = 0
+    failed: int = 0
+    items: list[TestResultBatchItem] = Field(default_factory=list)
+
+
+class ResultWriterStatistics(BaseModel):
+    enabled: bool = Field(description="Включена ли отложенная запись")
+    queued: int = Field(description="Результатов в очереди")
+    capacity: int = Field(description="Ёмкость очереди")
+    written: int = Field(description="Записано результатов")
+    failed: int = Field(description="Результатов, которые не удалось записать")
+    batches: int = Field(description="Записано пачек")
+    retries: int = Field(description="Повторов записи после временных ошибок")
+    splits: int = Field(description="Делений пачки пополам из-за ошибочных строк")
+
+
+class StatisticsCacheStatistics(BaseModel):
+    entries: int = Field(description="Ответов в кэше")
+    capacity: int = Field(description="Максимум ответов в кэше")
+    bytes: int = Field(description="Объём закэшированных ответов в байтах")
+    max_bytes: int | None = Field(description="Лимит объёма кэша в байтах")
+    hits: int = Field(description="Попаданий в кэш")
+    misses: int = Field(description="Промахов кэша")
+    evictions: int = Field(description="Вытеснено записей по лимиту")
+    expirations: int = Field(description="Записей, удалённых по TTL")
+    invalidations: int = Field(description="Сбросов статистики пользователей")
+    shared_versions: bool = Field(description="Включены ли версии в общей таблице")
+
+
+class MetricPercentile(BaseModel):
+    value: float
+    percentile: float | None = Field(
+        description="Доля результатов (в процентах), которые хуже значения"
+    )
+
+
+class PercentileResponse(BaseModel):
+    language: str
+    difficulty: str
+    total: int = Field(description="Результатов в распределении")
+    metrics: dict[str, MetricPercentile] = Field(default_factory=dict)
+
+
+class LeaderboardItem(BaseModel):
+    rank: int
+    user_id: str
+    chars_per_minute: float
+    accuracy: float
+    time_seconds: float
+    created_at: datetime
+
+
+class LeaderboardResponse(BaseModel):
+    language: str
+    difficulty: str
+    period: str = Field(description="all — за всё время, иначе дата (UTC)")
+    min_accuracy: float = Field(description="Минимальная точность для попадания")
+    items: list[LeaderboardItem] = Field(default_factory=list)
+
+
+class MetricAggregate(BaseModel):
+    mean: float | None = None
+    min: float | None = None
+    max: float | None = None
+
+
+class GlobalStatisticsGroup(BaseModel):
+    language: str
+    difficulty: str
+    total_tests: int
+    chars_per_minute: MetricAggregate
+    accuracy: MetricAggregate
+    time_seconds: MetricAggregate
+
+
+class DailyStatisticsBucket(GlobalStatisticsGroup):
+    day: date
+
+
+class GlobalStatisticsResponse(BaseModel):
+    groups: list[GlobalStatisticsGroup] = Field(default_factory=list)
+    daily: list[DailyStatisticsBucket] | None = Field(
+        default=None, description="Разбивка по дням (UTC), если запрошена"
+    )
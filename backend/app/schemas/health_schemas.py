@@ -0,0 +1,12 @@
+from pydantic import BaseModel, Field
+
+
+class WarmupStep(BaseModel):
+    name: str = Field(description="Шаг прогрева")
+    duration_ms: float = Field(description="Длительность шага в миллисекундах")
+    error: str | None = Field(default=None, description="Ошибка, если шаг не удался")
+
+
+class ReadinessResponse(BaseModel):
+    ready: bool = Field(description="Прогрев завершён, процесс принимает трафик")
+    steps: list[WarmupStep] = Field(default_factory=list)
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+
+
+class LoggerStatistics(BaseModel):
+    sample_rate: float = Field(description="Доля сохраняемых записей ниже WARNING")
+    sampled_out: int = Field(description="Записей, пропущенных выборкой")
+
+
+class LoggingStatistics(BaseModel):
+    running: bool = Field(description="Работает ли фоновый поток записи")
+    queued: int = Field(description="Записей в очереди")
+    capacity: int = Field(description="Ёмкость очереди")
+    dropped: int = Field(description="Записей, отброшенных при заполненной очереди")
+    loggers: dict[str, LoggerStatistics] = Field(default_factory=dict)
@@ -1,7 +1,28 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+
+class MetricTrend(BaseModel):
+    rolling_mean: float = Field(description="Среднее за последнее окно")
+    previous_rolling_mean: float | None = Field(
+        default=None, description="Среднее за предыдущее окно"
+    )
+    ewma: float = Field(description="Экспоненциально взвешенное среднее")
+    slope: float = Field(description="Наклон линейного тренда за окно, на тест")
+
+
+class ProgressBreakdown(BaseModel):
+    language: str
+    difficulty: str
+    total_tests: int
+    speed_progress: float
+    accuracy_progress: float
+    time_progress: float
 
 
 class ProgressMetrics(BaseModel):
     speed_progress: float
     accuracy_progress: float
     time_progress: float
+    window: int | None = None
+    trends: dict[str, MetricTrend] = Field(default_factory=dict)
+    breakdown: list[ProgressBreakdown] = Field(default_factory=list)
@@ -36,12 +36,52 @@ class TextResponse(BaseModel):
     text: str = Field(..., description="Сгенерированный текст для печати")
     language: str = Field(..., description="Язык текста")
     difficulty: str = Field(..., description="Уровень сложности")
+    seed: int = Field(..., description="Seed, воспроизводящий этот текст")
 
     class Config:
-        json_schema_extra: dict[str, dict[str, str]] = {
+        json_schema_extra: dict[str, dict[str, str | int]] = {
             "example": {
                 "text": "привет мир это пример текста для тренировки печати",
                 "language": "ru",
                 "difficulty": "easy",
+                "seed": 8675309,
+            }
+        }
+
+
+class TextBatchResponse(BaseModel):
+    texts: list[str] = Field(..., description="Сгенерированные тексты для печати")
+    language: str = Field(..., description="Язык текстов")
+    difficulty: str = Field(..., description="Уровень сложности")
+    seed: int = Field(..., description="Seed, воспроизводящий этот пакет")
+
+    class Config:
+        json_schema_extra: dict[str, dict[str, str | int | list[str]]] = {
+            "example": {
+                "texts": [
+                    "привет мир это пример текста",
+                    "ещё один текст для тренировки печати",
+                ],
+                "language": "ru",
+                "difficulty": "easy",
+                "seed": 8675309,
             }
         }
+
+
+class TextStreamChunk(BaseModel):
+    index: int = Field(..., description="Порядковый номер фрагмента")
+    text: str = Field(..., description="Фрагмент текста с ведущим разделителем")
+
+
+class TextPoolStatistics(BaseModel):
+    depth: dict[str, int] = Field(..., description="Глубина пулов по язык:сложность")
+    capacity: int = Field(..., description="Максимальный размер пула")
+    low_water: int = Field(..., description="Нижняя отметка для пополнения")
+    hits: int = Field(..., description="Запросы, обслуженные из пула")
+    misses: int = Field(..., description="Запросы к пустому пулу с генерацией на месте")
+    refilled_texts: int = Field(..., description="Всего догенерировано текстов")
+    refill_batches: int = Field(..., description="Количество пополнений")
+    refill_rate: float = Field(
+        ..., description="Текстов в секунду за последнее окно наблюдения"
+    )
@@ -0,0 +1,106 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """Ограниченный по числу записей in-process кэш с вытеснением LRU.
+
+    При заданном ttl запись считается отсутствующей через ttl секунд
+    после сохранения. При заданном maxbytes суммарный размер значений
+    (по функции sizeof) тоже ограничен; значения крупнее лимита
+    не кэшируются.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float | None = None,
+        maxbytes: int | None = None,
+        sizeof: Callable[[V], int] | None = None,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize должен быть положительным числом")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl должен быть положительным числом")
+        if maxbytes is not None and (maxbytes <= 0 or sizeof is None):
+            raise ValueError("maxbytes должен быть положительным и требует sizeof")
+        self._maxsize: int = maxsize
+        self._ttl: float | None = ttl
+        self._maxbytes: int | None = maxbytes
+        self._sizeof: Callable[[V], int] | None = sizeof
+        self._data: OrderedDict[K, tuple[V, float, int]] = OrderedDict()
+        self._nbytes: int = 0
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[1] >= time.monotonic()
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    @property
+    def maxbytes(self) -> int | None:
+        return self._maxbytes
+
+    def _remove(self, key: K) -> None:
+        _, _, size = self._data.pop(key)
+        self._nbytes -= size
+
+    def get(self, key: K) -> V | None:
+        try:
+            value, expires_at, _ = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+
+        if expires_at < time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        size = self._sizeof(value) if self._sizeof else 0
+        if key in self._data:
+            self._remove(key)
+        if self._maxbytes is not None and size > self._maxbytes:
+            return
+
+        expires_at = time.monotonic() + self._ttl if self._ttl else float("inf")
+        self._data[key] = (value, expires_at, size)
+        self._nbytes += size
+        while len(self._data) > self._maxsize or (
+            self._maxbytes is not None and self._nbytes > self._maxbytes
+        ):
+            self._remove(next(iter(self._data)))
+            self.evictions += 1
+
+    def pop(self, key: K) -> None:
+        if key in self._data:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._nbytes = 0
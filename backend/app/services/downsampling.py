@@ -0,0 +1,44 @@
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Индексы точек ряда, прореженного методом Largest-Triangle-Three-Buckets.
+
+    Первая и последняя точки сохраняются, остальные делятся на
+    threshold - 2 корзины; из каждой берётся точка, образующая наибольший
+    треугольник с предыдущей выбранной точкой и средним следующей корзины.
+    Средние всех корзин считаются одним проходом, в цикле по корзинам
+    остаётся только векторный поиск максимума площади.
+    """
+    size = len(x)
+    if threshold >= size:
+        return np.arange(size)
+    if threshold < 3:
+        return np.linspace(0, size - 1, max(threshold, 0)).astype(np.int64)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    edges = np.linspace(1, size - 1, threshold - 1).astype(np.int64)
+    counts = np.diff(edges)
+    avg_x = np.append(np.add.reduceat(x[:-1], edges[:-1]) / counts, x[-1])
+    avg_y = np.append(np.add.reduceat(y[:-1], edges[:-1]) / counts, y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = size - 1
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_x, next_y = avg_x[bucket + 1], avg_y[bucket + 1]
+        previous_x, previous_y = x[previous], y[previous]
+
+        areas = np.abs(
+            (previous_x - next_x) * (y[start:end] - previous_y)
+            - (previous_x - x[start:end]) * (next_y - previous_y)
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+
+    return selected
@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Callable
+from typing import Literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.core.config import settings
+from backend.app.db.database import new_session
+from backend.app.db.repositories import TestResultRepository
+
+EXPORT_COLUMNS: tuple[str, ...] = (
+    "id",
+    "public_id",
+    "created_at",
+    "language",
+    "difficulty",
+    "chars_per_minute",
+    "accuracy",
+    "time_seconds",
+)
+
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+_CREATED_AT = EXPORT_COLUMNS.index("created_at")
+_json_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _export_row(row: tuple) -> tuple:
+    return (
+        *row[:_CREATED_AT],
+        row[_CREATED_AT].isoformat(),
+        *row[_CREATED_AT + 1 :],
+    )
+
+
+def _encode_csv(rows: list[tuple], header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(EXPORT_COLUMNS)
+    writer.writerows(map(_export_row, rows))
+    return buffer.getvalue()
+
+
+def _encode_ndjson(rows: list[tuple]) -> str:
+    return "".join(
+        _json_encode(dict(zip(EXPORT_COLUMNS, _export_row(row)))) + "\n"
+        for row in rows
+    )
+
+
+async def stream_export(
+    user_id: str,
+    export_format: Literal["csv", "ndjson"],
+    session_factory: Callable[[], AsyncSession] = new_session,
+    chunk_size: int | None = None,
+) -> AsyncIterator[str]:
+    """Потоковая выгрузка истории пользователя в CSV или NDJSON.
+
+    Генератор открывает собственную сессию, потому что выполняется уже
+    после выхода из обработчика запроса, и читает строки через серверный
+    курсор: каждая пачка кодируется и отдаётся клиенту до чтения следующей.
+    """
+    chunk_size = chunk_size or settings.export_chunk_rows
+    header = True
+
+    async with session_factory() as session:
+        chunks = TestResultRepository(session).stream_by_user_id(
+            user_id, EXPORT_COLUMNS, chunk_size
+        )
+        async for rows in chunks:
+            if export_format == "csv":
+                yield _encode_csv(rows, header)
+                header = False
+            else:
+                yield _encode_ndjson(rows)
+
+    if export_format == "csv" and header:
+        yield _encode_csv([], header)
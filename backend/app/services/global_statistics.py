@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.core.config import settings
+from backend.app.db.repositories import TestResultRepository
+from backend.app.schemas.db_schemas import GlobalStatisticsResponse
+from backend.app.services.cache import LRUCache
+
+global_stats_cache: LRUCache[
+    tuple[str | None, str | None, int | None], GlobalStatisticsResponse
+] = LRUCache(
+    settings.global_stats_cache_size, ttl=settings.global_stats_cache_ttl_seconds
+)
+
+
+async def get_global_statistics(
+    session: AsyncSession,
+    language: str | None = None,
+    difficulty: str | None = None,
+    days: int | None = None,
+) -> GlobalStatisticsResponse:
+    """Глобальные агрегаты, посчитанные в SQL и закэшированные на короткий TTL."""
+    key = (language, difficulty, days)
+    response = global_stats_cache.get(key)
+    if response is not None:
+        return response
+
+    repository = TestResultRepository(session)
+    daily = None
+    if days:
+        today = datetime.now(timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        since = today - timedelta(days=days - 1)
+        daily = await repository.get_daily_aggregates(since, language, difficulty)
+
+    response = GlobalStatisticsResponse(
+        groups=await repository.get_global_aggregates(language, difficulty),
+        daily=daily,
+    )
+    global_stats_cache.set(key, response)
+    return response
@@ -0,0 +1,45 @@
+import math
+import numpy as np
+from backend.app.core.config import settings
+
+# Для каких метрик большее значение — лучший результат
+HIGHER_IS_BETTER: dict[str, bool] = {
+    "chars_per_minute": True,
+    "accuracy": True,
+    "time_seconds": False,
+}
+
+
+def histogram_bin(metric: str, value: float) -> int:
+    """Номер корзины для значения метрики; выбросы попадают в крайние корзины."""
+    bins = settings.percentile_bins[metric]
+    position = math.floor((value - bins["low"]) / bins["width"])
+    return min(max(position, 0), bins["count"] - 1)
+
+
+def histogram_counts(metric: str, bin_counts: list[tuple[int, int]]) -> np.ndarray:
+    """Плотный массив счётчиков из пар (корзина, количество)."""
+    counts = np.zeros(settings.percentile_bins[metric]["count"], dtype=np.int64)
+    for bin_index, count in bin_counts:
+        counts[bin_index] = count
+    return counts
+
+
+def percentile_rank(metric: str, counts: np.ndarray, value: float) -> float | None:
+    """Доля результатов (в процентах), которые хуже значения, за O(числа корзин).
+
+    Внутри корзины значения считаются распределёнными равномерно, поэтому
+    её вклад берётся пропорционально положению значения в корзине.
+    """
+    total = int(counts.sum())
+    if total == 0:
+        return None
+
+    bins = settings.percentile_bins[metric]
+    position = (value - bins["low"]) / bins["width"]
+    bin_index = min(max(math.floor(position), 0), bins["count"] - 1)
+    fraction = min(max(position - bin_index, 0.0), 1.0)
+
+    below = (int(counts[:bin_index].sum()) + counts[bin_index] * fraction) / total
+    share = below if HIGHER_IS_BETTER[metric] else 1 - below
+    return round(float(share) * 100, 2)
@@ -0,0 +1,198 @@
+"""Таблицы лидеров по скорости с порогом точности.
+
+Пересчёт таблиц по истории результатов:
+
+    python -m backend.app.services.leaderboard rebuild
+"""
+
+import argparse
+import asyncio
+import bisect
+import time
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from backend.app.core.config import settings
+from backend.app.core.logger import error_logger
+from backend.app.db.database import dispose_engines, new_session
+from backend.app.db.dependencies import require_current_schema
+from backend.app.db.models import LeaderboardEntry, TestResult
+from backend.app.db.repositories import LeaderboardRepository
+from backend.app.schemas.db_schemas import LeaderboardItem, TestResultCreate
+from backend.app.services.utils import as_utc
+
+
+class TopK:
+    """K лучших результатов таблицы, не больше одного на пользователя.
+
+    Записи упорядочены по скорости (при равенстве — раньше показанный
+    результат выше); вставка и чтение — O(K).
+    """
+
+    def __init__(self, size: int) -> None:
+        self._size: int = size
+        self._items: list[LeaderboardItem] = []
+        self._by_user: dict[str, LeaderboardItem] = {}
+
+    @staticmethod
+    def _key(item: LeaderboardItem) -> tuple[float, datetime]:
+        return -item.chars_per_minute, item.created_at
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def offer(self, item: LeaderboardItem) -> bool:
+        """Добавление результата; False, если он не попал в таблицу."""
+        key = self._key(item)
+        current = self._by_user.get(item.user_id)
+        if current is not None:
+            if self._key(current) <= key:
+                return False
+            self._items.remove(current)
+            del self._by_user[item.user_id]
+        elif len(self._items) >= self._size and key >= self._key(self._items[-1]):
+            return False
+
+        bisect.insort(self._items, item, key=self._key)
+        self._by_user[item.user_id] = item
+        if len(self._items) > self._size:
+            dropped = self._items.pop()
+            del self._by_user[dropped.user_id]
+        return True
+
+    def items(self, limit: int | None = None) -> list[LeaderboardItem]:
+        return [
+            item.model_copy(update={"rank": rank})
+            for rank, item in enumerate(self._items[:limit], start=1)
+        ]
+
+
+class Leaderboards:
+    """Таблицы лидеров в памяти процесса поверх таблицы leaderboard_entries.
+
+    Таблицы загружаются из БД (top-K по индексу) при старте и по
+    истечении refresh_interval, чтобы воркеры сходились к общему
+    состоянию; сохранённые в этом процессе результаты попадают
+    в загруженные таблицы сразу.
+    """
+
+    def __init__(
+        self,
+        size: int | None = None,
+        min_accuracy: float | None = None,
+        refresh_interval: float | None = None,
+    ) -> None:
+        self._size: int = size or settings.leaderboard_size
+        self._min_accuracy: float = (
+            settings.leaderboard_min_accuracy if min_accuracy is None else min_accuracy
+        )
+        self._refresh_interval: float = (
+            refresh_interval or settings.leaderboard_refresh_seconds
+        )
+        self._boards: dict[tuple[str, str, str], tuple[TopK, float]] = {}
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def min_accuracy(self) -> float:
+        return self._min_accuracy
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now(timezone.utc).date().isoformat()
+
+    @staticmethod
+    def _item(
+        entry: LeaderboardEntry | TestResult | TestResultCreate,
+    ) -> LeaderboardItem:
+        return LeaderboardItem(
+            rank=0,
+            user_id=entry.user_id,
+            chars_per_minute=entry.chars_per_minute,
+            accuracy=entry.accuracy,
+            time_seconds=entry.time_seconds,
+            created_at=as_utc(entry.created_at or datetime.now(timezone.utc)),
+        )
+
+    async def _load(self, language: str, difficulty: str, period: str) -> TopK:
+        async with new_session() as session:
+            entries = await LeaderboardRepository(session).get_top(
+                language, difficulty, period, self._size
+            )
+
+        board = TopK(self._size)
+        for entry in entries:
+            board.offer(self._item(entry))
+        self._boards[(language, difficulty, period)] = (board, time.monotonic())
+        return board
+
+    async def get(
+        self, language: str, difficulty: str, period: str, limit: int | None = None
+    ) -> list[LeaderboardItem]:
+        """Таблица лидеров; перечитывается из БД, если устарела."""
+        cached = self._boards.get((language, difficulty, period))
+        if cached is None or time.monotonic() - cached[1] > self._refresh_interval:
+            board = await self._load(language, difficulty, period)
+        else:
+            board = cached[0]
+        return board.items(limit)
+
+    def offer(self, test_results: Iterable[TestResult | TestResultCreate]) -> None:
+        """Учёт только что сохранённых результатов в загруженных таблицах."""
+        for test_result in test_results:
+            if test_result.accuracy < self._min_accuracy:
+                continue
+
+            item = self._item(test_result)
+            periods = (
+                LeaderboardEntry.ALL_TIME,
+                LeaderboardRepository.period_of(item.created_at),
+            )
+            for period in periods:
+                cached = self._boards.get(
+                    (test_result.language, test_result.difficulty, period)
+                )
+                if cached is not None:
+                    cached[0].offer(item)
+
+    async def start(self) -> None:
+        """Очистка устаревших записей и загрузка таблиц за всё время и за сегодня."""
+        try:
+            async with new_session() as session:
+                await LeaderboardRepository(session).prune(
+                    self._size, settings.leaderboard_daily_retention_days
+                )
+
+            for language, levels in settings.text_generation_config.items():
+                for difficulty in levels:
+                    for period in (LeaderboardEntry.ALL_TIME, self.today()):
+                        await self._load(language, difficulty, period)
+
+        except Exception as e:
+            error_logger.error("Failed to seed leaderboards: %s", e)
+
+
+leaderboards = Leaderboards()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.services.leaderboard")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("rebuild", help="Пересчитать таблицы лидеров по результатам")
+    parser.parse_args(argv)
+
+    async def run() -> int:
+        try:
+            await require_current_schema()
+            async with new_session() as session:
+                return await LeaderboardRepository(session).rebuild()
+        finally:
+            await dispose_engines()
+
+    total = asyncio.run(run())
+    print(f"Учтено результатов: {total}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""Резидентный индекс словарей.
+
+Текстовый словарь компилируется в бинарный индекс (файл ``.lexicon`` рядом
+с исходником), который затем отображается в память без разбора. Сборка:
+
+    python -m backend.app.services.lexicon build [путь ...]
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import random
+import struct
+import tempfile
+import threading
+import unicodedata
+from pathlib import Path
+import numpy as np
+from backend.app.core.config import settings
+
+INDEX_MAGIC = b"TFLX"
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".lexicon"
+
+# magic, version, word_count, max_length, blob_size, source_size,
+# source_mtime_ns, source_sha256
+_HEADER = struct.Struct("<4sHxxIIQQQ32s")
+_SOURCE_STAT = struct.Struct("<QQ")
+_SOURCE_STAT_OFFSET = struct.calcsize("<4sHxxIIQ")
+_ALIGNMENT = 8
+
+
+class LexiconIndexError(ValueError):
+    """Бинарный индекс повреждён или имеет неподдерживаемую версию."""
+
+
+def index_path(source: str | Path) -> Path:
+    """Путь к бинарному индексу для исходного словаря."""
+    return Path(source).with_suffix(INDEX_SUFFIX)
+
+
+def _source_digest(source: Path) -> bytes:
+    digest = hashlib.sha256()
+    with open(source, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _normalize_words(source: Path) -> list[bytes]:
+    """NFC-нормализация, удаление дублей и строк, начинающихся с «-»."""
+    with open(source, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mmapped_file:
+            text = mmapped_file.read().decode("utf-8")
+
+    words: dict[str, None] = {}
+    for line in text.splitlines():
+        word = unicodedata.normalize("NFC", line.strip())
+        if word and not word.startswith("-"):
+            words[word] = None
+    return [word.encode("utf-8") for word in words]
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % _ALIGNMENT)
+
+
+def build_index(source: str | Path, target: str | Path | None = None) -> Path:
+    """Компиляция текстового словаря в версионированный бинарный индекс.
+
+    Слова сортируются по длине в символах, а для каждой длины сохраняется
+    индекс начала корзины, поэтому уровень сложности — это срез массива.
+    """
+    source = Path(source)
+    target = Path(target) if target else index_path(source)
+    stat = source.stat()
+    words = _normalize_words(source)
+
+    char_lengths = np.array(
+        [len(word.decode("utf-8")) for word in words], dtype=np.uint16
+    )
+    order = np.argsort(char_lengths, kind="stable")
+    sorted_words = [words[i] for i in order.tolist()]
+    sorted_lengths = char_lengths[order]
+    max_length = int(sorted_lengths[-1]) if len(sorted_lengths) else 0
+
+    offsets = np.zeros(len(sorted_words) + 1, dtype=np.uint32)
+    np.cumsum(
+        np.fromiter(map(len, sorted_words), dtype=np.uint32, count=len(sorted_words)),
+        out=offsets[1:],
+    )
+    buckets = np.searchsorted(
+        sorted_lengths, np.arange(max_length + 2), side="left"
+    ).astype(np.uint32)
+    blob = b"".join(sorted_words)
+
+    header = _HEADER.pack(
+        INDEX_MAGIC,
+        INDEX_VERSION,
+        len(sorted_words),
+        max_length,
+        len(blob),
+        stat.st_size,
+        stat.st_mtime_ns,
+        _source_digest(source),
+    )
+
+    fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for part in (header, buckets, offsets, sorted_lengths):
+                data = part.tobytes() if isinstance(part, np.ndarray) else part
+                f.write(data)
+                f.write(_padding(len(data)))
+            f.write(blob)
+        # mkstemp создаёт файл 0600; индекс делят воркеры других пользователей
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, target)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+    return target
+
+
+def _read_header(index: Path) -> tuple:
+    with open(index, "rb") as f:
+        raw = f.read(_HEADER.size)
+    if len(raw) != _HEADER.size:
+        raise LexiconIndexError(f"Индекс повреждён: {index}")
+
+    header = _HEADER.unpack(raw)
+    if header[0] != INDEX_MAGIC or header[1] != INDEX_VERSION:
+        raise LexiconIndexError(f"Неподдерживаемый формат индекса: {index}")
+    return header
+
+
+def is_index_stale(source: str | Path, index: str | Path | None = None) -> bool:
+    """Проверка актуальности индекса по размеру/mtime, а при расхождении — по хэшу."""
+    source = Path(source)
+    index = Path(index) if index else index_path(source)
+    if not index.exists():
+        return True
+
+    try:
+        _, _, _, _, _, source_size, source_mtime_ns, source_sha256 = _read_header(index)
+    except LexiconIndexError:
+        return True
+
+    stat = source.stat()
+    if stat.st_size == source_size and stat.st_mtime_ns == source_mtime_ns:
+        return False
+    if _source_digest(source) != source_sha256:
+        return True
+
+    _update_source_stat(index, stat)
+    return False
+
+
+def _update_source_stat(index: Path, stat: os.stat_result) -> None:
+    """Запись нового размера и mtime исходника в заголовок индекса.
+
+    Содержимое не изменилось (touch, свежий checkout), поэтому следующий
+    запуск снова сможет обойтись без хэширования. Нет прав на запись —
+    не страшно: индекс актуален, просто хэш посчитают ещё раз.
+    """
+    try:
+        with open(index, "r+b") as f:
+            f.seek(_SOURCE_STAT_OFFSET)
+            f.write(_SOURCE_STAT.pack(stat.st_size, stat.st_mtime_ns))
+    except PermissionError:
+        pass
+
+
+def ensure_index(source: str | Path) -> Path:
+    """Возвращает актуальный индекс, пересобирая его при необходимости."""
+    index = index_path(source)
+    if is_index_stale(source, index):
+        build_index(source, index)
+    return index
+
+
+class Lexicon:
+    """Резидентный индекс слов словаря в компактном виде.
+
+    Бинарный индекс отображается в память целиком: массивы NumPy смотрят
+    прямо в страницы файла, которые воркеры делят через page cache ОС.
+    Уровень сложности — непрерывный диапазон индексов, а строки
+    декодируются только при выборке.
+    """
+
+    def __init__(self, filepath: str | Path) -> None:
+        self.filepath: Path = Path(filepath)
+        self.index_filepath: Path = ensure_index(self.filepath)
+        self._word_lengths = settings.word_lengths
+
+        with open(self.index_filepath, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        _, _, word_count, max_length, blob_size, *_, source_sha256 = (
+            _HEADER.unpack_from(self._mmap)
+        )
+        self._digest: str = source_sha256.hex()
+        position = _HEADER.size + len(_padding(_HEADER.size))
+
+        self._buckets: np.ndarray
+        self._offsets: np.ndarray
+        self._lengths: np.ndarray
+        self._buckets, position = self._view(np.uint32, max_length + 2, position)
+        self._offsets, position = self._view(np.uint32, word_count + 1, position)
+        self._lengths, position = self._view(np.uint16, word_count, position)
+        self._blob = memoryview(self._mmap)[position : position + blob_size]
+
+        self._levels: dict[str, range] = {
+            level: self._level_range(level) for level in self._word_lengths
+        }
+
+    def _view(self, dtype, count: int, position: int) -> tuple[np.ndarray, int]:
+        array = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=position)
+        return array, position + array.nbytes + len(_padding(array.nbytes))
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    @property
+    def nbytes(self) -> int:
+        """Объём отображённого в память индекса."""
+        return len(self._mmap)
+
+    @property
+    def digest(self) -> str:
+        """Хэш исходного словаря — версия содержимого индекса."""
+        return self._digest
+
+    def _level_range(self, level: str) -> range:
+        """Диапазон индексов слов, подходящих под правила длины уровня."""
+        length_rules = self._word_lengths.get(level, {})
+        min_len = length_rules.get("min")
+        max_len = length_rules.get("max")
+        last_bucket = len(self._buckets) - 1
+
+        start = 0
+        end = len(self._lengths)
+        if min_len is not None:
+            start = int(self._buckets[min(min_len, last_bucket)])
+        if max_len is not None:
+            end = int(self._buckets[min(max_len + 1, last_bucket)])
+        return range(start, max(start, end))
+
+    def candidates(self, level: str) -> range:
+        """Индексы слов, подходящих под уровень сложности."""
+        return self._levels[level]
+
+    def word(self, index: int) -> str:
+        """Декодирование слова по его индексу."""
+        start = int(self._offsets[index])
+        end = int(self._offsets[index + 1])
+        return str(self._blob[start:end], "utf-8")
+
+    def sample(
+        self, level: str, count_words: int, rng: random.Random | None = None
+    ) -> list[str]:
+        """Выборка случайных слов уровня за O(count_words)."""
+        indices = self._levels[level]
+        picked = (rng or random).sample(indices, min(count_words, len(indices)))
+        return [self.word(index) for index in picked]
+
+    def sample_batch(
+        self,
+        level: str,
+        count_texts: int,
+        count_words: int,
+        rng: np.random.Generator,
+    ) -> np.ndarray:
+        """Матрица индексов слов (count_texts × count_words) за один проход.
+
+        Индексы выбираются с возвращением, после чего строки с повторами
+        (редкие при словаре в десятки тысяч слов) перевыбираются без возвращения.
+        """
+        indices = self._levels[level]
+        count_words = min(count_words, len(indices))
+        picked = rng.integers(
+            indices.start, indices.stop, size=(count_texts, count_words)
+        )
+
+        if count_words > 1:
+            sorted_rows = np.sort(picked, axis=1)
+            has_repeats = (sorted_rows[:, 1:] == sorted_rows[:, :-1]).any(axis=1)
+            for row in np.flatnonzero(has_repeats):
+                picked[row] = indices.start + rng.choice(
+                    len(indices), size=count_words, replace=False
+                )
+
+        return picked
+
+    def words(self, indices: np.ndarray) -> list[str]:
+        """Декодирование слов по массиву индексов."""
+        starts = self._offsets[indices].tolist()
+        ends = self._offsets[indices + 1].tolist()
+        blob = self._blob
+        return [str(blob[start:end], "utf-8") for start, end in zip(starts, ends)]
+
+
+_lexicons: dict[Path, Lexicon] = {}
+_lexicons_lock = threading.Lock()
+
+
+def get_lexicon(filepath: str | Path) -> Lexicon:
+    """Возвращает индекс словаря, загруженный один раз на процесс."""
+    path = Path(os.path.abspath(filepath))
+    lexicon = _lexicons.get(path)
+    if lexicon is not None:
+        return lexicon
+
+    with _lexicons_lock:
+        lexicon = _lexicons.get(path)
+        if lexicon is None:
+            lexicon = Lexicon(path)
+            _lexicons[path] = lexicon
+        return lexicon
+
+
+def get_language_lexicon(lang: str) -> Lexicon:
+    """Индекс словаря для языка из настроек."""
+    return get_lexicon(settings.language_filepath[lang])
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.services.lexicon")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Собрать бинарные индексы")
+    build_parser.add_argument(
+        "sources",
+        nargs="*",
+        type=Path,
+        help="Текстовые словари (по умолчанию — словари всех языков)",
+    )
+    args = parser.parse_args(argv)
+
+    sources = args.sources or list(dict.fromkeys(settings.language_filepath.values()))
+    for source in sources:
+        if not source.exists():
+            print(f"Словарь не найден, пропуск: {source}")
+            continue
+        target = build_index(source)
+        print(f"{source} -> {target} ({target.stat().st_size} байт)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Ранг результата среди всех результатов пары (язык, сложность).
+
+Пересчёт гистограмм по таблице результатов:
+
+    python -m backend.app.services.percentiles rebuild
+"""
+
+import argparse
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.db.database import dispose_engines, new_session
+from backend.app.db.dependencies import require_current_schema
+from backend.app.db.repositories import ResultHistogramRepository
+from backend.app.schemas.db_schemas import MetricPercentile, PercentileResponse
+from backend.app.services.histograms import histogram_counts, percentile_rank
+
+
+async def get_percentiles(
+    session: AsyncSession,
+    language: str,
+    difficulty: str,
+    values: dict[str, float],
+) -> PercentileResponse:
+    """Процентили значений метрик по сохранённым гистограммам."""
+    repository = ResultHistogramRepository(session)
+    metrics = {}
+    total = 0
+    for metric, value in values.items():
+        counts = histogram_counts(
+            metric, await repository.get_counts(language, difficulty, metric)
+        )
+        total = int(counts.sum())
+        metrics[metric] = MetricPercentile(
+            value=value, percentile=percentile_rank(metric, counts, value)
+        )
+
+    return PercentileResponse(
+        language=language, difficulty=difficulty, total=total, metrics=metrics
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.services.percentiles")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("rebuild", help="Пересчитать гистограммы по результатам")
+    parser.parse_args(argv)
+
+    async def run() -> int:
+        try:
+            await require_current_schema()
+            async with new_session() as session:
+                return await ResultHistogramRepository(session).rebuild()
+        finally:
+            await dispose_engines()
+
+    total = asyncio.run(run())
+    print(f"Учтено результатов: {total}")
+
+
+if __name__ == "__main__":
+    main()
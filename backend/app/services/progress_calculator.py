@@ -1,28 +1,180 @@
-from statistics import mean, pstdev
-from backend.app.schemas.progress_schemas import ProgressMetrics
-from backend.app.db.models import TestResult
+import math
+from collections.abc import Sequence
+import numpy as np
+from backend.app.core.config import settings
+from backend.app.db.models import UserStats
+from backend.app.schemas.progress_schemas import (
+    MetricTrend,
+    ProgressBreakdown,
+    ProgressMetrics,
+)
+
+PROGRESS_METRICS: tuple[str, ...] = ("chars_per_minute", "accuracy", "time_seconds")
+PROGRESS_COLUMNS: tuple[str, ...] = ("language", "difficulty", *PROGRESS_METRICS)
+
+# Знак прогресса по метрикам: для времени улучшение — это уменьшение
+_DIRECTION = np.array([1.0, 1.0, -1.0])
+
+
+def _scale(progress: np.ndarray) -> list[float]:
+    return [round(float(value), 3) * 100 for value in progress]
+
+
+def _z_scores(
+    last: np.ndarray, mean: np.ndarray, std: np.ndarray, counts: np.ndarray
+) -> np.ndarray:
+    """Отклонение последнего значения от среднего в стандартных отклонениях."""
+    valid = (std > 0) & (counts >= 2)
+    z = np.divide(last - mean, std, out=np.zeros_like(mean), where=valid)
+    return z * _DIRECTION.reshape(-1, *([1] * (z.ndim - 1)))
 
 
 class UserProgressCalculator:
     @staticmethod
-    async def calculate_progress(
-        all_test_results: list[TestResult],
+    def columns_from_rows(rows: Sequence[tuple]) -> dict[str, np.ndarray]:
+        """Массивы метрик и коды групп из строк PROGRESS_COLUMNS в порядке времени.
+
+        Пары (язык, сложность) кодируются целыми числами: "group" — код
+        группы для каждой строки, "groups" — пары в порядке кодов.
+        """
+        languages, difficulties, *metrics = (
+            zip(*rows) if rows else [()] * len(PROGRESS_COLUMNS)
+        )
+        codes: dict[tuple[str, str], int] = {}
+        group = (
+            codes.setdefault(key, len(codes)) for key in zip(languages, difficulties)
+        )
+        columns = {"group": np.fromiter(group, dtype=np.int64, count=len(rows))}
+        columns["groups"] = np.array(list(codes), dtype=object).reshape(-1, 2)
+        for metric, values in zip(PROGRESS_METRICS, metrics):
+            columns[metric] = np.fromiter(values, dtype=np.float64, count=len(rows))
+        return columns
+
+    @staticmethod
+    def calculate_progress(
+        columns: dict[str, np.ndarray],
+        window: int | None = None,
+        ewma_alpha: float | None = None,
     ) -> ProgressMetrics:
-        if not all_test_results or len(all_test_results) < 2:
+        """Прогресс, тренды и разбивка по языку/сложности за один векторный проход.
+
+        Метрики складываются в матрицу 3 × n, поэтому z-оценка последнего
+        результата, скользящие средние, EWMA и наклон тренда считаются
+        сразу для всех метрик. Разбивка по парам (язык, сложность)
+        агрегируется через bincount без цикла по результатам.
+        """
+        window = window or settings.progress_window
+        alpha = settings.progress_ewma_alpha if ewma_alpha is None else ewma_alpha
+        values = np.stack([columns[metric] for metric in PROGRESS_METRICS])
+        count = values.shape[1]
+        if count == 0:
             return ProgressMetrics(
                 speed_progress=0.0, accuracy_progress=0.0, time_progress=0.0
             )
 
-        speeds = [float(result.chars_per_minute) for result in all_test_results]
-        accuracies = [float(result.accuracy) for result in all_test_results]
-        times = [float(result.time_seconds) for result in all_test_results]
+        speed, accuracy, time = _scale(
+            _z_scores(
+                values[:, -1], values.mean(axis=1), values.std(axis=1), np.array(count)
+            )
+        )
 
-        speed_progress = UserProgressCalculator._calculate_single_progress(speeds)
-        accuracy_progress = UserProgressCalculator._calculate_single_progress(
-            accuracies
+        size = min(window, count)
+        tail = values[:, -size:]
+        rolling_mean = tail.mean(axis=1)
+        previous_rolling_mean = (
+            values[:, -2 * size : -size].mean(axis=1) if count >= 2 * size else None
         )
-        time_progress = UserProgressCalculator._calculate_single_progress(
-            times, reverse=True
+
+        weights = (1 - alpha) ** np.arange(count - 1, -1, -1, dtype=np.float64)
+        ewma = values @ weights / weights.sum()
+
+        positions = np.arange(size, dtype=np.float64) - (size - 1) / 2
+        denominator = positions @ positions
+        slope = (
+            (tail - rolling_mean[:, None]) @ positions / denominator
+            if denominator
+            else np.zeros(len(PROGRESS_METRICS))
+        )
+
+        trends = {
+            metric: MetricTrend(
+                rolling_mean=float(rolling_mean[index]),
+                previous_rolling_mean=None
+                if previous_rolling_mean is None
+                else float(previous_rolling_mean[index]),
+                ewma=float(ewma[index]),
+                slope=float(slope[index]),
+            )
+            for index, metric in enumerate(PROGRESS_METRICS)
+        }
+
+        return ProgressMetrics(
+            speed_progress=speed,
+            accuracy_progress=accuracy,
+            time_progress=time,
+            window=size,
+            trends=trends,
+            breakdown=UserProgressCalculator._breakdown(columns, values),
+        )
+
+    @staticmethod
+    def _breakdown(
+        columns: dict[str, np.ndarray], values: np.ndarray
+    ) -> list[ProgressBreakdown]:
+        """Прогресс отдельно по каждой паре (язык, сложность)."""
+        inverse = columns["group"]
+        groups = columns["groups"]
+        group_count = len(groups)
+
+        counts = np.bincount(inverse, minlength=group_count)
+        means = np.stack(
+            [np.bincount(inverse, weights=row, minlength=group_count) for row in values]
+        ) / counts
+        deviations = values - means[:, inverse]
+        stds = np.sqrt(
+            np.stack(
+                [
+                    np.bincount(inverse, weights=row, minlength=group_count)
+                    for row in deviations**2
+                ]
+            )
+            / counts
+        )
+
+        last_index = np.zeros(group_count, dtype=np.int64)
+        np.maximum.at(last_index, inverse, np.arange(len(inverse)))
+        z = _z_scores(values[:, last_index], means, stds, counts)
+
+        return [
+            ProgressBreakdown(
+                language=str(language),
+                difficulty=str(difficulty),
+                total_tests=int(counts[index]),
+                speed_progress=speed,
+                accuracy_progress=accuracy,
+                time_progress=time,
+            )
+            for index, ((language, difficulty), speed, accuracy, time) in enumerate(
+                zip(groups, *(_scale(row) for row in z))
+            )
+        ]
+
+    @staticmethod
+    def calculate_progress_from_stats(stats: UserStats) -> ProgressMetrics:
+        """Прогресс по строке агрегатов за O(1), без чтения истории."""
+        if stats.total_tests < 2:
+            return ProgressMetrics(
+                speed_progress=0.0, accuracy_progress=0.0, time_progress=0.0
+            )
+
+        speed_progress = UserProgressCalculator._calculate_stats_progress(
+            stats, "chars_per_minute"
+        )
+        accuracy_progress = UserProgressCalculator._calculate_stats_progress(
+            stats, "accuracy"
+        )
+        time_progress = UserProgressCalculator._calculate_stats_progress(
+            stats, "time_seconds", reverse=True
         )
 
         return ProgressMetrics(
@@ -32,17 +184,17 @@ class UserProgressCalculator:
         )
 
     @staticmethod
-    def _calculate_single_progress(values: list[float], reverse: bool = False) -> float:
-        if len(values) < 2:
-            return 0.0
-
-        avg = mean(values)
-        std_dev = pstdev(values)
+    def _calculate_stats_progress(
+        stats: UserStats, metric: str, reverse: bool = False
+    ) -> float:
+        m2 = max(getattr(stats, f"{metric}_m2"), 0.0)
+        std_dev = math.sqrt(m2 / stats.total_tests)
 
         if std_dev == 0:
             return 0.0
 
-        last_value = values[-1]
+        last_value = getattr(stats, f"{metric}_last")
+        avg = getattr(stats, f"{metric}_mean")
         progress = ((last_value - avg) / std_dev) * (1 if not reverse else -1)
 
         return progress
@@ -0,0 +1,199 @@
+import asyncio
+import time
+from sqlalchemy.exc import DBAPIError, OperationalError
+from backend.app.core.config import settings
+from backend.app.core.exceptions import DatabaseException
+from backend.app.core.logger import error_logger
+from backend.app.db.database import new_session
+from backend.app.db.repositories import UserRepository, TestResultRepository
+from backend.app.schemas.db_schemas import TestResultCreate, ResultWriterStatistics
+from backend.app.services.leaderboard import leaderboards
+from backend.app.services.statistics_cache import statistics_cache
+
+
+class ResultWriterOverloaded(Exception):
+    """Очередь записи заполнена дольше допустимого времени ожидания."""
+
+
+def is_transient_error(error: Exception) -> bool:
+    """Ошибка, после которой запись стоит повторить (блокировка, обрыв связи)."""
+    if isinstance(error, DatabaseException) and error.original_error is not None:
+        error = error.original_error
+    if isinstance(error, DBAPIError) and error.connection_invalidated:
+        return True
+    return isinstance(error, (OperationalError, ConnectionError, TimeoutError))
+
+
+class ResultWriter:
+    """Отложенная (write-behind) запись результатов тестов.
+
+    Провалидированные результаты кладутся в ограниченную asyncio-очередь,
+    а фоновая задача пишет их пачками — каждые flush_interval_ms или
+    batch_size строк — одной транзакцией. При заполненной очереди
+    отправитель ждёт (backpressure) не дольше put_timeout секунд.
+
+    Временные ошибки БД повторяются с экспоненциальной задержкой. При
+    прочих ошибках пачка делится пополам, пока ошибочная строка не
+    останется одна, — теряется только она. Пользователь остаётся
+    «ожидающим», пока его строка не записана, и создаётся той пачкой,
+    где встретится его результат.
+    """
+
+    def __init__(
+        self,
+        batch_size: int | None = None,
+        flush_interval_ms: int | None = None,
+        queue_size: int | None = None,
+        put_timeout: float | None = None,
+    ) -> None:
+        self._batch_size: int = batch_size or settings.result_write_behind_batch_size
+        self._flush_interval: float = (
+            flush_interval_ms or settings.result_write_behind_flush_ms
+        ) / 1000
+        self._queue_size: int = queue_size or settings.result_write_behind_queue_size
+        self._put_timeout: float = (
+            put_timeout or settings.result_write_behind_put_timeout_seconds
+        )
+
+        self._queue: asyncio.Queue[tuple[TestResultCreate, bool]] | None = None
+        self._task: asyncio.Task | None = None
+        self._pending_user_ids: set[str] = set()
+
+        self._written: int = 0
+        self._failed: int = 0
+        self._batches: int = 0
+        self._retries: int = 0
+        self._splits: int = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def is_pending_user(self, user_id: str) -> bool:
+        """Пользователь создан в очереди, но ещё не записан в БД."""
+        return user_id in self._pending_user_ids
+
+    async def submit(self, test_result_data: TestResultCreate, new_user: bool) -> None:
+        """Постановка результата в очередь; new_user — создать пользователя при записи."""
+        if self._queue is None:
+            raise RuntimeError("ResultWriter is not started")
+
+        if new_user:
+            self._pending_user_ids.add(test_result_data.user_id)
+        try:
+            await asyncio.wait_for(
+                self._queue.put((test_result_data, new_user)), self._put_timeout
+            )
+        except asyncio.TimeoutError:
+            if new_user:
+                self._pending_user_ids.discard(test_result_data.user_id)
+            raise ResultWriterOverloaded("Result write queue is full")
+
+    async def _collect(self) -> list[tuple[TestResultCreate, bool]]:
+        """Ожидание первой записи и добор пачки до размера или дедлайна."""
+        assert self._queue is not None
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self._flush_interval
+
+        while len(batch) < self._batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _write_batch(self, batch: list[tuple[TestResultCreate, bool]]) -> None:
+        """Запись пачки и создание её ещё не записанных пользователей."""
+        new_user_ids = [
+            user_id
+            for user_id in dict.fromkeys(data.user_id for data, _ in batch)
+            if user_id in self._pending_user_ids
+        ]
+        async with new_session() as session:
+            await UserRepository(session).create_many(new_user_ids, commit=False)
+            await TestResultRepository(session).create_many(
+                [data for data, _ in batch]
+            )
+        self._pending_user_ids.difference_update(new_user_ids)
+        statistics_cache.invalidate({data.user_id for data, _ in batch})
+        leaderboards.offer(data for data, _ in batch)
+        self._written += len(batch)
+        self._batches += 1
+
+    async def _write(self, batch: list[tuple[TestResultCreate, bool]]) -> None:
+        """Запись с повтором временных ошибок и делением пачки при остальных."""
+        backoff = settings.result_write_behind_retry_backoff_ms / 1000
+        for attempt in range(settings.result_write_behind_retries + 1):
+            try:
+                await self._write_batch(batch)
+                return
+            except Exception as e:
+                error = e
+                if not is_transient_error(e):
+                    break
+                if attempt < settings.result_write_behind_retries:
+                    self._retries += 1
+                    await asyncio.sleep(backoff * 2**attempt)
+
+        if len(batch) > 1 and not is_transient_error(error):
+            self._splits += 1
+            middle = len(batch) // 2
+            await self._write(batch[:middle])
+            await self._write(batch[middle:])
+            return
+
+        self._failed += len(batch)
+        error_logger.error(
+            "Failed to write %s queued test results (first public_id %s): %s",
+            len(batch),
+            batch[0][0].public_id,
+            error,
+            exc_info=error,
+        )
+
+    async def _run(self) -> None:
+        assert self._queue is not None
+        while True:
+            batch = await self._collect()
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self._queue_size)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Дозапись очереди и остановка фоновой задачи."""
+        if self._task is None or self._queue is None:
+            return
+
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def statistics(self) -> ResultWriterStatistics:
+        return ResultWriterStatistics(
+            enabled=self.running,
+            queued=self._queue.qsize() if self._queue else 0,
+            capacity=self._queue_size,
+            written=self._written,
+            failed=self._failed,
+            batches=self._batches,
+            retries=self._retries,
+            splits=self._splits,
+        )
+
+
+result_writer = ResultWriter()
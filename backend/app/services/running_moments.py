@@ -0,0 +1,31 @@
+class RunningMoments:
+    """Бегущие моменты ряда: количество, среднее, M2, минимум и максимум.
+
+    Значения добавляются по одному методом Уэлфорда. Частичные агрегаты
+    объединяются с сохранёнными формулой Чана прямо в SQL (см.
+    UserStatsRepository._upsert), поэтому весь ряд хранить не нужно.
+    """
+
+    __slots__ = ("count", "mean", "m2", "minimum", "maximum")
+
+    def __init__(
+        self,
+        count: int = 0,
+        mean: float = 0.0,
+        m2: float = 0.0,
+        minimum: float | None = None,
+        maximum: float | None = None,
+    ) -> None:
+        self.count: int = count
+        self.mean: float = mean
+        self.m2: float = m2
+        self.minimum: float | None = minimum
+        self.maximum: float | None = maximum
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.minimum = value if self.minimum is None else min(self.minimum, value)
+        self.maximum = value if self.maximum is None else max(self.maximum, value)
@@ -0,0 +1,42 @@
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.db.repositories import TestResultRepository
+from backend.app.schemas.db_schemas import TestResultSeries, UserTestSeriesResponse
+from backend.app.services.downsampling import lttb
+
+SERIES_METRICS: tuple[str, ...] = ("chars_per_minute", "accuracy", "time_seconds")
+
+
+async def get_user_series(
+    session: AsyncSession,
+    user_id: str,
+    points: int,
+    language: str | None = None,
+    difficulty: str | None = None,
+) -> UserTestSeriesResponse:
+    """Ряды метрик пользователя, прореженные LTTB до points точек каждый.
+
+    Колонки читаются кортежами и собираются в массивы NumPy; по оси X
+    берётся порядковый номер теста, как на графиках страницы статистики.
+    """
+    rows = await TestResultRepository(session).get_series_columns(
+        user_id, ("created_at", *SERIES_METRICS), language, difficulty
+    )
+    if not rows:
+        return UserTestSeriesResponse(
+            total=0, **{metric: TestResultSeries() for metric in SERIES_METRICS}
+        )
+
+    created_at, *metric_columns = zip(*rows)
+    positions = np.arange(len(rows), dtype=np.float64)
+
+    series = {}
+    for metric, column in zip(SERIES_METRICS, metric_columns):
+        values = np.fromiter(column, dtype=np.float64, count=len(rows))
+        selected = lttb(positions, values, points)
+        series[metric] = TestResultSeries(
+            created_at=[created_at[index] for index in selected.tolist()],
+            values=values[selected].tolist(),
+        )
+
+    return UserTestSeriesResponse(total=len(rows), **series)
@@ -0,0 +1,203 @@
+"""Резидентный кэш статики: HTML, CSS, JS и иконка.
+
+Файлы читаются один раз при старте, для каждого заранее готовятся сжатые
+варианты (gzip и, если установлен пакет brotli, br) и сильные ETag. CSS,
+JS и иконка дополнительно публикуются по адресам с хэшем содержимого,
+которые подставляются в HTML и отдаются с Cache-Control: immutable.
+"""
+
+import gzip
+import hashlib
+import re
+from pathlib import Path
+from fastapi import Request, Response
+from backend.app.core.config import settings
+from backend.app.services.utils import etag_matches
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MEDIA_TYPES: dict[str, str] = {
+    ".html": "text/html; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+    ".svg": "image/svg+xml",
+}
+
+STATIC_PREFIX = "/static"
+FAVICON_URL = "/favicon.svg"
+FAVICON_SVG = b"""<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">
+  <text y=".9em" font-size="90">\xe2\x9a\xa1</text>
+</svg>
+"""
+
+_IMMUTABLE = "public, max-age={max_age}, immutable"
+_REVALIDATE = "no-cache"
+
+
+def _compress(body: bytes) -> dict[str, bytes]:
+    """Сжатые варианты, которые меньше исходного тела."""
+    if len(body) < settings.static_min_compress_bytes:
+        return {}
+
+    variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+    return {
+        encoding: compressed
+        for encoding, compressed in variants.items()
+        if len(compressed) < len(body)
+    }
+
+
+def _accepted_encodings(accept_encoding: str | None) -> set[str]:
+    """Кодировки из Accept-Encoding с ненулевым q."""
+    accepted = set()
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        name, _, value = params.strip().partition("=")
+        if name.strip() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+class StaticAsset:
+    """Тело файла, его сжатые варианты и заголовки кэширования."""
+
+    def __init__(self, body: bytes, media_type: str, immutable: bool) -> None:
+        self.body: bytes = body
+        self.media_type: str = media_type
+        self.digest: str = hashlib.sha256(body).hexdigest()
+        self.encodings: dict[str, bytes] = _compress(body)
+        self.cache_control: str = (
+            _IMMUTABLE.format(max_age=settings.static_max_age_seconds)
+            if immutable
+            else _REVALIDATE
+        )
+
+    def etag(self, encoding: str | None) -> str:
+        """Сильный ETag: у каждого варианта кодирования свой."""
+        tag = self.digest[:32]
+        return f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+    def negotiate(self, accept_encoding: str | None) -> str | None:
+        """Лучший из доступных вариантов: br, затем gzip, иначе без сжатия."""
+        accepted = _accepted_encodings(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.encodings and ({encoding, "*"} & accepted):
+                return encoding
+        return None
+
+    def response(self, request: Request) -> Response:
+        encoding = self.negotiate(request.headers.get("accept-encoding"))
+        etag = self.etag(encoding)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(
+            content=self.encodings[encoding] if encoding else self.body,
+            media_type=self.media_type,
+            headers=headers,
+        )
+
+
+class StaticAssetCache:
+    """Статика приложения в памяти, собранная один раз при старте.
+
+    Адреса CSS/JS (settings.mount_css/mount_js) и иконки в HTML
+    заменяются адресами с хэшем содержимого под STATIC_PREFIX. Исходные
+    адреса тоже обслуживаются, но с обязательной ревалидацией по ETag. При
+    выключенном settings.static_asset_cache статика пересобирается
+    на каждый запрос (режим разработки).
+    """
+
+    def __init__(self) -> None:
+        self._assets: dict[str, StaticAsset] = {}
+        self._pages: dict[str, StaticAsset] = {}
+        self._hashed_urls: dict[str, str] = {}
+
+    @property
+    def hashed_urls(self) -> dict[str, str]:
+        return self._hashed_urls
+
+    @staticmethod
+    def _rewrite(html: str, hashed_urls: dict[str, str]) -> str:
+        """Замена адресов статики в атрибутах href/src адресами с хэшем."""
+        return re.sub(
+            r'(?P<attr>href|src)="(?P<url>[^"]+)"',
+            lambda match: (
+                f'{match["attr"]}="{hashed_urls.get(match["url"], match["url"])}"'
+            ),
+            html,
+        )
+
+    def build(self) -> None:
+        files: dict[str, bytes] = {FAVICON_URL: FAVICON_SVG}
+        for mount, directory in (
+            (settings.mount_css, settings.static_dir),
+            (settings.mount_js, settings.static_js_dir),
+        ):
+            for file in sorted(directory.iterdir()):
+                if file.is_file():
+                    files[f"{mount}/{file.name}"] = file.read_bytes()
+
+        assets: dict[str, StaticAsset] = {}
+        hashed_urls: dict[str, str] = {}
+        for url, body in files.items():
+            path = Path(url)
+            media_type = MEDIA_TYPES.get(path.suffix, "application/octet-stream")
+            assets[url] = StaticAsset(body, media_type, immutable=False)
+            immutable = StaticAsset(body, media_type, immutable=True)
+            hashed_name = f"{path.stem}.{immutable.digest[:12]}{path.suffix}"
+            parent = path.parent.as_posix()
+            if not url.startswith(f"{STATIC_PREFIX}/"):
+                parent = STATIC_PREFIX
+            hashed_urls[url] = f"{parent}/{hashed_name}"
+            assets[hashed_urls[url]] = immutable
+
+        pages: dict[str, StaticAsset] = {}
+        for name, path in (
+            ("index", settings.html_index_path),
+            ("statistics", settings.html_statistics_path),
+        ):
+            html = self._rewrite(path.read_text(encoding="utf-8"), hashed_urls)
+            pages[name] = StaticAsset(html.encode(), MEDIA_TYPES[".html"], False)
+
+        self._assets, self._pages, self._hashed_urls = assets, pages, hashed_urls
+
+    def _ensure(self) -> None:
+        if not settings.static_asset_cache or not self._pages:
+            self.build()
+
+    def asset(self, url: str) -> StaticAsset | None:
+        self._ensure()
+        return self._assets.get(url)
+
+    def page(self, name: str) -> StaticAsset:
+        self._ensure()
+        return self._pages[name]
+
+    def nbytes(self) -> int:
+        """Объём тел и сжатых вариантов в памяти."""
+        return sum(
+            len(asset.body) + sum(map(len, asset.encodings.values()))
+            for asset in (*self._assets.values(), *self._pages.values())
+        )
+
+
+static_assets = StaticAssetCache()
@@ -0,0 +1,97 @@
+from collections.abc import Iterable
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.core.config import settings
+from backend.app.db.repositories import StatisticsVersionRepository
+from backend.app.schemas.db_schemas import StatisticsCacheStatistics
+from backend.app.services.cache import LRUCache
+
+LatestResultKey = tuple[int, datetime, int | None]
+StatisticsCacheKey = tuple[str, int, int, int, LatestResultKey]
+
+
+class StatisticsCache:
+    """Кэш готовых JSON-ответов /statistics/{user_id} с версиями пользователей.
+
+    Ключ — пользователь, его версии и ключ последнего результата (тот же,
+    из которого строится ETag): локальная версия увеличивается при каждой
+    записи результатов в этом процессе, общая (при включённом
+    settings.statistics_cache_shared_versions) читается из таблицы
+    statistics_versions и меняется при записи в любом воркере. Ключ
+    последнего результата меняется при записи в любом воркере и без общих
+    версий, поэтому под новым ETag не отдаётся тело, собранное до записи
+    другим воркером. Ответ, собранный до записи, сохраняется под старым
+    ключом и больше не читается. Объём кэша ограничен числом ответов и
+    байтами.
+
+    Локальные версии хранятся только для пользователей с записями в этом
+    процессе; при переполнении словаря он очищается вместе с кэшем, а
+    эпоха в ключе отсекает ответы, собранные до очистки.
+    """
+
+    def __init__(
+        self,
+        maxsize: int | None = None,
+        ttl: float | None = None,
+        maxbytes: int | None = None,
+    ) -> None:
+        self._cache: LRUCache[StatisticsCacheKey, bytes] = LRUCache(
+            maxsize or settings.statistics_cache_size,
+            ttl=ttl or settings.statistics_cache_ttl_seconds,
+            maxbytes=maxbytes or settings.statistics_cache_max_bytes,
+            sizeof=len,
+        )
+        self._versions: dict[str, int] = {}
+        self._max_versions: int = 4 * self._cache.maxsize
+        self._epoch: int = 0
+        self._invalidations: int = 0
+
+    async def key(
+        self, session: AsyncSession, user_id: str, latest: LatestResultKey
+    ) -> StatisticsCacheKey:
+        """Ключ текущей версии статистики; берётся до чтения данных из БД."""
+        local_version = self._versions.get(user_id, 0)
+        shared_version = 0
+        if settings.statistics_cache_shared_versions:
+            shared_version = await StatisticsVersionRepository(session).get(user_id)
+        return user_id, self._epoch, local_version, shared_version, latest
+
+    def get(self, key: StatisticsCacheKey) -> bytes | None:
+        return self._cache.get(key)
+
+    def set(self, key: StatisticsCacheKey, payload: bytes) -> None:
+        if key[1] == self._epoch:
+            self._cache.set(key, payload)
+
+    def invalidate(self, user_ids: Iterable[str]) -> None:
+        """Сброс статистики пользователей после записи их результатов."""
+        for user_id in user_ids:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            self._invalidations += 1
+
+        if len(self._versions) > self._max_versions:
+            self._versions.clear()
+            self._cache.clear()
+            self._epoch += 1
+
+    def clear(self) -> None:
+        self._versions.clear()
+        self._cache.clear()
+        self._epoch += 1
+
+    def statistics(self) -> StatisticsCacheStatistics:
+        return StatisticsCacheStatistics(
+            entries=len(self._cache),
+            capacity=self._cache.maxsize,
+            bytes=self._cache.nbytes,
+            max_bytes=self._cache.maxbytes,
+            hits=self._cache.hits,
+            misses=self._cache.misses,
+            evictions=self._cache.evictions,
+            expirations=self._cache.expirations,
+            invalidations=self._invalidations,
+            shared_versions=settings.statistics_cache_shared_versions,
+        )
+
+
+statistics_cache = StatisticsCache()
@@ -0,0 +1,81 @@
+import asyncio
+import secrets
+from collections.abc import AsyncIterator
+from typing import Literal
+from backend.app.core.config import settings
+from backend.app.schemas.text_schemas import TextResponse, TextStreamChunk
+from backend.app.services.cache import LRUCache
+from backend.app.services.lexicon import get_language_lexicon
+from backend.app.services.word_extractor import WordExtractor
+
+
+def new_seed() -> int:
+    """Случайный seed в диапазоне, безопасном для чисел JavaScript."""
+    return secrets.randbelow(settings.max_text_seed + 1)
+
+
+def make_word_extractor(
+    lang: str, difficulty: str, seed: int | None = None
+) -> WordExtractor:
+    config = settings.text_generation_config[lang][difficulty]
+    return WordExtractor(
+        filepath=str(settings.language_filepath[lang]),
+        count_words=int(config["count_words"]),
+        level=str(config["level"]),
+        seed=seed,
+    )
+
+
+def generate_text(lang: str, difficulty: str, seed: int) -> TextResponse:
+    """Детерминированная генерация: одинаковые (язык, сложность, seed) дают один текст."""
+    word_extractor = make_word_extractor(lang, difficulty, seed)
+    return TextResponse(
+        text=word_extractor.generate_random_text(),
+        language=lang,
+        difficulty=difficulty,
+        seed=seed,
+    )
+
+
+def text_etag(lang: str, difficulty: str, seed: int) -> str:
+    """ETag текста: параметры генерации и версия словаря."""
+    digest = get_language_lexicon(lang).digest[:16]
+    return f'"{lang}-{difficulty}-{seed}-{digest}"'
+
+
+text_cache: LRUCache[tuple[str, str, int], TextResponse] = LRUCache(
+    settings.text_cache_size
+)
+
+
+def get_seeded_text(lang: str, difficulty: str, seed: int) -> TextResponse:
+    """Текст по seed из LRU-кэша процесса, с генерацией при промахе."""
+    key = (lang, difficulty, seed)
+    response = text_cache.get(key)
+    if response is None:
+        response = generate_text(lang, difficulty, seed)
+        text_cache.set(key, response)
+    return response
+
+
+async def stream_text(
+    word_extractor: WordExtractor,
+    chunk_words: int,
+    stream_format: Literal["ndjson", "sse"],
+) -> AsyncIterator[str]:
+    """Бесконечный поток фрагментов текста в формате NDJSON или SSE.
+
+    Генератор слов создаётся вызывающим до отправки заголовков ответа,
+    чтобы ошибки языка, сложности и словаря вернулись кодом ответа, а не
+    оборванным потоком. Фрагмент генерируется только после того, как
+    предыдущий отдан клиенту, поэтому память на соединение —
+    O(chunk_words). Между фрагментами управление возвращается event loop,
+    чтобы отключение клиента было замечено и поток остановлен.
+    """
+    for index, text in enumerate(word_extractor.iter_text_chunks(chunk_words)):
+        payload = TextStreamChunk(index=index, text=text).model_dump_json()
+        if stream_format == "sse":
+            yield f"id: {index}\nevent: chunk\ndata: {payload}\n\n"
+        else:
+            yield f"{payload}\n"
+        await asyncio.sleep(0)
@@ -0,0 +1,156 @@
+import asyncio
+import time
+from collections import deque
+from backend.app.core.config import settings
+from backend.app.core.logger import error_logger
+from backend.app.schemas.text_schemas import TextResponse, TextPoolStatistics
+from backend.app.services.text_generator import generate_text, new_seed
+
+
+class TextPool:
+    """Пул заранее сгенерированных текстов с фоновым пополнением.
+
+    Для каждой пары (язык, сложность) хранится ограниченная очередь готовых
+    ответов. Запрос забирает текст за O(1); когда очередь опускается ниже
+    нижней отметки, фоновая задача догенерирует тексты в потоке,
+    не блокируя event loop. Каждый текст несёт свой seed, поэтому его
+    можно воспроизвести через /api/text?seed=.
+    """
+
+    def __init__(
+        self,
+        size: int | None = None,
+        low_water: int | None = None,
+        refill_interval: float | None = None,
+    ) -> None:
+        self._size: int = size or settings.text_pool_size
+        self._low_water: int = low_water or settings.text_pool_low_water
+        self._refill_interval: float = (
+            refill_interval or settings.text_pool_refill_interval_seconds
+        )
+
+        self._pools: dict[tuple[str, str], deque[TextResponse]] = {
+            (lang, difficulty): deque(maxlen=self._size)
+            for lang, levels in settings.text_generation_config.items()
+            if settings.language_filepath[lang].exists()
+            for difficulty in levels
+        }
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._started_at: float = time.monotonic()
+
+        self._hits: int = 0
+        self._misses: int = 0
+        self._refilled_texts: int = 0
+        self._refill_batches: int = 0
+        self._recent_refills: deque[tuple[float, int]] = deque()
+
+    @staticmethod
+    def _generate(lang: str, difficulty: str, count: int) -> list[TextResponse]:
+        """Генерация готовых ответов для пары (язык, сложность) со своими seed."""
+        return [generate_text(lang, difficulty, new_seed()) for _ in range(count)]
+
+    async def pop(self, lang: str, difficulty: str) -> TextResponse:
+        """Текст из пула; при пустом пуле — генерация в потоке.
+
+        Пара без пула (нет в конфигурации генерации или нет словаря)
+        отклоняется и не учитывается в промахах.
+        """
+        pool = self._pools.get((lang, difficulty))
+        if pool is None:
+            raise ValueError(f"Нет пула текстов для {lang}:{difficulty}")
+        if not pool:
+            self._misses += 1
+            self._wakeup.set()
+            responses = await asyncio.to_thread(self._generate, lang, difficulty, 1)
+            return responses[0]
+
+        response = pool.popleft()
+        self._hits += 1
+        if len(pool) < self._low_water:
+            self._wakeup.set()
+        return response
+
+    async def _refill(self, key: tuple[str, str]) -> None:
+        pool = self._pools[key]
+        missing = self._size - len(pool)
+        if missing <= 0:
+            return
+
+        try:
+            responses = await asyncio.to_thread(self._generate, *key, missing)
+        except Exception as e:
+            error_logger.error("Failed to refill text pool %s: %s", key, e)
+            return
+
+        pool.extend(responses)
+        self._refilled_texts += len(responses)
+        self._refill_batches += 1
+        self._recent_refills.append((time.monotonic(), len(responses)))
+        self._prune_recent_refills()
+
+    async def fill(self) -> None:
+        """Заполнение всех пулов до максимального размера."""
+        for key in self._pools:
+            await self._refill(key)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=self._refill_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            for key, pool in self._pools.items():
+                if len(pool) < self._low_water:
+                    await self._refill(key)
+
+    async def start(self) -> None:
+        """Первичное заполнение пулов и запуск фонового пополнения."""
+        self._started_at = time.monotonic()
+        await self.fill()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _prune_recent_refills(self) -> None:
+        expired_at = time.monotonic() - settings.text_pool_rate_window_seconds
+        while self._recent_refills and self._recent_refills[0][0] < expired_at:
+            self._recent_refills.popleft()
+
+    def _refill_rate(self) -> float:
+        """Текстов в секунду за последние text_pool_rate_window_seconds."""
+        self._prune_recent_refills()
+        now = time.monotonic()
+        window = settings.text_pool_rate_window_seconds
+        elapsed = max(min(window, now - self._started_at), 1e-9)
+        return sum(count for _, count in self._recent_refills) / elapsed
+
+    def statistics(self) -> TextPoolStatistics:
+        return TextPoolStatistics(
+            depth={
+                f"{lang}:{difficulty}": len(pool)
+                for (lang, difficulty), pool in self._pools.items()
+            },
+            capacity=self._size,
+            low_water=self._low_water,
+            hits=self._hits,
+            misses=self._misses,
+            refilled_texts=self._refilled_texts,
+            refill_batches=self._refill_batches,
+            refill_rate=self._refill_rate(),
+        )
+
+
+text_pool = TextPool()
@@ -0,0 +1,45 @@
+"""Обслуживание таблицы агрегатов user_stats.
+
+Пересчёт агрегатов по истории результатов (после ручных правок данных;
+миграция заполняет таблицу сама):
+
+    python -m backend.app.services.user_stats rebuild [--user-id ID]
+"""
+
+import argparse
+import asyncio
+from backend.app.db.database import dispose_engines, new_session
+from backend.app.db.dependencies import require_current_schema
+from backend.app.db.repositories import UserStatsRepository
+
+
+async def rebuild(user_id: str | None = None) -> int:
+    """Пересчёт агрегатов одного пользователя или всех пользователей."""
+    async with new_session() as session:
+        return await UserStatsRepository(session).rebuild(user_id)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m backend.app.services.user_stats")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    rebuild_parser = subparsers.add_parser(
+        "rebuild", help="Пересчитать агрегаты по истории результатов"
+    )
+    rebuild_parser.add_argument(
+        "--user-id", help="Пользователь (по умолчанию — все пользователи)"
+    )
+    args = parser.parse_args(argv)
+
+    async def run() -> int:
+        try:
+            await require_current_schema()
+            return await rebuild(args.user_id)
+        finally:
+            await dispose_engines()
+
+    total = asyncio.run(run())
+    print(f"Учтено результатов: {total}")
+
+
+if __name__ == "__main__":
+    main()
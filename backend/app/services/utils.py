@@ -1,3 +1,8 @@
+import base64
+import hashlib
+from datetime import datetime, timezone
+
+
 def safe_float_convert(value: str | int | float | None, default: float = 0.0) -> float:
     try:
         if isinstance(value, str):
@@ -9,3 +14,42 @@ def safe_float_convert(value: str | int | float | None, default: float = 0.0) ->
 
 def safe_str_convert(value: str | int | float | None, default: str = "") -> str:
     return str(value) if value is not None else default
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Проверка заголовка If-None-Match против ETag (слабое сравнение)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+def make_etag(*parts: object) -> str:
+    """Сильный ETag из частей ключа представления (версия данных и параметры)."""
+    raw = "|".join(str(part) for part in parts).encode()
+    return f'"{hashlib.blake2b(raw, digest_size=16).hexdigest()}"'
+
+
+def encode_cursor(created_at: datetime, test_result_id: int) -> str:
+    """Непрозрачный курсор страницы истории: ключ (created_at, id) последней строки."""
+    raw = f"{created_at.isoformat()}|{test_result_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Разбор курсора истории; ValueError при некорректном значении."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, test_result_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(test_result_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def as_utc(value: datetime) -> datetime:
+    """Приведение к aware-datetime в UTC; naive-значения считаются UTC (SQLite)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
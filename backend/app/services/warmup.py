@@ -0,0 +1,137 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from backend.app.core.config import settings
+from backend.app.core.logger import error_logger, request_logger
+from backend.app.db.database import engine, new_session, read_engine
+from backend.app.db.dependencies import alembic_config, init_models
+from backend.app.schemas.health_schemas import ReadinessResponse, WarmupStep
+from backend.app.services.global_statistics import get_global_statistics
+from backend.app.services.leaderboard import leaderboards
+from backend.app.services.lexicon import get_lexicon
+from backend.app.services.static_assets import static_assets
+from backend.app.services.text_pool import text_pool
+
+
+def _upgrade_schema() -> None:
+    from alembic import command
+
+    command.upgrade(alembic_config(), "head")
+
+
+def _stamp_schema() -> None:
+    from alembic import command
+
+    command.stamp(alembic_config(), "head")
+
+
+async def _has_tables() -> bool:
+    async with engine.connect() as connection:
+        return await connection.run_sync(
+            lambda sync_connection: inspect(sync_connection).has_table("users")
+        )
+
+
+async def init_schema() -> None:
+    """Создание или миграция схемы по settings.database_schema_init.
+
+    В режиме "create" create_all выполняется только для пустой БД (с отметкой
+    head для Alembic): он не меняет существующие таблицы, поэтому уже
+    созданная БД обновляется миграциями, как в режиме "migrate".
+    """
+    if settings.database_schema_init == "create" and not await _has_tables():
+        await init_models()
+        await asyncio.to_thread(_stamp_schema)
+    elif settings.database_schema_init in ("create", "migrate"):
+        await asyncio.to_thread(_upgrade_schema)
+
+
+async def _ping(database_engine: AsyncEngine) -> None:
+    async with database_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def ping_database() -> None:
+    """Открытие и проверка соединений пулов писателя и читателей."""
+    for database_engine in dict.fromkeys((engine, read_engine)):
+        pool_size = getattr(database_engine.pool, "size", lambda: 1)()
+        count = max(1, min(pool_size, settings.database_warmup_connections))
+        await asyncio.gather(*(_ping(database_engine) for _ in range(count)))
+
+
+async def preload_lexicons() -> None:
+    """Загрузка индексов словарей всех языков (при необходимости — сборка)."""
+    paths = {*settings.language_filepath.values(), settings.default_filepath}
+    await asyncio.gather(*(asyncio.to_thread(get_lexicon, path) for path in paths))
+
+
+async def build_static_assets() -> None:
+    await asyncio.to_thread(static_assets.build)
+
+
+async def warm_global_statistics() -> None:
+    async with new_session() as session:
+        await get_global_statistics(session)
+
+
+class Warmup:
+    """Прогрев процесса в lifespan до приёма трафика.
+
+    Шаги выполняются по порядку: статика, схема БД, соединения, словари,
+    пул текстов, таблицы лидеров и кэш глобальной статистики. Ошибка
+    обязательного шага прерывает запуск; ошибка необязательного
+    записывается, и прогрев продолжается. Пока прогрев не завершён
+    (и после начала остановки), /readyz отвечает 503.
+    """
+
+    def __init__(self) -> None:
+        self._ready: bool = False
+        self._steps: list[WarmupStep] = []
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    async def _step(
+        self, name: str, func: Callable[[], Awaitable[None]], critical: bool = True
+    ) -> None:
+        started = time.perf_counter()
+        error = None
+        try:
+            await func()
+        except Exception as e:
+            error = str(e)
+            error_logger.error("Warm-up step %s failed: %s", name, error, exc_info=True)
+            if critical:
+                raise
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            self._steps.append(
+                WarmupStep(name=name, duration_ms=round(duration_ms, 3), error=error)
+            )
+
+    async def run(self) -> None:
+        self._ready = False
+        self._steps = []
+        await self._step("static_assets", build_static_assets)
+        await self._step("schema", init_schema)
+        await self._step("database", ping_database)
+        await self._step("lexicons", preload_lexicons, critical=False)
+        await self._step("text_pool", text_pool.start)
+        await self._step("leaderboards", leaderboards.start, critical=False)
+        await self._step("global_statistics", warm_global_statistics, critical=False)
+        self._ready = True
+        total_ms = sum(step.duration_ms for step in self._steps)
+        request_logger.info("Warm-up completed in %.1f ms", total_ms)
+
+    def stop(self) -> None:
+        """Снятие готовности в начале остановки, чтобы балансировщик снял трафик."""
+        self._ready = False
+
+    def statistics(self) -> ReadinessResponse:
+        return ReadinessResponse(ready=self._ready, steps=self._steps)
+
+
+warmup = Warmup()
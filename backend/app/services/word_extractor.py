@@ -1,8 +1,9 @@
 import random
-import mmap
 import os
 from collections.abc import Iterator
+import numpy as np
 from backend.app.core.config import settings
+from backend.app.services.lexicon import Lexicon, get_lexicon
 
 
 class WordExtractor:
@@ -11,11 +12,20 @@ class WordExtractor:
         filepath: str | None = None,
         count_words: int | None = None,
         level: str | None = None,
+        seed: int | None = None,
     ) -> None:
-        """Инициализация класса по извлечению слов из словаря."""
+        """Инициализация класса по извлечению слов из словаря.
+
+        Генераторы случайных чисел создаются на экземпляр, поэтому при
+        заданном seed результат генерации воспроизводим.
+        """
         self._settings = settings
         self.filepath: str = filepath or str(self._settings.default_filepath)
         self._validate_file()
+        self._lexicon: Lexicon = get_lexicon(self.filepath)
+        self.seed: int | None = seed
+        self._random: random.Random = random.Random(seed)
+        self._rng: np.random.Generator = np.random.default_rng(seed)
 
         self._count_words: int = count_words or self._settings.default_count_words
         self._level: str = level or self._settings.default_level
@@ -58,24 +68,6 @@ class WordExtractor:
         if not os.access(self.filepath, os.R_OK):
             raise PermissionError(f"Нет прав на чтение файла: {self.filepath}")
 
-    def _word_generator(self, level: str) -> Iterator[str]:
-        """Генератор слов с использованием memory-mapped file."""
-        length_rules = self._cached_word_lengths.get(level, {})
-        min_len = length_rules.get("min")
-        max_len = length_rules.get("max")
-
-        with open(self.filepath, "rb") as f:
-            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mmapped_file:
-                for line in iter(mmapped_file.readline, b""):
-                    word = line.decode("utf-8").strip()
-                    if word and not word.startswith("-"):
-                        word_length = len(word)
-                        if min_len is not None and word_length < min_len:
-                            continue
-                        if max_len is not None and word_length > max_len:
-                            continue
-                        yield word
-
     def _check_difficulty(self, word: str, level: str) -> bool:
         """Проверка сложности слова (оптимизированная версия)."""
         word_length = len(word)
@@ -94,11 +86,10 @@ class WordExtractor:
         count_words: int | None = None,
         level: str | None = None,
     ) -> list[str]:
-        """Извлечение указанного количества случайных слов из файла."""
+        """Извлечение указанного количества случайных слов из индекса словаря."""
         target_level = level or self._level
-        words = list(self._word_generator(target_level))
         target_count = count_words or self._count_words
-        return random.sample(words, min(target_count, len(words)))
+        return self._lexicon.sample(target_level, target_count, self._random)
 
     def return_char_random_words(
         self, random_words: list[str], level: str | None = None
@@ -117,8 +108,8 @@ class WordExtractor:
         for i, word in enumerate(random_words):
             char_words.extend(list(word))
             if i < last_index:
-                if random.random() < probability:
-                    char_words.append(random.choice(punctuation_list))
+                if self._random.random() < probability:
+                    char_words.append(self._random.choice(punctuation_list))
                 else:
                     char_words.append(" ")
 
@@ -141,8 +132,8 @@ class WordExtractor:
         for i, word in enumerate(random_words):
             parts.append(word)
             if i < last_index:
-                if random.random() < probability:
-                    parts.append(random.choice(punctuation_list))
+                if self._random.random() < probability:
+                    parts.append(self._random.choice(punctuation_list))
                 else:
                     parts.append(" ")
 
@@ -151,8 +142,8 @@ class WordExtractor:
     def random_punctuation_mark(self, level: str | None = None) -> str:
         """Добавление символов пунктуации в список символов."""
         target_level = level or self._level
-        if random.random() < self._cached_probability[target_level]:
-            return random.choice(self._cached_punctuation[target_level])
+        if self._random.random() < self._cached_probability[target_level]:
+            return self._random.choice(self._cached_punctuation[target_level])
         return " "
 
     def generate_random_text(
@@ -166,3 +157,59 @@ class WordExtractor:
             count_words=target_count, level=target_level
         )
         return self.return_string_random_words(random_words, level=target_level)
+
+    def iter_text_chunks(
+        self, chunk_words: int, level: str | None = None
+    ) -> Iterator[str]:
+        """Бесконечный генератор фрагментов текста по chunk_words слов.
+
+        Каждый следующий фрагмент начинается с разделителя, поэтому
+        конкатенация фрагментов даёт связный текст.
+        """
+        target_level = level or self._level
+        first = True
+
+        while True:
+            parts = []
+            for word in self.extract_random_words(
+                count_words=chunk_words, level=target_level
+            ):
+                if not first:
+                    parts.append(self.random_punctuation_mark(target_level))
+                parts.append(word)
+                first = False
+            yield "".join(parts)
+
+    def generate_random_texts(
+        self,
+        count_texts: int,
+        count_words: int | None = None,
+        level: str | None = None,
+    ) -> list[str]:
+        """Пакетная генерация текстов: индексы слов и пунктуация выбираются разом."""
+        target_count = count_words or self._count_words
+        target_level = level or self._level
+        punctuation_list = self._cached_punctuation[target_level]
+        probability = self._cached_probability[target_level]
+
+        word_indices = self._lexicon.sample_batch(
+            target_level, count_texts, target_count, self._rng
+        )
+        gaps = max(word_indices.shape[1] - 1, 0)
+        separators = np.where(
+            self._rng.random((count_texts, gaps)) < probability,
+            np.array(punctuation_list, dtype=object)[
+                self._rng.integers(0, len(punctuation_list), size=(count_texts, gaps))
+            ],
+            " ",
+        )
+
+        texts = []
+        for row, row_separators in zip(word_indices, separators.tolist()):
+            words = self._lexicon.words(row)
+            parts = [""] * (2 * len(words) - 1) if words else []
+            parts[::2] = words
+            parts[1::2] = row_separators
+            texts.append("".join(parts))
+
+        return texts
@@ -0,0 +1,55 @@
+"""Сравнение памяти: список строк против компактного индекса Lexicon.
+
+Запуск: python -m backend.benchmarks.lexicon_memory
+"""
+
+import gc
+import tracemalloc
+from backend.app.core.config import settings
+from backend.app.services.lexicon import Lexicon
+
+
+def _list_of_str_index(filepath) -> dict[str, list[str]]:
+    """Прежнее представление: list[str] всех слов и списки по уровням."""
+    with open(filepath, encoding="utf-8") as f:
+        words = [w for w in map(str.strip, f) if w and not w.startswith("-")]
+
+    levels = {}
+    for level, rules in settings.word_lengths.items():
+        min_len, max_len = rules.get("min"), rules.get("max")
+        levels[level] = [
+            w
+            for w in words
+            if (min_len is None or len(w) >= min_len)
+            and (max_len is None or len(w) <= max_len)
+        ]
+    levels["all"] = words
+    return levels
+
+
+def _measure(factory) -> tuple[object, int]:
+    gc.collect()
+    tracemalloc.start()
+    result = factory()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main() -> None:
+    filepath = settings.ru_filepath
+
+    index, list_bytes = _measure(lambda: _list_of_str_index(filepath))
+    del index
+    lexicon, lexicon_bytes = _measure(lambda: Lexicon(filepath))
+
+    print(f"Словарь: {filepath.name}, слов: {len(lexicon)}")
+    print(f"list[str] + списки уровней: {list_bytes / 2**20:8.2f} MiB")
+    print(f"Lexicon, куча Python:       {lexicon_bytes / 2**20:8.2f} MiB")
+    print(f"Lexicon, отображённый файл: {lexicon.nbytes / 2**20:8.2f} MiB (общий для воркеров)")
+    print(f"Экономия: x{list_bytes / (lexicon_bytes + lexicon.nbytes):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""Расчёт прогресса: списки из ORM-объектов против векторного движка NumPy.
+
+Запуск: python -m backend.benchmarks.progress_engine [--rows 100000]
+
+Старый путь — ORM-объекты из get_by_user_id и z-оценка на модуле
+statistics; новый — колонки кортежами из SQL и UserProgressCalculator,
+который вдобавок считает скользящие средние, EWMA, тренды и разбивку.
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from statistics import mean, pstdev
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from backend.app.db.database import Base
+from backend.app.db.repositories import UserRepository, TestResultRepository
+from backend.app.schemas.db_schemas import TestResultCreate
+from backend.app.schemas.progress_schemas import ProgressMetrics
+from backend.app.services.progress_calculator import (
+    PROGRESS_COLUMNS,
+    UserProgressCalculator,
+)
+
+
+def _legacy_single_progress(values: list[float], reverse: bool = False) -> float:
+    if len(values) < 2:
+        return 0.0
+    std_dev = pstdev(values)
+    if std_dev == 0:
+        return 0.0
+    return ((values[-1] - mean(values)) / std_dev) * (1 if not reverse else -1)
+
+
+async def legacy_progress(all_test_results) -> ProgressMetrics:
+    """Прежняя реализация UserProgressCalculator.calculate_progress."""
+    if not all_test_results or len(all_test_results) < 2:
+        return ProgressMetrics(
+            speed_progress=0.0, accuracy_progress=0.0, time_progress=0.0
+        )
+
+    speeds = [float(result.chars_per_minute) for result in all_test_results]
+    accuracies = [float(result.accuracy) for result in all_test_results]
+    times = [float(result.time_seconds) for result in all_test_results]
+
+    return ProgressMetrics(
+        speed_progress=round(_legacy_single_progress(speeds), 3) * 100,
+        accuracy_progress=round(_legacy_single_progress(accuracies), 3) * 100,
+        time_progress=round(_legacy_single_progress(times, reverse=True), 3) * 100,
+    )
+
+
+async def _seed(new_session, rows: int) -> str:
+    async with new_session() as session:
+        (user_id,) = await UserRepository(session).create_many(
+            UserRepository.new_ids(1), commit=False
+        )
+        await TestResultRepository(session).create_many(
+            [
+                TestResultCreate(
+                    user_id=user_id,
+                    chars_per_minute=200 + i % 150,
+                    accuracy=90 + i % 10,
+                    time_seconds=20 + i % 30,
+                    language=("ru", "en")[i % 2],
+                    difficulty=("easy", "medium", "hard")[i % 3],
+                )
+                for i in range(rows)
+            ]
+        )
+    return user_id
+
+
+async def _legacy(new_session, user_id: str) -> tuple[ProgressMetrics, float]:
+    async with new_session() as session:
+        test_results = await TestResultRepository(session).get_by_user_id(user_id)
+    started = time.perf_counter()
+    metrics = await legacy_progress(test_results)
+    return metrics, time.perf_counter() - started
+
+
+async def _vectorized(new_session, user_id: str) -> tuple[ProgressMetrics, float]:
+    async with new_session() as session:
+        rows = await TestResultRepository(session).get_series_columns(
+            user_id, PROGRESS_COLUMNS
+        )
+    started = time.perf_counter()
+    metrics = UserProgressCalculator.calculate_progress(
+        UserProgressCalculator.columns_from_rows(rows)
+    )
+    return metrics, time.perf_counter() - started
+
+
+async def _timeit(func, *args, repeat: int) -> tuple[ProgressMetrics, float, float]:
+    """Медианы полного времени (чтение + расчёт) и только расчёта."""
+    totals, computes = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        metrics, compute = await func(*args)
+        totals.append(time.perf_counter() - started)
+        computes.append(compute)
+    middle = len(totals) // 2
+    return metrics, sorted(totals)[middle], sorted(computes)[middle]
+
+
+async def main(rows: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        new_session = async_sessionmaker(engine, expire_on_commit=False)
+
+        user_id = await _seed(new_session, rows)
+        legacy, legacy_total, legacy_compute = await _timeit(
+            _legacy, new_session, user_id, repeat=repeat
+        )
+        vectorized, vectorized_total, vectorized_compute = await _timeit(
+            _vectorized, new_session, user_id, repeat=repeat
+        )
+        await engine.dispose()
+
+    print(f"Результатов: {rows}")
+    print(f"{'путь':<34} {'всего, мс':>10} {'расчёт, мс':>11}")
+    print(
+        f"{'ORM + statistics (z-оценка)':<34} "
+        f"{legacy_total * 1000:>10.1f} {legacy_compute * 1000:>11.1f}"
+    )
+    print(
+        f"{'колонки + NumPy (всё вместе)':<34} "
+        f"{vectorized_total * 1000:>10.1f} {vectorized_compute * 1000:>11.1f}"
+    )
+    print(
+        "Совпадение z-оценок:",
+        (legacy.speed_progress, legacy.accuracy_progress, legacy.time_progress)
+        == (
+            vectorized.speed_progress,
+            vectorized.accuracy_progress,
+            vectorized.time_progress,
+        ),
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeat))
@@ -0,0 +1,115 @@
+"""Выгрузка истории пользователя: серверный курсор против загрузки всех строк.
+
+Запуск: python -m backend.benchmarks.result_export [--rows 1000000] [--baseline-rows 100000]
+
+Потоковая выгрузка меряется на --rows строк, наивная (get_by_user_id и
+сериализация всего списка) — на --baseline-rows, чтобы не исчерпать память.
+Пиковая память — по tracemalloc, отдельным прогоном.
+"""
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from backend.app.db.database import Base
+from backend.app.db.models import TestResult, User
+from backend.app.db.repositories import TestResultRepository
+from backend.app.services.export import stream_export
+
+_SEED_CHUNK = 50_000
+
+
+async def _seed(new_session, rows: int) -> str:
+    """Синтетическая история без пересчёта агрегатов — только таблица результатов."""
+    user_id = str(uuid.uuid4())
+    started_at = datetime.now(timezone.utc) - timedelta(seconds=rows)
+    async with new_session() as session:
+        await session.execute(insert(User), [{"id": user_id, "created_at": started_at}])
+        for offset in range(0, rows, _SEED_CHUNK):
+            await session.execute(
+                insert(TestResult),
+                [
+                    {
+                        "public_id": str(uuid.uuid4()),
+                        "user_id": user_id,
+                        "chars_per_minute": 200 + i % 150,
+                        "accuracy": 90 + i % 10,
+                        "time_seconds": 20 + i % 30,
+                        "language": "ru",
+                        "difficulty": "easy",
+                        "created_at": started_at + timedelta(seconds=i),
+                    }
+                    for i in range(offset, min(offset + _SEED_CHUNK, rows))
+                ],
+            )
+        await session.commit()
+    return user_id
+
+
+async def _streaming(new_session, user_id: str, export_format: str) -> int:
+    size = 0
+    async for chunk in stream_export(user_id, export_format, new_session):
+        size += len(chunk)
+    return size
+
+
+async def _load_all(new_session, user_id: str, export_format: str) -> int:
+    async with new_session() as session:
+        test_results = await TestResultRepository(session).get_by_user_id(user_id)
+        return len(json.dumps(jsonable_encoder(test_results)))
+
+
+async def _measure(func, *args) -> tuple[float, float]:
+    """Время выполнения и пиковая память (МиБ) двумя отдельными прогонами."""
+    started = time.perf_counter()
+    await func(*args)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    await func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+async def main(rows: int, baseline_rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        new_session = async_sessionmaker(engine, expire_on_commit=False)
+
+        print(f"{'способ':<28} {'строк':>9} {'с':>8} {'строк/с':>10} {'пик, МиБ':>9}")
+        for size in dict.fromkeys((baseline_rows, rows)):
+            user_id = await _seed(new_session, size)
+            cases = [
+                ("поток CSV", _streaming, "csv"),
+                ("поток NDJSON", _streaming, "ndjson"),
+            ]
+            if size == baseline_rows:
+                cases.append(("get_by_user_id + JSON", _load_all, "json"))
+
+            for name, func, export_format in cases:
+                elapsed, peak = await _measure(func, new_session, user_id, export_format)
+                print(
+                    f"{name:<28} {size:>9} {elapsed:>8.2f} "
+                    f"{size / elapsed:>10.0f} {peak:>9.1f}"
+                )
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--baseline-rows", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.baseline_rows))
@@ -0,0 +1,72 @@
+"""Пропускная способность записи результатов: по одному против пакета.
+
+Запуск: python -m backend.benchmarks.result_ingestion [--rows N]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from backend.app.db.database import Base
+from backend.app.db.repositories import UserRepository, TestResultRepository
+from backend.app.schemas.db_schemas import TestResultCreate, UserCreate
+
+
+def _result(user_id: str, i: int) -> TestResultCreate:
+    return TestResultCreate(
+        user_id=user_id,
+        chars_per_minute=200 + i % 150,
+        accuracy=90 + i % 10,
+        time_seconds=20 + i % 30,
+        language="ru",
+        difficulty="easy",
+    )
+
+
+async def _per_row(new_session, rows: int) -> float:
+    started = time.perf_counter()
+    async with new_session() as session:
+        user = await UserRepository(session).create(UserCreate())
+        repo = TestResultRepository(session)
+        for i in range(rows):
+            await repo.create(_result(user.id, i))
+    return time.perf_counter() - started
+
+
+async def _batch(new_session, rows: int) -> float:
+    started = time.perf_counter()
+    async with new_session() as session:
+        (user_id,) = await UserRepository(session).create_many(
+            UserRepository.new_ids(1), commit=False
+        )
+        await TestResultRepository(session).create_many(
+            [_result(user_id, i) for i in range(rows)]
+        )
+    return time.perf_counter() - started
+
+
+async def main(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}"
+        )
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        new_session = async_sessionmaker(engine, expire_on_commit=False)
+
+        per_row = await _per_row(new_session, rows)
+        batch = await _batch(new_session, rows)
+        await engine.dispose()
+
+    print(f"Строк: {rows}")
+    print(f"По одному (commit на строку): {per_row:8.3f} с, {rows / per_row:10.0f} строк/с")
+    print(f"Пакетом (один INSERT/commit): {batch:8.3f} с, {rows / batch:10.0f} строк/с")
+    print(f"Ускорение: x{per_row / batch:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    asyncio.run(main(parser.parse_args().rows))
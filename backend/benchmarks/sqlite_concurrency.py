@@ -0,0 +1,165 @@
+"""Смешанная нагрузка чтения и записи на SQLite: один движок против профиля.
+
+Читатели запрашивают статистику и первую страницу истории, писатели
+сохраняют результаты по одному с фиксацией. "До" — движок по умолчанию
+без PRAGMA (журнал DELETE), "после" — WAL, PRAGMA из settings и раздельные
+движки писателя и читателей.
+
+Запуск: python -m backend.benchmarks.sqlite_concurrency [--readers 8] [--writers 4]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from backend.app.core.config import settings
+from backend.app.db.database import Base, make_session_factory
+from backend.app.db.repositories import (
+    UserRepository,
+    TestResultRepository,
+    UserStatsRepository,
+)
+from backend.app.db.storage_profile import create_engines
+from backend.app.schemas.db_schemas import TestResultCreate
+
+
+def _result(user_id: str, i: int) -> TestResultCreate:
+    return TestResultCreate(
+        user_id=user_id,
+        chars_per_minute=200 + i % 150,
+        accuracy=90 + i % 10,
+        time_seconds=20 + i % 30,
+        language="ru",
+        difficulty="easy",
+    )
+
+
+async def _seed(new_session, users: int, rows: int) -> list[str]:
+    async with new_session() as session:
+        user_ids = await UserRepository(session).create_many(
+            UserRepository.new_ids(users), commit=False
+        )
+        await TestResultRepository(session).create_many(
+            [_result(user_ids[i % users], i) for i in range(rows)]
+        )
+    return user_ids
+
+
+async def _read(new_session, user_id: str) -> None:
+    async with new_session() as session:
+        stats = await UserStatsRepository(session).get(user_id)
+        await TestResultRepository(session).get_user_statistics_snapshot(
+            user_id, stats, settings.history_page_size
+        )
+
+
+async def _write(new_session, user_id: str, i: int) -> None:
+    async with new_session() as session:
+        await TestResultRepository(session).create(_result(user_id, i))
+
+
+async def _worker(func, args_of, operations: int, latencies: list[float]) -> int:
+    errors = 0
+    for i in range(operations):
+        started = time.perf_counter()
+        try:
+            await func(*args_of(i))
+            latencies.append(time.perf_counter() - started)
+        except Exception:
+            errors += 1
+    return errors
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+
+async def _run(new_session, user_ids: list[str], args) -> dict[str, float]:
+    reads: list[float] = []
+    writes: list[float] = []
+    tasks = [
+        _worker(
+            _read,
+            lambda i, r=r: (new_session, user_ids[(r + i) % len(user_ids)]),
+            args.operations,
+            reads,
+        )
+        for r in range(args.readers)
+    ] + [
+        _worker(
+            _write,
+            lambda i, w=w: (new_session, user_ids[(w + i) % len(user_ids)], i),
+            args.operations,
+            writes,
+        )
+        for w in range(args.writers)
+    ]
+
+    started = time.perf_counter()
+    errors = sum(await asyncio.gather(*tasks))
+    elapsed = time.perf_counter() - started
+    return {
+        "ops": (len(reads) + len(writes)) / elapsed,
+        "read_p50": _percentile(reads, 0.5),
+        "read_p99": _percentile(reads, 0.99),
+        "write_p50": _percentile(writes, 0.5),
+        "write_p99": _percentile(writes, 0.99),
+        "errors": errors,
+    }
+
+
+async def main(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline_url = f"sqlite+aiosqlite:///{Path(tmp) / 'baseline.db'}"
+        baseline = create_async_engine(baseline_url)
+        profile_url = f"sqlite+aiosqlite:///{Path(tmp) / 'profile.db'}"
+        settings.database_read_pool_size = args.read_pool_size
+        writer, reader = create_engines(profile_url)
+
+        modes = (
+            ("один движок", baseline, async_sessionmaker(baseline)),
+            ("профиль WAL", writer, make_session_factory(writer, reader)),
+        )
+        results = {}
+        for name, engine, new_session in modes:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            user_ids = await _seed(new_session, args.users, args.rows)
+            results[name] = await _run(new_session, user_ids, args)
+
+        await baseline.dispose()
+        await writer.dispose()
+        await reader.dispose()
+
+    print(
+        f"Читателей: {args.readers}, писателей: {args.writers}, "
+        f"операций на задачу: {args.operations}, результатов в базе: {args.rows}"
+    )
+    print(
+        f"{'режим':>12} {'оп/с':>8} {'чтение p50':>11} {'чтение p99':>11} "
+        f"{'запись p50':>11} {'запись p99':>11} {'ошибок':>7}"
+    )
+    for name, row in results.items():
+        print(
+            f"{name:>12} {row['ops']:>8.0f} {row['read_p50']:>11.1f} "
+            f"{row['read_p99']:>11.1f} {row['write_p50']:>11.1f} "
+            f"{row['write_p99']:>11.1f} {row['errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--operations", type=int, default=200)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument(
+        "--read-pool-size", type=int, default=settings.database_read_pool_size
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,172 @@
+"""Отдача статики: StaticFiles и чтение HTML с диска против кэша в памяти.
+
+"До" — приложение в прежнем виде: HTML читается с диска на каждый запрос,
+CSS/JS отдаёт StaticFiles без сжатия. "После" — маршруты приложения на
+static_assets. Считаются байты тела страницы индекса и статистики при первом
+визите (HTML и все ресурсы) и при повторном (браузер ревалидирует
+HTML, ресурсы с хэшем берёт из кэша без запроса), а также задержки
+обработки запросов к HTML и CSS прямым вызовом ASGI-приложения.
+
+Запуск: python -m backend.benchmarks.static_assets [--requests 2000]
+"""
+
+import argparse
+import re
+import time
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse, Response
+from fastapi.staticfiles import StaticFiles
+from fastapi.testclient import TestClient
+from backend.app.core.config import settings
+from backend.app.main import favicon, read_index, read_static, read_statistics_page
+from backend.app.services.static_assets import FAVICON_SVG, static_assets
+
+PAGES = ("/", "/statistics/benchmark")
+ACCEPT_ENCODING = "gzip, deflate, br"
+
+
+def _baseline_app() -> FastAPI:
+    app = FastAPI()
+    app.mount(settings.mount_css, StaticFiles(directory=settings.static_dir))
+    app.mount(settings.mount_js, StaticFiles(directory=settings.static_js_dir))
+
+    @app.get("/", response_class=HTMLResponse)
+    async def index():
+        with open(settings.html_index_path, "r") as f:
+            return f.read()
+
+    @app.get("/favicon.svg")
+    async def baseline_favicon():
+        return Response(content=FAVICON_SVG, media_type="image/svg+xml")
+
+    @app.get("/statistics/{user_id}", response_class=HTMLResponse)
+    async def statistics(user_id: str):
+        with open(settings.html_statistics_path, "r") as f:
+            return f.read()
+
+    return app
+
+
+def _cached_app() -> FastAPI:
+    app = FastAPI()
+    app.get("/")(read_index)
+    app.get("/favicon.svg")(favicon)
+    app.get("/static/{asset_path:path}")(read_static)
+    app.get("/statistics/{user_id}")(read_statistics_page)
+    static_assets.build()
+    return app
+
+
+def _wire_bytes(response) -> int:
+    """Длина тела в том виде, в каком оно пришло по сети."""
+    return int(response.headers.get("content-length", len(response.content)))
+
+
+def _get(client: TestClient, url: str, headers: dict[str, str] | None = None):
+    headers = {"accept-encoding": ACCEPT_ENCODING, **(headers or {})}
+    return client.get(url, headers=headers)
+
+
+def _fetch(client: TestClient, url: str, cache: dict[str, tuple[str, bool]]):
+    """Запрос через HTTP-кэш браузера: immutable не запрашивается, остальное
+    ревалидируется по ETag. Возвращает ответ (None — взято из кэша)."""
+    cached = cache.get(url)
+    if cached and cached[1]:
+        return None
+    response = _get(client, url, {"if-none-match": cached[0]} if cached else None)
+    if "etag" in response.headers:
+        immutable = "immutable" in response.headers.get("cache-control", "")
+        cache[url] = (response.headers["etag"], immutable)
+    return response
+
+
+def _visit(client: TestClient, page: str, cache: dict[str, tuple[str, bool]]) -> int:
+    """Загрузка страницы и всех её ресурсов; возвращает байты тел по сети."""
+    response = _fetch(client, page, cache)
+    total = _wire_bytes(response)
+    html = response.text if response.status_code == 200 else _get(client, page).text
+    for url in re.findall(r'(?:href|src)="(/[^"]+)"', html):
+        response = _fetch(client, url, cache)
+        total += _wire_bytes(response) if response is not None else 0
+    return total
+
+
+async def _call(app: FastAPI, url: str) -> None:
+    """Прямой вызов ASGI-приложения, без HTTP-клиента и распаковки тела."""
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": url,
+        "raw_path": url.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"bench"),
+            (b"accept-encoding", ACCEPT_ENCODING.encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def _latency(app: FastAPI, url: str, requests: int) -> tuple[float, float]:
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await _call(app, url)
+        latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2] * 1000
+    p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000
+    return p50, p99
+
+
+def main(args) -> None:
+    rows = []
+    for name, app in (("до", _baseline_app()), ("после", _cached_app())):
+        with TestClient(app) as client:
+            html = _get(client, "/").text
+            css_url = re.search(r'href="(/static/css/[^"]+)"', html)[1]
+            bytes_by_page = {}
+            for page in PAGES:
+                cache: dict[str, tuple[str, bool]] = {}
+                first = _visit(client, page, cache)
+                repeat = _visit(client, page, cache)
+                bytes_by_page[page] = (first, repeat)
+            html_p50, html_p99 = client.portal.call(_latency, app, "/", args.requests)
+            css_p50, css_p99 = client.portal.call(
+                _latency, app, css_url, args.requests
+            )
+        rows.append((name, bytes_by_page, html_p50, html_p99, css_p50, css_p99))
+
+    print(
+        f"Запросов на замер задержки: {args.requests}, "
+        f"Accept-Encoding: {ACCEPT_ENCODING}"
+    )
+    for page in PAGES:
+        print(f"Страница {page}: байт тел при первом / повторном визите")
+        for name, bytes_by_page, *_ in rows:
+            first, repeat = bytes_by_page[page]
+            print(f"{name:>8} {first:>10} {repeat:>10}")
+    print(f"{'режим':>8} {'HTML p50':>9} {'HTML p99':>9} {'CSS p50':>9} {'CSS p99':>9}")
+    for name, _, html_p50, html_p99, css_p50, css_p99 in rows:
+        print(
+            f"{name:>8} {html_p50:>9.2f} {html_p99:>9.2f} "
+            f"{css_p50:>9.2f} {css_p99:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    main(parser.parse_args())
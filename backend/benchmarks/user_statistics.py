@@ -0,0 +1,105 @@
+"""Задержка /api/statistics (запросы + сериализация): пять запросов против снимка.
+
+Запуск: python -m backend.benchmarks.user_statistics [--sizes 10 1000 100000]
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from backend.app.db.database import Base
+from backend.app.core.config import settings
+from backend.app.db.repositories import (
+    UserRepository,
+    TestResultRepository,
+    UserStatsRepository,
+)
+from backend.app.schemas.db_schemas import TestResultCreate, UserTestStatisticsResponse
+from backend.app.services.progress_calculator import UserProgressCalculator
+from backend.benchmarks.progress_engine import legacy_progress
+
+
+async def _seed(new_session, size: int) -> str:
+    async with new_session() as session:
+        (user_id,) = await UserRepository(session).create_many(
+            UserRepository.new_ids(1), commit=False
+        )
+        await TestResultRepository(session).create_many(
+            [
+                TestResultCreate(
+                    user_id=user_id,
+                    chars_per_minute=200 + i % 150,
+                    accuracy=90 + i % 10,
+                    time_seconds=20 + i % 30,
+                    language="ru",
+                    difficulty="easy",
+                )
+                for i in range(size)
+            ]
+        )
+    return user_id
+
+
+async def _five_queries(new_session, user_id: str) -> None:
+    async with new_session() as session:
+        repo = TestResultRepository(session)
+        all_test_results = await repo.get_by_user_id(user_id)
+        jsonable_encoder(
+            {
+                "last_result": await repo.get_last_result_by_user_id(user_id),
+                "best_performance": await repo.get_user_best_performance(user_id),
+                "avg_statistics": await repo.get_user_test_result_statistics(user_id),
+                "progress_metrics": await legacy_progress(all_test_results),
+                "all_test_results": all_test_results,
+            }
+        )
+
+
+async def _snapshot(new_session, user_id: str) -> None:
+    async with new_session() as session:
+        stats = await UserStatsRepository(session).get(user_id)
+        snapshot = await TestResultRepository(session).get_user_statistics_snapshot(
+            user_id, stats, settings.history_page_size
+        )
+        UserTestStatisticsResponse(
+            **dict(snapshot),
+            progress_metrics=UserProgressCalculator.calculate_progress_from_stats(
+                stats
+            ),
+        ).model_dump_json()
+
+
+async def _timeit(func, *args, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await func(*args)
+        timings.append(time.perf_counter() - started)
+    return sorted(timings)[len(timings) // 2]
+
+
+async def main(sizes: list[int]) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        new_session = async_sessionmaker(engine, expire_on_commit=False)
+
+        print(f"{'результатов':>12} {'5 запросов, мс':>16} {'снимок, мс':>12}")
+        for size in sizes:
+            user_id = await _seed(new_session, size)
+            repeat = 3 if size >= 100_000 else 20
+            old = await _timeit(_five_queries, new_session, user_id, repeat=repeat)
+            new = await _timeit(_snapshot, new_session, user_id, repeat=repeat)
+            print(f"{size:>12} {old * 1000:>16.2f} {new * 1000:>12.2f}")
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100_000])
+    asyncio.run(main(parser.parse_args().sizes))
@@ -7,7 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncEngine
 from alembic import context
 
 from backend.app.core.config import settings
-from backend.app.db.models import User
+from backend.app.db import models  # noqa: F401 — регистрация всех таблиц
 from backend.app.db.database import Base
 
 config = context.config
@@ -35,7 +35,11 @@ def run_migrations_offline() -> None:
 
 
 def do_run_migrations(connection):
-    context.configure(connection=connection, target_metadata=target_metadata)
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
 
     with context.begin_transaction():
         context.run_migrations()
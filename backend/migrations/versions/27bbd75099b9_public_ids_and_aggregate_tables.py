@@ -0,0 +1,357 @@
+"""public ids and aggregate tables
+
+Adds test_results.public_id (existing rows get fresh UUIDs) and the tables
+maintained alongside result inserts: user_stats, result_histograms,
+leaderboard_entries and statistics_versions. Tables and the column that
+already exist (databases created by ``create_all``) are left untouched.
+Empty user_stats, result_histograms and leaderboard_entries are backfilled
+from existing test_results here, with the bins from
+``settings.percentile_bins`` and ``settings.leaderboard_min_accuracy``.
+
+Revision ID: 27bbd75099b9
+Revises: 5b6ec66de353
+Create Date: 2026-10-17 07:37:52.428848
+
+"""
+import uuid
+from datetime import timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from backend.app.core.config import settings
+from backend.app.services.histograms import histogram_bin
+
+
+# revision identifiers, used by Alembic.
+revision: str = '27bbd75099b9'
+down_revision: Union[str, Sequence[str], None] = '5b6ec66de353'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    inspector = sa.inspect(op.get_bind())
+    existing_tables = set(inspector.get_table_names())
+
+    if 'result_histograms' not in existing_tables:
+        op.create_table(
+            'result_histograms',
+            sa.Column('language', sa.String(length=10), nullable=False),
+            sa.Column('difficulty', sa.String(length=10), nullable=False),
+            sa.Column('metric', sa.String(length=32), nullable=False),
+            sa.Column('bin', sa.Integer(), nullable=False),
+            sa.Column('count', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('language', 'difficulty', 'metric', 'bin'),
+        )
+    if 'statistics_versions' not in existing_tables:
+        op.create_table(
+            'statistics_versions',
+            sa.Column('user_id', sa.String(length=36), nullable=False),
+            sa.Column('version', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('user_id'),
+        )
+    if 'leaderboard_entries' not in existing_tables:
+        op.create_table(
+            'leaderboard_entries',
+            sa.Column('language', sa.String(length=10), nullable=False),
+            sa.Column('difficulty', sa.String(length=10), nullable=False),
+            sa.Column('period', sa.String(length=10), nullable=False),
+            sa.Column('user_id', sa.String(length=36), nullable=False),
+            sa.Column('test_result_id', sa.Integer(), nullable=False),
+            sa.Column('chars_per_minute', sa.Float(), nullable=False),
+            sa.Column('accuracy', sa.Float(), nullable=False),
+            sa.Column('time_seconds', sa.Float(), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('language', 'difficulty', 'period', 'user_id'),
+        )
+        op.create_index(
+            'ix_leaderboard_entries_board_speed',
+            'leaderboard_entries',
+            ['language', 'difficulty', 'period', 'chars_per_minute'],
+            unique=False,
+        )
+    if 'user_stats' not in existing_tables:
+        metric_columns = [
+            sa.Column(f'{metric}_{field}', sa.Float(), nullable=False)
+            for metric in ('chars_per_minute', 'accuracy', 'time_seconds')
+            for field in ('mean', 'm2', 'min', 'max', 'last')
+        ]
+        op.create_table(
+            'user_stats',
+            sa.Column('user_id', sa.String(length=36), nullable=False),
+            sa.Column('language', sa.String(length=10), nullable=False),
+            sa.Column('difficulty', sa.String(length=10), nullable=False),
+            sa.Column('total_tests', sa.Integer(), nullable=False),
+            *metric_columns,
+            sa.Column('last_result_id', sa.Integer(), nullable=False),
+            sa.Column('last_language', sa.String(length=10), nullable=False),
+            sa.Column('last_difficulty', sa.String(length=10), nullable=False),
+            sa.Column('last_created_at', sa.DateTime(timezone=True), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('user_id', 'language', 'difficulty'),
+        )
+
+    test_result_columns = {
+        column['name'] for column in inspector.get_columns('test_results')
+    }
+    if 'public_id' not in test_result_columns:
+        _add_public_ids()
+    _backfill_user_stats()
+    _backfill_result_histograms()
+    _backfill_leaderboard_entries()
+
+
+def _add_public_ids() -> None:
+    with op.batch_alter_table('test_results') as batch_op:
+        batch_op.add_column(
+            sa.Column('public_id', sa.String(length=36), nullable=True)
+        )
+
+    test_results = sa.table(
+        'test_results',
+        sa.column('id', sa.Integer),
+        sa.column('public_id', sa.String),
+    )
+    connection = op.get_bind()
+    test_result_ids = connection.execute(sa.select(test_results.c.id)).scalars().all()
+    if test_result_ids:
+        connection.execute(
+            test_results.update()
+            .where(test_results.c.id == sa.bindparam('result_id'))
+            .values(public_id=sa.bindparam('new_public_id')),
+            [
+                {'result_id': test_result_id, 'new_public_id': str(uuid.uuid4())}
+                for test_result_id in test_result_ids
+            ],
+        )
+
+    with op.batch_alter_table('test_results') as batch_op:
+        batch_op.alter_column(
+            'public_id', existing_type=sa.String(length=36), nullable=False
+        )
+        batch_op.create_unique_constraint(
+            'uq_test_results_public_id', ['public_id']
+        )
+
+
+METRICS = ('chars_per_minute', 'accuracy', 'time_seconds')
+USER_STATS_ALL = '*'
+LEADERBOARD_ALL_TIME = 'all'
+INSERT_CHUNK_SIZE = 10_000
+
+
+def _backfill_user_stats() -> None:
+    """Fill an empty user_stats from test_results (Welford per user and pair).
+
+    Without it the first save after upgrading inserts a row built from that
+    single result, and statistics ignore every earlier result.
+    """
+    connection = op.get_bind()
+    user_stats = sa.table(
+        'user_stats',
+        *(
+            sa.column(name)
+            for name in (
+                'user_id', 'language', 'difficulty', 'total_tests',
+                'last_result_id', 'last_language', 'last_difficulty',
+                'last_created_at',
+            )
+        ),
+        *(
+            sa.column(f'{metric}_{field}')
+            for metric in METRICS
+            for field in ('mean', 'm2', 'min', 'max', 'last')
+        ),
+    )
+    test_results = sa.table(
+        'test_results',
+        *(
+            sa.column(name)
+            for name in (
+                'id', 'user_id', 'language', 'difficulty', 'created_at',
+                *METRICS,
+            )
+        ),
+    )
+    if connection.execute(sa.select(sa.func.count()).select_from(user_stats)).scalar():
+        return
+
+    stats: dict[tuple[str, str, str], dict] = {}
+    rows = connection.execute(
+        sa.select(test_results).order_by(
+            test_results.c.created_at, test_results.c.id
+        )
+    )
+    for row in rows:
+        for key in (
+            (row.user_id, row.language, row.difficulty),
+            (row.user_id, USER_STATS_ALL, USER_STATS_ALL),
+        ):
+            value = stats.setdefault(
+                key,
+                {
+                    'user_id': key[0],
+                    'language': key[1],
+                    'difficulty': key[2],
+                    'total_tests': 0,
+                    **{f'{metric}_mean': 0.0 for metric in METRICS},
+                    **{f'{metric}_m2': 0.0 for metric in METRICS},
+                },
+            )
+            value['total_tests'] += 1
+            for metric in METRICS:
+                x = float(getattr(row, metric))
+                delta = x - value[f'{metric}_mean']
+                value[f'{metric}_mean'] += delta / value['total_tests']
+                value[f'{metric}_m2'] += delta * (x - value[f'{metric}_mean'])
+                value[f'{metric}_min'] = min(value.get(f'{metric}_min', x), x)
+                value[f'{metric}_max'] = max(value.get(f'{metric}_max', x), x)
+                value[f'{metric}_last'] = x
+            value['last_result_id'] = row.id
+            value['last_language'] = row.language
+            value['last_difficulty'] = row.difficulty
+            value['last_created_at'] = row.created_at
+
+    values = list(stats.values())
+    for start in range(0, len(values), INSERT_CHUNK_SIZE):
+        connection.execute(
+            user_stats.insert(), values[start : start + INSERT_CHUNK_SIZE]
+        )
+
+
+def _backfill_result_histograms() -> None:
+    """Fill an empty result_histograms with bin counts of test_results.
+
+    Without it percentile ranks ignore every result saved before upgrading.
+    """
+    connection = op.get_bind()
+    result_histograms = sa.table(
+        'result_histograms',
+        *(
+            sa.column(name)
+            for name in ('language', 'difficulty', 'metric', 'bin', 'count')
+        ),
+    )
+    test_results = sa.table(
+        'test_results',
+        *(
+            sa.column(name)
+            for name in ('language', 'difficulty', *METRICS)
+        ),
+    )
+    if connection.execute(
+        sa.select(sa.func.count()).select_from(result_histograms)
+    ).scalar():
+        return
+
+    counts: dict[tuple[str, str, str, int], int] = {}
+    for row in connection.execute(sa.select(test_results)):
+        for metric in METRICS:
+            key = (
+                row.language,
+                row.difficulty,
+                metric,
+                histogram_bin(metric, float(getattr(row, metric))),
+            )
+            counts[key] = counts.get(key, 0) + 1
+
+    values = [
+        {
+            'language': language,
+            'difficulty': difficulty,
+            'metric': metric,
+            'bin': bin_index,
+            'count': count,
+        }
+        for (language, difficulty, metric, bin_index), count in counts.items()
+    ]
+    for start in range(0, len(values), INSERT_CHUNK_SIZE):
+        connection.execute(
+            result_histograms.insert(), values[start : start + INSERT_CHUNK_SIZE]
+        )
+
+
+def _backfill_leaderboard_entries() -> None:
+    """Fill an empty leaderboard_entries with each user's fastest results.
+
+    One entry per (language, difficulty, period, user): the all-time board
+    and the UTC day of the result; on equal speed the earlier result wins.
+    Old daily boards and entries beyond the top are pruned at startup.
+    """
+    connection = op.get_bind()
+    leaderboard_entries = sa.table(
+        'leaderboard_entries',
+        *(
+            sa.column(name)
+            for name in (
+                'language', 'difficulty', 'period', 'user_id', 'test_result_id',
+                *METRICS,
+            )
+        ),
+        sa.column('created_at', sa.DateTime(timezone=True)),
+    )
+    test_results = sa.table(
+        'test_results',
+        *(
+            sa.column(name)
+            for name in ('id', 'user_id', 'language', 'difficulty', *METRICS)
+        ),
+        sa.column('created_at', sa.DateTime(timezone=True)),
+    )
+    if connection.execute(
+        sa.select(sa.func.count()).select_from(leaderboard_entries)
+    ).scalar():
+        return
+
+    best: dict[tuple[str, str, str, str], dict] = {}
+    rows = connection.execute(
+        sa.select(test_results)
+        .where(test_results.c.accuracy >= settings.leaderboard_min_accuracy)
+        .order_by(test_results.c.created_at, test_results.c.id)
+    )
+    for row in rows:
+        created_at = row.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        day = created_at.astimezone(timezone.utc).date().isoformat()
+        for period in (LEADERBOARD_ALL_TIME, day):
+            key = (row.language, row.difficulty, period, row.user_id)
+            current = best.get(key)
+            if current is not None and (
+                current['chars_per_minute'] >= row.chars_per_minute
+            ):
+                continue
+            best[key] = {
+                'language': row.language,
+                'difficulty': row.difficulty,
+                'period': period,
+                'user_id': row.user_id,
+                'test_result_id': row.id,
+                **{metric: getattr(row, metric) for metric in METRICS},
+                'created_at': row.created_at,
+            }
+
+    values = list(best.values())
+    for start in range(0, len(values), INSERT_CHUNK_SIZE):
+        connection.execute(
+            leaderboard_entries.insert(), values[start : start + INSERT_CHUNK_SIZE]
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('test_results') as batch_op:
+        batch_op.drop_constraint('uq_test_results_public_id', type_='unique')
+        batch_op.drop_column('public_id')
+
+    # ### commands auto generated by Alembic - please adjust! ###
+    op.drop_table('user_stats')
+    op.drop_index('ix_leaderboard_entries_board_speed', table_name='leaderboard_entries')
+    op.drop_table('leaderboard_entries')
+    op.drop_table('statistics_versions')
+    op.drop_table('result_histograms')
+    # ### end Alembic commands ###
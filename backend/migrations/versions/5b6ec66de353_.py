@@ -1,4 +1,9 @@
-"""empty message
+"""initial schema: users and test_results
+
+Databases created before migrations existed (``Base.metadata.create_all``)
+already have these tables; they are left as they are and only missing
+tables and indexes are created, so ``alembic upgrade head`` works on them
+without a manual ``alembic stamp``.
 
 Revision ID: 5b6ec66de353
 Revises: 
@@ -20,13 +25,48 @@ depends_on: Union[str, Sequence[str], None] = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    pass
-    # ### end Alembic commands ###
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('users'):
+        op.create_table(
+            'users',
+            sa.Column('id', sa.String(length=36), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    if not inspector.has_table('test_results'):
+        op.create_table(
+            'test_results',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.Column('user_id', sa.String(length=36), nullable=False),
+            sa.Column('chars_per_minute', sa.Float(), nullable=False),
+            sa.Column('accuracy', sa.Float(), nullable=False),
+            sa.Column('time_seconds', sa.Float(), nullable=False),
+            sa.Column('language', sa.String(length=10), nullable=False),
+            sa.Column('difficulty', sa.String(length=10), nullable=False),
+            sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+
+    inspector = sa.inspect(op.get_bind())
+    existing_indexes = {
+        index['name'] for index in inspector.get_indexes('test_results')
+    }
+    for name, columns in (
+        ('ix_test_results_user_id', ['user_id']),
+        ('ix_test_results_created_at', ['created_at']),
+        ('ix_test_results_user_created', ['user_id', 'created_at']),
+        ('ix_test_results_language_difficulty', ['language', 'difficulty']),
+    ):
+        if name not in existing_indexes:
+            op.create_index(name, 'test_results', columns, unique=False)
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    # ### commands auto generated by Alembic - please adjust! ###
-    pass
-    # ### end Alembic commands ###
+    op.drop_index('ix_test_results_language_difficulty', table_name='test_results')
+    op.drop_index('ix_test_results_user_created', table_name='test_results')
+    op.drop_index('ix_test_results_created_at', table_name='test_results')
+    op.drop_index('ix_test_results_user_id', table_name='test_results')
+    op.drop_table('test_results')
+    op.drop_table('users')
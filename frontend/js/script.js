@@ -72,18 +72,47 @@ function showToast(message, type = "info") {
   }, 3000);
 }
 
+const PREFETCH_COUNT = 5;
+const PREFETCH_LOW_WATER = 1;
+const textQueues = {};
+const pendingPrefetches = {};
+
+function prefetchTexts(language, difficulty) {
+  const key = `${language}:${difficulty}`;
+  if (!pendingPrefetches[key]) {
+    pendingPrefetches[key] = fetch(
+      `/api/texts?lang=${language}&difficulty=${difficulty}&count=${PREFETCH_COUNT}`,
+    )
+      .then((response) => {
+        if (!response.ok) {
+          throw new Error("Не удалось получить текст");
+        }
+        return response.json();
+      })
+      .then((data) => {
+        textQueues[key] = (textQueues[key] || []).concat(data.texts);
+      })
+      .finally(() => {
+        delete pendingPrefetches[key];
+      });
+  }
+  return pendingPrefetches[key];
+}
+
 async function fetchTextFromBackend(language, difficulty) {
+  const key = `${language}:${difficulty}`;
   try {
-    const response = await fetch(
-      `/api/text?lang=${language}&difficulty=${difficulty}`,
-    );
-
-    if (!response.ok) {
-      throw new Error("Не удалось получить текст");
+    if (!textQueues[key]?.length) {
+      await prefetchTexts(language, difficulty);
     }
 
-    const data = await response.json();
-    return data.text;
+    const text = textQueues[key].shift();
+    if (textQueues[key].length <= PREFETCH_LOW_WATER) {
+      prefetchTexts(language, difficulty).catch((error) =>
+        console.error("Ошибка предзагрузки текстов:", error),
+      );
+    }
+    return text;
   } catch (error) {
     console.error("Ошибка загрузки текста:", error);
     showToast("Ошибка загрузки текста. Используем локальную версию", "error");
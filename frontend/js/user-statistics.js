@@ -44,24 +44,30 @@ class UserStatistics {
 
   async loadStatistics() {
     if (this.userId === "anonymous") {
-      this.renderStatistics({ all_test_results: [] });
+      this.renderStatistics({ avg_statistics: { total_tests: 0 } });
       return;
     }
 
     try {
       this.showLoading(true);
 
-      const response = await fetch(`/api/statistics/${this.userId}`, {
-        headers: {
-          "Content-Type": "application/json",
-        },
-      });
+      const [response, seriesResponse] = await Promise.all([
+        fetch(`/api/statistics/${this.userId}`, {
+          headers: {
+            "Content-Type": "application/json",
+          },
+        }),
+        fetch(
+          `/api/users/${this.userId}/series?points=${this.getSeriesPoints()}`,
+        ),
+      ]);
 
       if (!response.ok) {
         throw new Error(`Ошибка загрузки: ${response.status}`);
       }
 
       const data = await response.json();
+      data.series = seriesResponse.ok ? await seriesResponse.json() : null;
       this.renderStatistics(data);
     } catch (error) {
       console.error("Ошибка загрузки статистики:", error);
@@ -72,7 +78,8 @@ class UserStatistics {
   }
 
   renderStatistics(data) {
-    const hasResults = data.all_test_results?.length > 0;
+    const totalTests = data.avg_statistics?.total_tests || 0;
+    const hasResults = totalTests > 0;
 
     if (!hasResults) {
       this.statisticsContainer.innerHTML = this.renderNoResults();
@@ -83,7 +90,7 @@ class UserStatistics {
       <div class="user-stats">
         <div class="stats-subheader">
           <h2>Общая статистика</h2>
-          <span class="tests-count">Всего тестов: ${data.all_test_results.length}</span>
+          <span class="tests-count">Всего тестов: ${totalTests}</span>
         </div>
 
         ${this.renderStatsGrid(data)}
@@ -91,7 +98,7 @@ class UserStatistics {
       </div>
     `;
 
-    this.initCharts(data.all_test_results);
+    this.initCharts(data.series || this.seriesFromHistory(data.history));
   }
 
   renderStatsGrid(data) {
@@ -256,10 +263,34 @@ class UserStatistics {
     `;
   }
 
-  initCharts(tests) {
-    this.dates = tests.map((test) => this.formatDate(test.created_at, true));
-    const speeds = tests.map((test) => test.chars_per_minute);
-    const accuracies = tests.map((test) => test.accuracy);
+  getSeriesPoints() {
+    // Графики занимают около половины ширины окна: точек больше, чем пикселей, не нужно
+    return Math.min(Math.max(Math.round(window.innerWidth / 2), 50), 1000);
+  }
+
+  seriesFromHistory(history) {
+    // История приходит страницами, новые результаты первыми
+    const tests = [...(history?.items || [])].reverse();
+    const toSeries = (key) => ({
+      created_at: tests.map((test) => test.created_at),
+      values: tests.map((test) => test[key]),
+    });
+
+    return {
+      chars_per_minute: toSeries("chars_per_minute"),
+      accuracy: toSeries("accuracy"),
+    };
+  }
+
+  initCharts(series) {
+    const speedDates = series.chars_per_minute.created_at.map((date) =>
+      this.formatDate(date, true),
+    );
+    const accuracyDates = series.accuracy.created_at.map((date) =>
+      this.formatDate(date, true),
+    );
+    const speeds = series.chars_per_minute.values;
+    const accuracies = series.accuracy.values;
 
     const speedTrendLine = this.calculateTrendLine(speeds);
     const accuracyTrendLine = this.calculateTrendLine(accuracies);
@@ -287,6 +318,7 @@ class UserStatistics {
         },
       ],
       "Скорость печати",
+      speedDates,
     );
 
     this.charts.accuracy = this.createChart(
@@ -312,6 +344,7 @@ class UserStatistics {
         },
       ],
       "Точность печати",
+      accuracyDates,
     );
 
     this.fixChartResponsiveness();
@@ -333,7 +366,7 @@ class UserStatistics {
     });
   }
 
-  createChart(canvasId, datasets, title) {
+  createChart(canvasId, datasets, title, labels) {
     const gridColor =
       this.currentTheme === "dark"
         ? "rgba(255, 255, 255, 0.1)"
@@ -346,7 +379,7 @@ class UserStatistics {
     return new Chart(document.getElementById(canvasId), {
       type: "line",
       data: {
-        labels: this.dates,
+        labels,
         datasets: datasets.map((dataset) => ({
           data: dataset.data,
           borderColor: dataset.borderColor,